@@ -241,6 +241,7 @@ setup(
         "test": [
             "pytest>=3.6.0,!=3.9.0,!=3.9.1,!=3.9.2",
             "pretend",
+            "pytest-benchmark",
             "iso8601",
             "pytz",
             "hypothesis>=1.11.4,!=3.79.2",
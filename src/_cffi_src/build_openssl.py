@@ -77,6 +77,7 @@ ffi = build_ffi_for_binding(
         "evp",
         "fips",
         "hmac",
+        "md5",
         "nid",
         "objects",
         "ocsp",
@@ -86,6 +87,7 @@ ffi = build_ffi_for_binding(
         "pkcs12",
         "rand",
         "rsa",
+        "sha",
         "ssl",
         "x509",
         "x509name",
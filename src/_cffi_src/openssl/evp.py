@@ -58,6 +58,8 @@ int EVP_DigestInit_ex(EVP_MD_CTX *, const EVP_MD *, ENGINE *);
 int EVP_DigestUpdate(EVP_MD_CTX *, const void *, size_t);
 int EVP_DigestFinal_ex(EVP_MD_CTX *, unsigned char *, unsigned int *);
 int EVP_DigestFinalXOF(EVP_MD_CTX *, unsigned char *, size_t);
+int EVP_Digest(const void *, size_t, unsigned char *, unsigned int *,
+               const EVP_MD *, ENGINE *);
 const EVP_MD *EVP_get_digestbyname(const char *);
 
 EVP_PKEY *EVP_PKEY_new(void);
@@ -127,11 +129,20 @@ int Cryptography_EVP_PKEY_id(const EVP_PKEY *);
    without worrying about what OpenSSL we're running against. */
 EVP_MD_CTX *Cryptography_EVP_MD_CTX_new(void);
 void Cryptography_EVP_MD_CTX_free(EVP_MD_CTX *);
+int Cryptography_EVP_Digest_many(const EVP_MD *, const void **,
+                                 const size_t *, size_t, unsigned char *,
+                                 int);
 /* Added in 1.1.1 */
 int EVP_DigestSign(EVP_MD_CTX *, unsigned char *, size_t *,
                    const unsigned char *, size_t);
 int EVP_DigestVerify(EVP_MD_CTX *, const unsigned char *, size_t,
                      const unsigned char *, size_t);
+int Cryptography_EVP_DigestSign_many(EVP_PKEY *, const void **,
+                                     const size_t *, size_t, unsigned char *,
+                                     size_t);
+int Cryptography_EVP_DigestVerify_many(EVP_PKEY *, const void **,
+                                       const size_t *, const void **,
+                                       const size_t *, size_t, int *);
 /* Added in 1.1.0 */
 size_t EVP_PKEY_get1_tls_encodedpoint(EVP_PKEY *, unsigned char **);
 int EVP_PKEY_set1_tls_encodedpoint(EVP_PKEY *, const unsigned char *,
@@ -191,6 +202,31 @@ void Cryptography_EVP_MD_CTX_free(EVP_MD_CTX *ctx) {
     EVP_MD_CTX_free(ctx);
 #endif
 }
+/* Hashes count independent buffers with a single context, writing the
+   digests one after another into out. md_size is the digest size the
+   caller allocated for and must match md. */
+int Cryptography_EVP_Digest_many(const EVP_MD *md, const void **data,
+                                 const size_t *data_len, size_t count,
+                                 unsigned char *out, int md_size) {
+    EVP_MD_CTX *ctx;
+    size_t i;
+    int res = 1;
+
+    if (EVP_MD_size(md) != md_size) {
+        return 0;
+    }
+    ctx = Cryptography_EVP_MD_CTX_new();
+    if (ctx == NULL) {
+        return 0;
+    }
+    for (i = 0; i < count && res == 1; i++) {
+        res = EVP_DigestInit_ex(ctx, md, NULL) &&
+              EVP_DigestUpdate(ctx, data[i], data_len[i]) &&
+              EVP_DigestFinal_ex(ctx, out + i * (size_t)md_size, NULL);
+    }
+    Cryptography_EVP_MD_CTX_free(ctx);
+    return res;
+}
 #if CRYPTOGRAPHY_OPENSSL_LESS_THAN_110 || defined(OPENSSL_NO_SCRYPT)
 static const long Cryptography_HAS_SCRYPT = 0;
 int (*EVP_PBE_scrypt)(const char *, size_t, const unsigned char *, size_t,
@@ -226,10 +262,68 @@ int (*EVP_PKEY_get_raw_private_key)(const EVP_PKEY *, unsigned char *,
                                     size_t *) = NULL;
 int (*EVP_PKEY_get_raw_public_key)(const EVP_PKEY *, unsigned char *,
                                    size_t *) = NULL;
+int (*Cryptography_EVP_DigestSign_many)(EVP_PKEY *, const void **,
+                                        const size_t *, size_t,
+                                        unsigned char *, size_t) = NULL;
+int (*Cryptography_EVP_DigestVerify_many)(EVP_PKEY *, const void **,
+                                          const size_t *, const void **,
+                                          const size_t *, size_t,
+                                          int *) = NULL;
 #else
 static const long Cryptography_HAS_ONESHOT_EVP_DIGEST_SIGN_VERIFY = 1;
 static const long Cryptography_HAS_RAW_KEY = 1;
 static const long Cryptography_HAS_EVP_DIGESTFINAL_XOF = 1;
+
+/* Signs count messages with a single context, writing the signatures, each
+   sig_len bytes, one after another into out. This is for algorithms that
+   sign the message directly, such as Ed25519 and Ed448. */
+int Cryptography_EVP_DigestSign_many(EVP_PKEY *pkey, const void **data,
+                                     const size_t *data_len, size_t count,
+                                     unsigned char *out, size_t sig_len) {
+    EVP_MD_CTX *ctx = EVP_MD_CTX_new();
+    size_t i, len;
+    int res = 1;
+
+    if (ctx == NULL) {
+        return 0;
+    }
+    for (i = 0; i < count && res == 1; i++) {
+        len = sig_len;
+        EVP_MD_CTX_reset(ctx);
+        res = EVP_DigestSignInit(ctx, NULL, NULL, NULL, pkey) == 1 &&
+              EVP_DigestSign(ctx, out + i * sig_len, &len, data[i],
+                             data_len[i]) == 1 &&
+              len == sig_len;
+    }
+    EVP_MD_CTX_free(ctx);
+    return res;
+}
+
+/* Verifies count signatures with a single context, setting results[i] to
+   whether signature i is valid. Returns 0 only if a context couldn't be set
+   up. */
+int Cryptography_EVP_DigestVerify_many(EVP_PKEY *pkey, const void **sig,
+                                       const size_t *sig_len,
+                                       const void **data,
+                                       const size_t *data_len, size_t count,
+                                       int *results) {
+    EVP_MD_CTX *ctx = EVP_MD_CTX_new();
+    size_t i;
+    int res = 1;
+
+    if (ctx == NULL) {
+        return 0;
+    }
+    for (i = 0; i < count && res == 1; i++) {
+        EVP_MD_CTX_reset(ctx);
+        res = EVP_DigestVerifyInit(ctx, NULL, NULL, NULL, pkey);
+        results[i] = res == 1 &&
+                     EVP_DigestVerify(ctx, sig[i], sig_len[i], data[i],
+                                      data_len[i]) == 1;
+    }
+    EVP_MD_CTX_free(ctx);
+    return res == 1;
+}
 #endif
 
 /* OpenSSL 1.1.0+ does this define for us, but if not present we'll do it */
@@ -0,0 +1,114 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+INCLUDES = """
+#include <openssl/opensslconf.h>
+#if !defined(OPENSSL_NO_MD5)
+#include <openssl/md5.h>
+#endif
+
+/* The low level MD5 functions, and their context struct, are missing from
+   builds without MD5 or without deprecated APIs. */
+#if defined(OPENSSL_NO_MD5) || defined(OPENSSL_NO_DEPRECATED_3_0)
+typedef void MD5_CTX;
+#endif
+"""
+
+TYPES = """
+static const long Cryptography_HAS_MD5_CTX;
+
+typedef ... MD5_CTX;
+"""
+
+FUNCTIONS = """
+int MD5_Init(MD5_CTX *);
+int MD5_Update(MD5_CTX *, const void *, size_t);
+int MD5_Final(unsigned char *, MD5_CTX *);
+
+MD5_CTX *Cryptography_MD5_CTX_new(void);
+MD5_CTX *Cryptography_MD5_CTX_dup(const MD5_CTX *);
+void Cryptography_MD5_CTX_free(MD5_CTX *);
+void Cryptography_MD5_CTX_get_state(const MD5_CTX *, uint64_t *, uint64_t *,
+                                    uint64_t *, unsigned char *, size_t *);
+int Cryptography_MD5_CTX_set_state(MD5_CTX *, const uint64_t *, uint64_t,
+                                   uint64_t, const unsigned char *, size_t);
+"""
+
+CUSTOMIZATIONS = """
+#if defined(OPENSSL_NO_MD5) || defined(OPENSSL_NO_DEPRECATED_3_0)
+static const long Cryptography_HAS_MD5_CTX = 0;
+
+int (*MD5_Init)(MD5_CTX *) = NULL;
+int (*MD5_Update)(MD5_CTX *, const void *, size_t) = NULL;
+int (*MD5_Final)(unsigned char *, MD5_CTX *) = NULL;
+
+MD5_CTX *(*Cryptography_MD5_CTX_new)(void) = NULL;
+MD5_CTX *(*Cryptography_MD5_CTX_dup)(const MD5_CTX *) = NULL;
+void (*Cryptography_MD5_CTX_free)(MD5_CTX *) = NULL;
+void (*Cryptography_MD5_CTX_get_state)(const MD5_CTX *, uint64_t *,
+                                       uint64_t *, uint64_t *,
+                                       unsigned char *, size_t *) = NULL;
+int (*Cryptography_MD5_CTX_set_state)(MD5_CTX *, const uint64_t *, uint64_t,
+                                      uint64_t, const unsigned char *,
+                                      size_t) = NULL;
+#else
+static const long Cryptography_HAS_MD5_CTX = 1;
+
+/* See the SHA context helpers in sha.py. */
+MD5_CTX *Cryptography_MD5_CTX_new(void) {
+    MD5_CTX *ctx = OPENSSL_malloc(sizeof(MD5_CTX));
+    if (ctx != NULL) {
+        memset(ctx, 0, sizeof(MD5_CTX));
+    }
+    return ctx;
+}
+
+MD5_CTX *Cryptography_MD5_CTX_dup(const MD5_CTX *ctx) {
+    MD5_CTX *copy = OPENSSL_malloc(sizeof(MD5_CTX));
+    if (copy != NULL) {
+        memcpy(copy, ctx, sizeof(MD5_CTX));
+    }
+    return copy;
+}
+
+void Cryptography_MD5_CTX_free(MD5_CTX *ctx) {
+    if (ctx != NULL) {
+        OPENSSL_cleanse(ctx, sizeof(MD5_CTX));
+        OPENSSL_free(ctx);
+    }
+}
+
+void Cryptography_MD5_CTX_get_state(const MD5_CTX *ctx, uint64_t *words,
+                                    uint64_t *nl, uint64_t *nh,
+                                    unsigned char *data, size_t *num) {
+    words[0] = ctx->A;
+    words[1] = ctx->B;
+    words[2] = ctx->C;
+    words[3] = ctx->D;
+    *nl = ctx->Nl;
+    *nh = ctx->Nh;
+    memcpy(data, ctx->data, ctx->num);
+    *num = ctx->num;
+}
+
+int Cryptography_MD5_CTX_set_state(MD5_CTX *ctx, const uint64_t *words,
+                                   uint64_t nl, uint64_t nh,
+                                   const unsigned char *data, size_t num) {
+    if (num >= MD5_CBLOCK) {
+        return 0;
+    }
+    ctx->A = (MD5_LONG)words[0];
+    ctx->B = (MD5_LONG)words[1];
+    ctx->C = (MD5_LONG)words[2];
+    ctx->D = (MD5_LONG)words[3];
+    ctx->Nl = (MD5_LONG)nl;
+    ctx->Nh = (MD5_LONG)nh;
+    memcpy(ctx->data, data, num);
+    ctx->num = (unsigned int)num;
+    return 1;
+}
+#endif
+"""
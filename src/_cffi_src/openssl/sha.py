@@ -0,0 +1,257 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+INCLUDES = """
+#include <openssl/sha.h>
+
+/* The low level SHA functions, and their context structs, are missing from
+   builds without deprecated APIs. */
+#if defined(OPENSSL_NO_DEPRECATED_3_0)
+typedef void SHA_CTX;
+typedef void SHA256_CTX;
+typedef void SHA512_CTX;
+#endif
+"""
+
+TYPES = """
+static const long Cryptography_HAS_SHA_CTX;
+
+typedef ... SHA_CTX;
+typedef ... SHA256_CTX;
+typedef ... SHA512_CTX;
+"""
+
+FUNCTIONS = """
+int SHA1_Init(SHA_CTX *);
+int SHA1_Update(SHA_CTX *, const void *, size_t);
+int SHA1_Final(unsigned char *, SHA_CTX *);
+
+int SHA224_Init(SHA256_CTX *);
+int SHA224_Update(SHA256_CTX *, const void *, size_t);
+int SHA224_Final(unsigned char *, SHA256_CTX *);
+
+int SHA256_Init(SHA256_CTX *);
+int SHA256_Update(SHA256_CTX *, const void *, size_t);
+int SHA256_Final(unsigned char *, SHA256_CTX *);
+
+int SHA384_Init(SHA512_CTX *);
+int SHA384_Update(SHA512_CTX *, const void *, size_t);
+int SHA384_Final(unsigned char *, SHA512_CTX *);
+
+int SHA512_Init(SHA512_CTX *);
+int SHA512_Update(SHA512_CTX *, const void *, size_t);
+int SHA512_Final(unsigned char *, SHA512_CTX *);
+
+SHA_CTX *Cryptography_SHA_CTX_new(void);
+SHA_CTX *Cryptography_SHA_CTX_dup(const SHA_CTX *);
+void Cryptography_SHA_CTX_free(SHA_CTX *);
+void Cryptography_SHA_CTX_get_state(const SHA_CTX *, uint64_t *, uint64_t *,
+                                    uint64_t *, unsigned char *, size_t *);
+int Cryptography_SHA_CTX_set_state(SHA_CTX *, const uint64_t *, uint64_t,
+                                   uint64_t, const unsigned char *, size_t);
+
+SHA256_CTX *Cryptography_SHA256_CTX_new(void);
+SHA256_CTX *Cryptography_SHA256_CTX_dup(const SHA256_CTX *);
+void Cryptography_SHA256_CTX_free(SHA256_CTX *);
+void Cryptography_SHA256_CTX_get_state(const SHA256_CTX *, uint64_t *,
+                                       uint64_t *, uint64_t *,
+                                       unsigned char *, size_t *);
+int Cryptography_SHA256_CTX_set_state(SHA256_CTX *, const uint64_t *,
+                                      uint64_t, uint64_t,
+                                      const unsigned char *, size_t);
+
+SHA512_CTX *Cryptography_SHA512_CTX_new(void);
+SHA512_CTX *Cryptography_SHA512_CTX_dup(const SHA512_CTX *);
+void Cryptography_SHA512_CTX_free(SHA512_CTX *);
+void Cryptography_SHA512_CTX_get_state(const SHA512_CTX *, uint64_t *,
+                                       uint64_t *, uint64_t *,
+                                       unsigned char *, size_t *);
+int Cryptography_SHA512_CTX_set_state(SHA512_CTX *, const uint64_t *,
+                                      uint64_t, uint64_t,
+                                      const unsigned char *, size_t);
+"""
+
+CUSTOMIZATIONS = """
+#if defined(OPENSSL_NO_DEPRECATED_3_0)
+static const long Cryptography_HAS_SHA_CTX = 0;
+
+int (*SHA1_Init)(SHA_CTX *) = NULL;
+int (*SHA1_Update)(SHA_CTX *, const void *, size_t) = NULL;
+int (*SHA1_Final)(unsigned char *, SHA_CTX *) = NULL;
+int (*SHA224_Init)(SHA256_CTX *) = NULL;
+int (*SHA224_Update)(SHA256_CTX *, const void *, size_t) = NULL;
+int (*SHA224_Final)(unsigned char *, SHA256_CTX *) = NULL;
+int (*SHA256_Init)(SHA256_CTX *) = NULL;
+int (*SHA256_Update)(SHA256_CTX *, const void *, size_t) = NULL;
+int (*SHA256_Final)(unsigned char *, SHA256_CTX *) = NULL;
+int (*SHA384_Init)(SHA512_CTX *) = NULL;
+int (*SHA384_Update)(SHA512_CTX *, const void *, size_t) = NULL;
+int (*SHA384_Final)(unsigned char *, SHA512_CTX *) = NULL;
+int (*SHA512_Init)(SHA512_CTX *) = NULL;
+int (*SHA512_Update)(SHA512_CTX *, const void *, size_t) = NULL;
+int (*SHA512_Final)(unsigned char *, SHA512_CTX *) = NULL;
+
+SHA_CTX *(*Cryptography_SHA_CTX_new)(void) = NULL;
+SHA_CTX *(*Cryptography_SHA_CTX_dup)(const SHA_CTX *) = NULL;
+void (*Cryptography_SHA_CTX_free)(SHA_CTX *) = NULL;
+void (*Cryptography_SHA_CTX_get_state)(const SHA_CTX *, uint64_t *,
+                                       uint64_t *, uint64_t *,
+                                       unsigned char *, size_t *) = NULL;
+int (*Cryptography_SHA_CTX_set_state)(SHA_CTX *, const uint64_t *, uint64_t,
+                                      uint64_t, const unsigned char *,
+                                      size_t) = NULL;
+SHA256_CTX *(*Cryptography_SHA256_CTX_new)(void) = NULL;
+SHA256_CTX *(*Cryptography_SHA256_CTX_dup)(const SHA256_CTX *) = NULL;
+void (*Cryptography_SHA256_CTX_free)(SHA256_CTX *) = NULL;
+void (*Cryptography_SHA256_CTX_get_state)(const SHA256_CTX *, uint64_t *,
+                                          uint64_t *, uint64_t *,
+                                          unsigned char *, size_t *) = NULL;
+int (*Cryptography_SHA256_CTX_set_state)(SHA256_CTX *, const uint64_t *,
+                                         uint64_t, uint64_t,
+                                         const unsigned char *,
+                                         size_t) = NULL;
+SHA512_CTX *(*Cryptography_SHA512_CTX_new)(void) = NULL;
+SHA512_CTX *(*Cryptography_SHA512_CTX_dup)(const SHA512_CTX *) = NULL;
+void (*Cryptography_SHA512_CTX_free)(SHA512_CTX *) = NULL;
+void (*Cryptography_SHA512_CTX_get_state)(const SHA512_CTX *, uint64_t *,
+                                          uint64_t *, uint64_t *,
+                                          unsigned char *, size_t *) = NULL;
+int (*Cryptography_SHA512_CTX_set_state)(SHA512_CTX *, const uint64_t *,
+                                         uint64_t, uint64_t,
+                                         const unsigned char *,
+                                         size_t) = NULL;
+#else
+static const long Cryptography_HAS_SHA_CTX = 1;
+
+/* The contexts are allocated here, rather than by cffi, so that Python never
+   depends on their layout. The state accessors copy the chaining words, the
+   bit count and the buffered input in and out; the buffer holds raw bytes
+   in every context. */
+#define CRYPTOGRAPHY_CTX_ALLOC(NAME, CTX)                                   \\
+CTX *Cryptography_##NAME##_new(void) {                                      \\
+    CTX *ctx = OPENSSL_malloc(sizeof(CTX));                                 \\
+    if (ctx != NULL) {                                                      \\
+        memset(ctx, 0, sizeof(CTX));                                        \\
+    }                                                                       \\
+    return ctx;                                                             \\
+}                                                                           \\
+CTX *Cryptography_##NAME##_dup(const CTX *ctx) {                            \\
+    CTX *copy = OPENSSL_malloc(sizeof(CTX));                                \\
+    if (copy != NULL) {                                                     \\
+        memcpy(copy, ctx, sizeof(CTX));                                     \\
+    }                                                                       \\
+    return copy;                                                            \\
+}                                                                           \\
+void Cryptography_##NAME##_free(CTX *ctx) {                                 \\
+    if (ctx != NULL) {                                                      \\
+        OPENSSL_cleanse(ctx, sizeof(CTX));                                  \\
+        OPENSSL_free(ctx);                                                  \\
+    }                                                                       \\
+}
+
+CRYPTOGRAPHY_CTX_ALLOC(SHA_CTX, SHA_CTX)
+CRYPTOGRAPHY_CTX_ALLOC(SHA256_CTX, SHA256_CTX)
+CRYPTOGRAPHY_CTX_ALLOC(SHA512_CTX, SHA512_CTX)
+
+void Cryptography_SHA_CTX_get_state(const SHA_CTX *ctx, uint64_t *words,
+                                    uint64_t *nl, uint64_t *nh,
+                                    unsigned char *data, size_t *num) {
+    words[0] = ctx->h0;
+    words[1] = ctx->h1;
+    words[2] = ctx->h2;
+    words[3] = ctx->h3;
+    words[4] = ctx->h4;
+    *nl = ctx->Nl;
+    *nh = ctx->Nh;
+    memcpy(data, ctx->data, ctx->num);
+    *num = ctx->num;
+}
+
+int Cryptography_SHA_CTX_set_state(SHA_CTX *ctx, const uint64_t *words,
+                                   uint64_t nl, uint64_t nh,
+                                   const unsigned char *data, size_t num) {
+    if (num >= SHA_CBLOCK) {
+        return 0;
+    }
+    ctx->h0 = (SHA_LONG)words[0];
+    ctx->h1 = (SHA_LONG)words[1];
+    ctx->h2 = (SHA_LONG)words[2];
+    ctx->h3 = (SHA_LONG)words[3];
+    ctx->h4 = (SHA_LONG)words[4];
+    ctx->Nl = (SHA_LONG)nl;
+    ctx->Nh = (SHA_LONG)nh;
+    memcpy(ctx->data, data, num);
+    ctx->num = (unsigned int)num;
+    return 1;
+}
+
+void Cryptography_SHA256_CTX_get_state(const SHA256_CTX *ctx,
+                                       uint64_t *words, uint64_t *nl,
+                                       uint64_t *nh, unsigned char *data,
+                                       size_t *num) {
+    size_t i;
+
+    for (i = 0; i < 8; i++) {
+        words[i] = ctx->h[i];
+    }
+    *nl = ctx->Nl;
+    *nh = ctx->Nh;
+    memcpy(data, ctx->data, ctx->num);
+    *num = ctx->num;
+}
+
+int Cryptography_SHA256_CTX_set_state(SHA256_CTX *ctx, const uint64_t *words,
+                                      uint64_t nl, uint64_t nh,
+                                      const unsigned char *data, size_t num) {
+    size_t i;
+
+    if (num >= SHA256_CBLOCK) {
+        return 0;
+    }
+    for (i = 0; i < 8; i++) {
+        ctx->h[i] = (SHA_LONG)words[i];
+    }
+    ctx->Nl = (SHA_LONG)nl;
+    ctx->Nh = (SHA_LONG)nh;
+    memcpy(ctx->data, data, num);
+    ctx->num = (unsigned int)num;
+    return 1;
+}
+
+void Cryptography_SHA512_CTX_get_state(const SHA512_CTX *ctx,
+                                       uint64_t *words, uint64_t *nl,
+                                       uint64_t *nh, unsigned char *data,
+                                       size_t *num) {
+    size_t i;
+
+    for (i = 0; i < 8; i++) {
+        words[i] = ctx->h[i];
+    }
+    *nl = ctx->Nl;
+    *nh = ctx->Nh;
+    memcpy(data, ctx->u.p, ctx->num);
+    *num = ctx->num;
+}
+
+int Cryptography_SHA512_CTX_set_state(SHA512_CTX *ctx, const uint64_t *words,
+                                      uint64_t nl, uint64_t nh,
+                                      const unsigned char *data, size_t num) {
+    size_t i;
+
+    if (num >= SHA512_CBLOCK) {
+        return 0;
+    }
+    for (i = 0; i < 8; i++) {
+        ctx->h[i] = words[i];
+    }
+    ctx->Nl = nl;
+    ctx->Nh = nh;
+    memcpy(ctx->u.p, data, num);
+    ctx->num = (unsigned int)num;
+    return 1;
+}
+#endif
+"""
@@ -8,6 +8,7 @@ import base64
 import binascii
 import os
 import struct
+import threading
 import time
 
 import six
@@ -25,6 +26,7 @@ class InvalidToken(Exception):
 
 
 _MAX_CLOCK_SKEW = 60
+_STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class Fernet(object):
@@ -41,6 +43,12 @@ class Fernet(object):
         self._signing_key = key[:16]
         self._encryption_key = key[16:]
         self._backend = backend
+        # Keyed once here and copied for each token, which saves hashing the
+        # HMAC key pads every time.
+        self._hmac = HMAC(self._signing_key, hashes.SHA256(), backend=backend)
+        # AES contexts are kept per thread and reset with each token's IV so
+        # the key schedule is only computed once.
+        self._cipher_ctxs = threading.local()
 
     @classmethod
     def generate_key(cls):
@@ -54,26 +62,50 @@ class Fernet(object):
     def _encrypt_from_parts(self, data, current_time, iv):
         utils._check_bytes("data", data)
 
-        padder = padding.PKCS7(algorithms.AES.block_size).padder()
-        padded_data = padder.update(data) + padder.finalize()
-        encryptor = Cipher(
-            algorithms.AES(self._encryption_key), modes.CBC(iv), self._backend
-        ).encryptor()
-        ciphertext = encryptor.update(padded_data) + encryptor.finalize()
-
-        basic_parts = (
-            b"\x80" + struct.pack(">Q", current_time) + iv + ciphertext
-        )
-
-        h = HMAC(self._signing_key, hashes.SHA256(), backend=self._backend)
-        h.update(basic_parts)
-        hmac = h.finalize()
-        return base64.urlsafe_b64encode(basic_parts + hmac)
+        # The whole token is built in one buffer: version, timestamp, IV,
+        # then the data is padded and encrypted in place and the HMAC is
+        # written after it.
+        padded_length = (len(data) // 16 + 1) * 16
+        ciphertext_end = 25 + padded_length
+        token = bytearray(ciphertext_end + 32)
+        token[0] = 0x80
+        struct.pack_into(">Q", token, 1, current_time)
+        token[9:25] = iv
+        token[25:25 + len(data)] = data
+        pad = padded_length - len(data)
+        token[25 + len(data):ciphertext_end] = six.int2byte(pad) * pad
+
+        view = memoryview(token)
+        encryptor = self._get_cipher_ctx("encryptor", iv)
+        encryptor.update_into(view[25:ciphertext_end], view[25:])
+        encryptor.finalize()
+
+        h = self._hmac.copy()
+        h.update(view[:ciphertext_end])
+        token[ciphertext_end:] = h.finalize()
+        return base64.urlsafe_b64encode(token)
 
     def decrypt(self, token, ttl=None):
         timestamp, data = Fernet._get_unverified_token_data(token)
         return self._decrypt_data(data, timestamp, ttl)
 
+    def encrypt_many(self, data, executor=None):
+        return _encrypt_many(self, data, executor)
+
+    def decrypt_many(self, tokens, ttl=None, executor=None):
+        return _decrypt_many(self, tokens, ttl, executor)
+
+    def encrypt_stream(self, src, dst, chunk_size=_STREAM_CHUNK_SIZE):
+        _encrypt_stream(self, src, dst, chunk_size)
+
+    def decrypt_stream(self, src, dst, ttl=None):
+        _decrypt_stream(self, src, dst, ttl)
+
+    def _export_keys(self):
+        return [base64.urlsafe_b64encode(
+            self._signing_key + self._encryption_key
+        )]
+
     def extract_timestamp(self, token):
         timestamp, data = Fernet._get_unverified_token_data(token)
         # Verify the token was not tampered with.
@@ -97,8 +129,21 @@ class Fernet(object):
             raise InvalidToken
         return timestamp, data
 
+    def _get_cipher_ctx(self, name, iv):
+        ctx = getattr(self._cipher_ctxs, name, None)
+        if ctx is None:
+            cipher = Cipher(
+                algorithms.AES(self._encryption_key), modes.CBC(iv),
+                self._backend
+            )
+            ctx = getattr(cipher, name)(reusable=True)
+            setattr(self._cipher_ctxs, name, ctx)
+        else:
+            ctx.reset(iv)
+        return ctx
+
     def _verify_signature(self, data):
-        h = HMAC(self._signing_key, hashes.SHA256(), backend=self._backend)
+        h = self._hmac.copy()
         h.update(data[:-32])
         try:
             h.verify(data[-32:])
@@ -118,9 +163,7 @@ class Fernet(object):
 
         iv = data[9:25]
         ciphertext = data[25:-32]
-        decryptor = Cipher(
-            algorithms.AES(self._encryption_key), modes.CBC(iv), self._backend
-        ).decryptor()
+        decryptor = self._get_cipher_ctx("decryptor", iv)
         plaintext_padded = decryptor.update(ciphertext)
         try:
             plaintext_padded += decryptor.finalize()
@@ -137,35 +180,213 @@ class Fernet(object):
 
 
 class MultiFernet(object):
-    def __init__(self, fernets):
+    def __init__(self, fernets, remember_last_key=False):
         fernets = list(fernets)
         if not fernets:
             raise ValueError(
                 "MultiFernet requires at least one Fernet instance"
             )
         self._fernets = fernets
+        self._remember_last_key = remember_last_key
+        self._last_key = 0
 
     def encrypt(self, msg):
         return self._fernets[0].encrypt(msg)
 
     def rotate(self, msg):
         timestamp, data = Fernet._get_unverified_token_data(msg)
-        for f in self._fernets:
-            try:
-                p = f._decrypt_data(data, timestamp, None)
-                break
-            except InvalidToken:
-                pass
-        else:
-            raise InvalidToken
-
+        p = self._decrypt_data(data, timestamp, None)
         iv = os.urandom(16)
         return self._fernets[0]._encrypt_from_parts(p, timestamp, iv)
 
     def decrypt(self, msg, ttl=None):
-        for f in self._fernets:
+        timestamp, data = Fernet._get_unverified_token_data(msg)
+        return self._decrypt_data(data, timestamp, ttl)
+
+    def encrypt_many(self, data, executor=None):
+        return self._fernets[0].encrypt_many(data, executor)
+
+    def decrypt_many(self, msgs, ttl=None, executor=None):
+        return _decrypt_many(self, msgs, ttl, executor)
+
+    def encrypt_stream(self, src, dst, chunk_size=_STREAM_CHUNK_SIZE):
+        self._fernets[0].encrypt_stream(src, dst, chunk_size)
+
+    def decrypt_stream(self, src, dst, ttl=None):
+        _decrypt_stream(self, src, dst, ttl)
+
+    def _export_keys(self):
+        return [key for f in self._fernets for key in f._export_keys()]
+
+    def _decrypt_data(self, data, timestamp, ttl):
+        # Nothing in a token identifies its key, but during a rotation most
+        # tokens share one, so the key that last worked is tried first. This
+        # only changes the order keys are tried in, every token is still
+        # verified.
+        fernets = enumerate(self._fernets)
+        if self._remember_last_key:
+            fernets = list(fernets)
+            fernets.insert(0, fernets.pop(self._last_key))
+
+        for index, f in fernets:
             try:
-                return f.decrypt(msg, ttl)
+                p = f._decrypt_data(data, timestamp, ttl)
             except InvalidToken:
-                pass
+                continue
+
+            if self._remember_last_key:
+                self._last_key = index
+            return p
+
+        raise InvalidToken
+
+
+# Number of items handed to an executor at a time, large enough that the
+# cost of dispatching work (and pickling it for process pools) is amortized.
+_BATCH_CHUNK_SIZE = 1024
+
+
+def _fernet_from_keys(keys):
+    if len(keys) == 1:
+        return Fernet(keys[0])
+    return MultiFernet([Fernet(key) for key in keys])
+
+
+def _encrypt_items(fernet, data):
+    return [fernet.encrypt(item) for item in data]
+
+
+def _decrypt_items(fernet, tokens, ttl):
+    results = []
+    for token in tokens:
+        try:
+            results.append(fernet.decrypt(token, ttl))
+        except InvalidToken as e:
+            results.append(e)
+    return results
+
+
+# The chunk functions are module level and only take key material and bytes
+# so that they can be pickled for process pools.
+def _encrypt_chunk(keys, data):
+    return _encrypt_items(_fernet_from_keys(keys), data)
+
+
+def _decrypt_chunk(keys, tokens, ttl):
+    return _decrypt_items(_fernet_from_keys(keys), tokens, ttl)
+
+
+def _map_chunks(executor, func, keys, items, *args):
+    chunks = [
+        items[i:i + _BATCH_CHUNK_SIZE]
+        for i in range(0, len(items), _BATCH_CHUNK_SIZE)
+    ]
+    iterables = [[keys] * len(chunks), chunks]
+    iterables.extend([arg] * len(chunks) for arg in args)
+    results = []
+    for chunk_results in executor.map(func, *iterables):
+        results.extend(chunk_results)
+    return results
+
+
+def _encrypt_many(fernet, data, executor):
+    data = list(data)
+    for item in data:
+        utils._check_bytes("data", item)
+
+    if executor is None:
+        return _encrypt_items(fernet, data)
+    return _map_chunks(executor, _encrypt_chunk, fernet._export_keys(), data)
+
+
+def _decrypt_many(fernet, tokens, ttl, executor):
+    tokens = list(tokens)
+    for token in tokens:
+        utils._check_bytes("token", token)
+
+    if executor is None:
+        return _decrypt_items(fernet, tokens, ttl)
+    return _map_chunks(
+        executor, _decrypt_chunk, fernet._export_keys(), tokens, ttl
+    )
+
+
+# Each chunk of a stream is a regular Fernet token on its own line. The
+# plaintext of a token is prefixed with a random stream identifier, the index
+# of the chunk and a flag marking the final chunk, so chunks can't be
+# reordered, dropped, truncated or mixed between streams without detection.
+_STREAM_HEADER = struct.Struct(">16sQB")
+
+# Chunks are limited in size so that decrypt_stream can bound each line it
+# reads from untrusted input.
+_MAX_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _stream_line_length(chunk_size):
+    # A token holds the version, timestamp, IV and HMAC around the padded
+    # ciphertext, and is base64 encoded with padding.
+    padded = (_STREAM_HEADER.size + chunk_size) // 16 * 16 + 16
+    return 4 * ((1 + 8 + 16 + padded + 32 + 2) // 3) + len(b"\n")
+
+
+_MAX_STREAM_LINE_LENGTH = _stream_line_length(_MAX_STREAM_CHUNK_SIZE)
+
+
+def _encrypt_stream(fernet, src, dst, chunk_size):
+    if (
+        not isinstance(chunk_size, six.integer_types) or
+        not 1 <= chunk_size <= _MAX_STREAM_CHUNK_SIZE
+    ):
+        raise ValueError(
+            "chunk_size must be a positive integer no larger than {}".format(
+                _MAX_STREAM_CHUNK_SIZE
+            )
+        )
+
+    stream_id = os.urandom(16)
+    index = 0
+    chunk = src.read(chunk_size)
+    while True:
+        utils._check_bytes("data", chunk)
+        next_chunk = src.read(chunk_size)
+        last = not next_chunk
+        token = fernet.encrypt(
+            _STREAM_HEADER.pack(stream_id, index, last) + chunk
+        )
+        dst.write(token)
+        dst.write(b"\n")
+        if last:
+            break
+        chunk = next_chunk
+        index += 1
+
+
+def _decrypt_stream(fernet, src, dst, ttl):
+    stream_id = None
+    index = 0
+    finished = False
+    while True:
+        line = src.readline(_MAX_STREAM_LINE_LENGTH + 1)
+        if not line:
+            break
+
+        if finished or len(line) > _MAX_STREAM_LINE_LENGTH:
+            raise InvalidToken
+
+        data = fernet.decrypt(line.rstrip(b"\n"), ttl)
+        if len(data) < _STREAM_HEADER.size:
+            raise InvalidToken
+
+        chunk_stream_id, chunk_index, last = _STREAM_HEADER.unpack_from(data)
+        if stream_id is None:
+            stream_id = chunk_stream_id
+
+        if chunk_stream_id != stream_id or chunk_index != index or last > 1:
+            raise InvalidToken
+
+        dst.write(data[_STREAM_HEADER.size:])
+        finished = bool(last)
+        index += 1
+
+    if not finished:
         raise InvalidToken
@@ -4,6 +4,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+import threading
+
 from cryptography_patched.exceptions import InvalidTag
 
 
@@ -24,7 +26,49 @@ def _aead_cipher_name(cipher):
         return "aes-{}-gcm".format(len(cipher._key) * 8).encode("ascii")
 
 
-def _aead_setup(backend, cipher_name, key, nonce, tag, tag_len, operation):
+class _AEADContextCache(object):
+    """
+    Key-scheduled cipher contexts for a single AEAD key. Each operation only
+    has to set a new nonce on a cached context instead of looking up the
+    cipher and scheduling the key again. An EVP_CIPHER_CTX can't be used by
+    two operations at once, so contexts are kept per thread.
+    """
+
+    def __init__(self, backend, cipher_name, key, tag_length):
+        self._backend = backend
+        self._cipher_name = cipher_name
+        self._key = key
+        self._tag_length = tag_length
+        self._local = threading.local()
+
+    def get(self, nonce_len, operation):
+        ctxs = getattr(self._local, "ctxs", None)
+        if ctxs is None:
+            ctxs = self._local.ctxs = {}
+
+        # The nonce length is part of the key setup for CCM, so we keep one
+        # context per direction and only rebuild it when the length changes.
+        cached = ctxs.get(operation)
+        if cached is not None and cached[0] == nonce_len:
+            return cached[1]
+
+        ctx = _aead_create_ctx(
+            self._backend, self._cipher_name, self._key, nonce_len,
+            self._tag_length, operation
+        )
+        ctxs[operation] = (nonce_len, ctx)
+        return ctx
+
+    def discard(self, operation):
+        # A failed operation may leave the context in an unknown state, so
+        # the next operation on this thread starts from a fresh one.
+        ctxs = getattr(self._local, "ctxs", None)
+        if ctxs is not None:
+            ctxs.pop(operation, None)
+
+
+def _aead_create_ctx(backend, cipher_name, key, nonce_len, tag_len,
+                     operation):
     evp_cipher = backend._lib.EVP_get_cipherbyname(cipher_name)
     backend.openssl_assert(evp_cipher != backend._ffi.NULL)
     ctx = backend._lib.EVP_CIPHER_CTX_new()
@@ -40,35 +84,53 @@ def _aead_setup(backend, cipher_name, key, nonce, tag, tag_len, operation):
     res = backend._lib.EVP_CIPHER_CTX_set_key_length(ctx, len(key))
     backend.openssl_assert(res != 0)
     res = backend._lib.EVP_CIPHER_CTX_ctrl(
-        ctx, backend._lib.EVP_CTRL_AEAD_SET_IVLEN, len(nonce),
+        ctx, backend._lib.EVP_CTRL_AEAD_SET_IVLEN, nonce_len,
         backend._ffi.NULL
     )
     backend.openssl_assert(res != 0)
-    if operation == _DECRYPT:
-        res = backend._lib.EVP_CIPHER_CTX_ctrl(
-            ctx, backend._lib.EVP_CTRL_AEAD_SET_TAG, len(tag), tag
-        )
-        backend.openssl_assert(res != 0)
-    elif cipher_name.endswith(b"-ccm"):
+    # CCM fixes the tag length (and the nonce length) when the key is set, so
+    # it has to be configured before we schedule the key.
+    if cipher_name.endswith(b"-ccm"):
         res = backend._lib.EVP_CIPHER_CTX_ctrl(
             ctx, backend._lib.EVP_CTRL_AEAD_SET_TAG, tag_len, backend._ffi.NULL
         )
         backend.openssl_assert(res != 0)
 
-    nonce_ptr = backend._ffi.from_buffer(nonce)
     key_ptr = backend._ffi.from_buffer(key)
     res = backend._lib.EVP_CipherInit_ex(
         ctx,
         backend._ffi.NULL,
         backend._ffi.NULL,
         key_ptr,
-        nonce_ptr,
+        backend._ffi.NULL,
         int(operation == _ENCRYPT)
     )
     backend.openssl_assert(res != 0)
     return ctx
 
 
+def _aead_set_nonce(backend, ctx, nonce, operation):
+    # Passing a NULL key keeps the existing key schedule and only resets the
+    # per-message state, so a context can be reused for many messages.
+    nonce_ptr = backend._ffi.from_buffer(nonce)
+    res = backend._lib.EVP_CipherInit_ex(
+        ctx,
+        backend._ffi.NULL,
+        backend._ffi.NULL,
+        backend._ffi.NULL,
+        nonce_ptr,
+        int(operation == _ENCRYPT)
+    )
+    backend.openssl_assert(res != 0)
+
+
+def _set_tag(backend, ctx, tag, tag_length):
+    res = backend._lib.EVP_CIPHER_CTX_ctrl(
+        ctx, backend._lib.EVP_CTRL_AEAD_SET_TAG, tag_length, tag
+    )
+    backend.openssl_assert(res != 0)
+
+
 def _set_length(backend, ctx, data_len):
     intptr = backend._ffi.new("int *")
     res = backend._lib.EVP_CipherUpdate(
@@ -89,74 +151,147 @@ def _process_aad(backend, ctx, associated_data):
     backend.openssl_assert(res != 0)
 
 
-def _process_data(backend, ctx, data):
+def _process_data(backend, ctx, data, data_len, out):
     outlen = backend._ffi.new("int *")
-    buf = backend._ffi.new("unsigned char[]", len(data))
-    res = backend._lib.EVP_CipherUpdate(ctx, buf, outlen, data, len(data))
+    res = backend._lib.EVP_CipherUpdate(ctx, out, outlen, data, data_len)
     backend.openssl_assert(res != 0)
-    return backend._ffi.buffer(buf, outlen[0])[:]
+    return outlen[0]
 
 
 def _encrypt(backend, cipher, nonce, data, associated_data, tag_length):
-    from cryptography_patched.hazmat.primitives.ciphers.aead import AESCCM
-    cipher_name = _aead_cipher_name(cipher)
-    ctx = _aead_setup(
-        backend, cipher_name, cipher._key, nonce, None, tag_length, _ENCRYPT
+    buf = backend._ffi_new_uninitialized(
+        "unsigned char[]", len(data) + tag_length
+    )
+    _encrypt_to_ptr(
+        backend, cipher, nonce, data, associated_data, tag_length, buf
+    )
+    return backend._ffi.buffer(buf)[:]
+
+
+def _encrypt_into(backend, cipher, nonce, data, associated_data, tag_length,
+                  buf):
+    out = backend._ffi.cast("unsigned char *", backend._ffi.from_buffer(buf))
+    return _encrypt_to_ptr(
+        backend, cipher, nonce, data, associated_data, tag_length, out
     )
+
+
+def _encrypt_to_ptr(backend, cipher, nonce, data, associated_data, tag_length,
+                    out):
+    ctx = cipher._ctx_cache.get(len(nonce), _ENCRYPT)
+    try:
+        _aead_set_nonce(backend, ctx, nonce, _ENCRYPT)
+        _encrypt_with_ctx(
+            backend, cipher, ctx, data, associated_data, tag_length, out
+        )
+    except BaseException:
+        cipher._ctx_cache.discard(_ENCRYPT)
+        raise
+
+    return len(data) + tag_length
+
+
+def _encrypt_with_ctx(backend, cipher, ctx, data, associated_data, tag_length,
+                      out):
+    from cryptography_patched.hazmat.primitives.ciphers.aead import AESCCM
     # CCM requires us to pass the length of the data before processing anything
     # However calling this with any other AEAD results in an error
     if isinstance(cipher, AESCCM):
         _set_length(backend, ctx, len(data))
 
     _process_aad(backend, ctx, associated_data)
-    processed_data = _process_data(backend, ctx, data)
+    processed = _process_data(backend, ctx, data, len(data), out)
+    backend.openssl_assert(processed == len(data))
     outlen = backend._ffi.new("int *")
     res = backend._lib.EVP_CipherFinal_ex(ctx, backend._ffi.NULL, outlen)
     backend.openssl_assert(res != 0)
     backend.openssl_assert(outlen[0] == 0)
-    tag_buf = backend._ffi.new("unsigned char[]", tag_length)
+    # The tag is written directly after the ciphertext.
     res = backend._lib.EVP_CIPHER_CTX_ctrl(
-        ctx, backend._lib.EVP_CTRL_AEAD_GET_TAG, tag_length, tag_buf
+        ctx, backend._lib.EVP_CTRL_AEAD_GET_TAG, tag_length, out + processed
     )
     backend.openssl_assert(res != 0)
-    tag = backend._ffi.buffer(tag_buf)[:]
-
-    return processed_data + tag
 
 
 def _decrypt(backend, cipher, nonce, data, associated_data, tag_length):
-    from cryptography_patched.hazmat.primitives.ciphers.aead import AESCCM
     if len(data) < tag_length:
         raise InvalidTag
-    tag = data[-tag_length:]
-    data = data[:-tag_length]
-    cipher_name = _aead_cipher_name(cipher)
-    ctx = _aead_setup(
-        backend, cipher_name, cipher._key, nonce, tag, tag_length, _DECRYPT
+    buf = backend._ffi_new_uninitialized(
+        "unsigned char[]", len(data) - tag_length
+    )
+    _decrypt_to_ptr(
+        backend, cipher, nonce, data, associated_data, tag_length, buf
+    )
+    return backend._ffi.buffer(buf)[:]
+
+
+def _decrypt_into(backend, cipher, nonce, data, associated_data, tag_length,
+                  buf):
+    if len(data) < tag_length:
+        raise InvalidTag
+    out = backend._ffi.cast("unsigned char *", backend._ffi.from_buffer(buf))
+    return _decrypt_to_ptr(
+        backend, cipher, nonce, data, associated_data, tag_length, out
     )
+
+
+def _decrypt_to_ptr(backend, cipher, nonce, data, associated_data, tag_length,
+                    out):
+    data_len = len(data) - tag_length
+    # Point into the caller's data rather than slicing off the tag, which
+    # would copy the whole ciphertext.
+    data_ptr = backend._ffi.from_buffer(data)
+    ctx = cipher._ctx_cache.get(len(nonce), _DECRYPT)
+    try:
+        _aead_set_nonce(backend, ctx, nonce, _DECRYPT)
+        _set_tag(backend, ctx, data_ptr + data_len, tag_length)
+        _decrypt_with_ctx(
+            backend, cipher, ctx, data_ptr, data_len, associated_data, out
+        )
+    except BaseException:
+        cipher._ctx_cache.discard(_DECRYPT)
+        # Never leave unauthenticated plaintext in the output buffer.
+        backend._ffi.memmove(out, b"\x00" * data_len, data_len)
+        raise
+
+    return data_len
+
+
+def _decrypt_with_ctx(backend, cipher, ctx, data, data_len, associated_data,
+                      out):
+    from cryptography_patched.hazmat.primitives.ciphers.aead import AESCCM
     # CCM requires us to pass the length of the data before processing anything
     # However calling this with any other AEAD results in an error
     if isinstance(cipher, AESCCM):
-        _set_length(backend, ctx, len(data))
+        _set_length(backend, ctx, data_len)
 
     _process_aad(backend, ctx, associated_data)
     # CCM has a different error path if the tag doesn't match. Errors are
     # raised in Update and Final is irrelevant.
     if isinstance(cipher, AESCCM):
         outlen = backend._ffi.new("int *")
-        buf = backend._ffi.new("unsigned char[]", len(data))
-        res = backend._lib.EVP_CipherUpdate(ctx, buf, outlen, data, len(data))
+        res = backend._lib.EVP_CipherUpdate(ctx, out, outlen, data, data_len)
         if res != 1:
             backend._consume_errors()
             raise InvalidTag
-
-        processed_data = backend._ffi.buffer(buf, outlen[0])[:]
     else:
-        processed_data = _process_data(backend, ctx, data)
+        _process_data(backend, ctx, data, data_len, out)
         outlen = backend._ffi.new("int *")
         res = backend._lib.EVP_CipherFinal_ex(ctx, backend._ffi.NULL, outlen)
         if res == 0:
             backend._consume_errors()
             raise InvalidTag
 
-    return processed_data
+
+def _encrypt_many(backend, cipher, items, tag_length):
+    return [
+        _encrypt(backend, cipher, nonce, data, associated_data, tag_length)
+        for nonce, data, associated_data in items
+    ]
+
+
+def _decrypt_many(backend, cipher, items, tag_length):
+    return [
+        _decrypt(backend, cipher, nonce, data, associated_data, tag_length)
+        for nonce, data, associated_data in items
+    ]
@@ -51,7 +51,9 @@ from cryptography_patched.hazmat.backends.openssl.encode_asn1 import (
     _OCSP_REQUEST_EXTENSION_ENCODE_HANDLERS,
     _encode_asn1_int_gc, _encode_asn1_str_gc, _encode_name_gc, _txt2obj_gc,
 )
-from cryptography_patched.hazmat.backends.openssl.hashes import _HashContext
+from cryptography_patched.hazmat.backends.openssl.hashes import (
+    _HashContext, _ResumableHashContext, _hash_digest, _hash_digest_many
+)
 from cryptography_patched.hazmat.backends.openssl.hmac import _HMACContext
 from cryptography_patched.hazmat.backends.openssl.ocsp import (
     _OCSPRequest, _OCSPResponse
@@ -119,6 +121,11 @@ class Backend(object):
         self._binding = binding.Binding()
         self._ffi = self._binding.ffi
         self._lib = self._binding.lib
+        # Used for output buffers that OpenSSL fills before they are read,
+        # where zeroing them first would only be an extra pass over the data.
+        self._ffi_new_uninitialized = self._ffi.new_allocator(
+            should_clear_after_alloc=False
+        )
 
         self._cipher_registry = {}
         self._register_default_ciphers()
@@ -127,6 +134,11 @@ class Backend(object):
         if self._lib.Cryptography_HAS_EVP_PKEY_DHX:
             self._dh_types.append(self._lib.EVP_PKEY_DHX)
 
+    def __reduce__(self):
+        # Pickle as a reference to the module's instance, so that objects
+        # holding the backend can be sent to other processes.
+        return "backend"
+
     def openssl_assert(self, ok):
         return binding._openssl_assert(self._lib, ok)
 
@@ -227,6 +239,15 @@ class Backend(object):
     def create_hash_ctx(self, algorithm):
         return _HashContext(self, algorithm)
 
+    def create_resumable_hash_ctx(self, algorithm, state=None):
+        return _ResumableHashContext(self, algorithm, state)
+
+    def hash_digest(self, algorithm, data):
+        return _hash_digest(self, algorithm, data)
+
+    def hash_digest_many(self, algorithm, buffers):
+        return _hash_digest_many(self, algorithm, buffers)
+
     def cipher_supported(self, cipher, mode):
         try:
             adapter = self._cipher_registry[type(cipher), type(mode)]
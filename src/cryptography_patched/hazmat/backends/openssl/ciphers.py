@@ -69,6 +69,17 @@ class _CipherContext(object):
             iv_nonce = self._backend._ffi.from_buffer(cipher.nonce)
         else:
             iv_nonce = self._backend._ffi.NULL
+
+        # Contexts for modes that take an IV, tweak or nonce can be reset
+        # with a new one, keeping their key schedule.
+        self._resettable = (
+            isinstance(mode, (
+                modes.ModeWithInitializationVector, modes.ModeWithTweak,
+                modes.ModeWithNonce
+            )) and not isinstance(mode, modes.ModeWithAuthenticationTag)
+        )
+        if self._resettable:
+            self._iv_nonce_length = len(iv_nonce)
         # begin init with cipher and operation type
         res = self._backend._lib.EVP_CipherInit_ex(ctx, evp_cipher,
                                                    self._backend._ffi.NULL,
@@ -120,9 +131,14 @@ class _CipherContext(object):
         self._ctx = ctx
 
     def update(self, data):
-        buf = bytearray(len(data) + self._block_size_bytes - 1)
-        n = self.update_into(data, buf)
-        return bytes(buf[:n])
+        # The output is written straight into an uninitialized buffer and
+        # copied out once, keeping the work done while holding the GIL to a
+        # single pass over the data.
+        buf = self._backend._ffi_new_uninitialized(
+            "unsigned char[]", len(data) + self._block_size_bytes - 1
+        )
+        n = self._update_to_ptr(data, buf)
+        return self._backend._ffi.buffer(buf)[:n]
 
     def update_into(self, data, buf):
         if len(buf) < (len(data) + self._block_size_bytes - 1):
@@ -134,6 +150,9 @@ class _CipherContext(object):
         buf = self._backend._ffi.cast(
             "unsigned char *", self._backend._ffi.from_buffer(buf)
         )
+        return self._update_to_ptr(data, buf)
+
+    def _update_to_ptr(self, data, buf):
         outlen = self._backend._ffi.new("int *")
         res = self._backend._lib.EVP_CipherUpdate(
             self._ctx, buf, outlen,
@@ -143,6 +162,17 @@ class _CipherContext(object):
         return outlen[0]
 
     def finalize(self):
+        return self._finalize(cleanup=True)
+
+    def finalize_for_reset(self):
+        if not self._resettable:
+            raise TypeError(
+                "Only contexts for modes with an initialization vector, "
+                "tweak or nonce can be reset."
+            )
+        return self._finalize(cleanup=False)
+
+    def _finalize(self, cleanup):
         # OpenSSL 1.0.1 on Ubuntu 12.04 (and possibly other distributions)
         # appears to have a bug where you must make at least one call to update
         # even if you are only using authenticate_additional_data or the
@@ -192,10 +222,40 @@ class _CipherContext(object):
             self._backend.openssl_assert(res != 0)
             self._tag = self._backend._ffi.buffer(tag_buf)[:]
 
-        res = self._backend._lib.EVP_CIPHER_CTX_cleanup(self._ctx)
-        self._backend.openssl_assert(res == 1)
+        # The key schedule is only kept when the caller will reset the
+        # context afterwards.
+        if cleanup:
+            res = self._backend._lib.EVP_CIPHER_CTX_cleanup(self._ctx)
+            self._backend.openssl_assert(res == 1)
         return self._backend._ffi.buffer(buf)[:outlen[0]]
 
+    def reset(self, iv_nonce):
+        if not self._resettable:
+            raise TypeError(
+                "Only contexts for modes with an initialization vector, "
+                "tweak or nonce can be reset."
+            )
+
+        if len(iv_nonce) != self._iv_nonce_length:
+            raise ValueError(
+                "Invalid IV size ({}) for {}, expected {}.".format(
+                    len(iv_nonce), self._mode.name, self._iv_nonce_length
+                )
+            )
+
+        # Passing a NULL cipher and key keeps the existing key schedule and
+        # only replaces the IV and the buffered state.
+        res = self._backend._lib.EVP_CipherInit_ex(
+            self._ctx,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            self._backend._ffi.NULL,
+            self._backend._ffi.from_buffer(iv_nonce),
+            self._operation
+        )
+        self._backend.openssl_assert(res != 0)
+        self._backend._lib.EVP_CIPHER_CTX_set_padding(self._ctx, 0)
+
     def finalize_with_tag(self, tag):
         if (
             self._backend._lib.CRYPTOGRAPHY_OPENSSL_LESS_THAN_102 and
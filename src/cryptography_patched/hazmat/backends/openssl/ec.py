@@ -81,12 +81,18 @@ def _ecdsa_sig_sign(backend, private_key, data):
 
 
 def _ecdsa_sig_verify(backend, public_key, signature, data):
+    if not _ecdsa_sig_check(backend, public_key, signature, data):
+        raise InvalidSignature
+
+
+def _ecdsa_sig_check(backend, public_key, signature, data):
     res = backend._lib.ECDSA_verify(
         0, data, len(data), signature, len(signature), public_key._ec_key
     )
     if res != 1:
         backend._consume_errors()
-        raise InvalidSignature
+        return False
+    return True
 
 
 @utils.register_interface(AsymmetricSignatureContext)
@@ -338,3 +344,19 @@ class _EllipticCurvePublicKey(object):
             self._backend, data, signature_algorithm._algorithm
         )
         _ecdsa_sig_verify(self._backend, self, signature, data)
+
+    def _batch_verifier(self, signature_algorithm):
+        _check_signature_algorithm(signature_algorithm)
+
+        def verify(items):
+            results = []
+            for signature, data in items:
+                data, _ = _calculate_digest_and_algorithm(
+                    self._backend, data, signature_algorithm._algorithm
+                )
+                results.append(
+                    _ecdsa_sig_check(self._backend, self, signature, data)
+                )
+            return results
+
+        return verify
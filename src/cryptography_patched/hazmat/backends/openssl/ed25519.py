@@ -4,7 +4,12 @@
 
 from __future__ import absolute_import, division, print_function
 
+import functools
+
 from cryptography_patched import exceptions, utils
+from cryptography_patched.hazmat.backends.openssl.utils import (
+    _eddsa_sign_many, _eddsa_verify_many
+)
 from cryptography_patched.hazmat.primitives import serialization
 from cryptography_patched.hazmat.primitives.asymmetric.ed25519 import (
     Ed25519PrivateKey, Ed25519PublicKey, _ED25519_KEY_SIZE, _ED25519_SIG_SIZE
@@ -73,6 +78,19 @@ class _Ed25519PublicKey(object):
             self._backend._consume_errors()
             raise exceptions.InvalidSignature
 
+    def verify_many(self, items):
+        items = [(signature, data) for signature, data in items]
+        for signature, data in items:
+            utils._check_bytes("signature", signature)
+            utils._check_byteslike("data", data)
+
+        return _eddsa_verify_many(self._backend, self._evp_pkey, items)
+
+    def _batch_verifier(self):
+        return functools.partial(
+            _eddsa_verify_many, self._backend, self._evp_pkey
+        )
+
 
 @utils.register_interface(Ed25519PrivateKey)
 class _Ed25519PrivateKey(object):
@@ -111,6 +129,15 @@ class _Ed25519PrivateKey(object):
         self._backend.openssl_assert(buflen[0] == _ED25519_SIG_SIZE)
         return self._backend._ffi.buffer(buf, buflen[0])[:]
 
+    def sign_many(self, messages):
+        messages = list(messages)
+        for data in messages:
+            utils._check_byteslike("data", data)
+
+        return _eddsa_sign_many(
+            self._backend, self._evp_pkey, _ED25519_SIG_SIZE, messages
+        )
+
     def private_bytes(self, encoding, format, encryption_algorithm):
         if (
             encoding is serialization.Encoding.Raw or
@@ -4,6 +4,7 @@
 
 from __future__ import absolute_import, division, print_function
 
+import struct
 
 from cryptography_patched import utils
 from cryptography_patched.exceptions import UnsupportedAlgorithm, _Reasons
@@ -76,3 +77,197 @@ class _HashContext(object):
         )
         self._backend.openssl_assert(res != 0)
         return self._backend._ffi.buffer(buf)[:self.algorithm.digest_size]
+
+
+# Maps a hash name to its low level function prefix, its context type, the
+# number of chaining words it has, the size of those words in bits and the
+# binding flag that says whether the low level functions are available.
+_RESUMABLE_HASHES = {
+    "md5": ("MD5", "MD5_CTX", 4, 32, "Cryptography_HAS_MD5_CTX"),
+    "sha1": ("SHA1", "SHA_CTX", 5, 32, "Cryptography_HAS_SHA_CTX"),
+    "sha224": ("SHA224", "SHA256_CTX", 8, 32, "Cryptography_HAS_SHA_CTX"),
+    "sha256": ("SHA256", "SHA256_CTX", 8, 32, "Cryptography_HAS_SHA_CTX"),
+    "sha384": ("SHA384", "SHA512_CTX", 8, 64, "Cryptography_HAS_SHA_CTX"),
+    "sha512": ("SHA512", "SHA512_CTX", 8, 64, "Cryptography_HAS_SHA_CTX"),
+}
+
+_STATE_VERSION = 1
+
+
+@utils.register_interface(hashes.HashContext)
+class _ResumableHashContext(object):
+    def __init__(self, backend, algorithm, state=None, ctx=None):
+        self._algorithm = algorithm
+        self._backend = backend
+
+        try:
+            (
+                self._prefix, ctx_type, self._word_count, self._word_bits,
+                flag
+            ) = _RESUMABLE_HASHES[algorithm.name]
+        except KeyError:
+            raise UnsupportedAlgorithm(
+                "{} does not support exporting its state.".format(
+                    algorithm.name),
+                _Reasons.UNSUPPORTED_HASH
+            )
+
+        if not getattr(self._backend._lib, flag):
+            raise UnsupportedAlgorithm(
+                "This version of OpenSSL does not support exporting the "
+                "state of {}.".format(algorithm.name),
+                _Reasons.UNSUPPORTED_HASH
+            )
+
+        self._ctx_functions = "Cryptography_" + ctx_type + "_"
+        # A block is 16 state words.
+        self._block_size = self._word_bits * 2
+        self._state_struct = struct.Struct(">BB{}sQQ{}Q".format(
+            len(algorithm.name), self._word_count
+        ))
+
+        if ctx is None:
+            ctx = self._ctx_function("new")()
+            self._backend.openssl_assert(ctx != self._backend._ffi.NULL)
+            ctx = self._backend._ffi.gc(ctx, self._ctx_function("free"))
+            res = getattr(self._backend._lib, self._prefix + "_Init")(ctx)
+            self._backend.openssl_assert(res == 1)
+            if state is not None:
+                self._load_state(ctx, state)
+
+        self._ctx = ctx
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    def copy(self):
+        copied_ctx = self._ctx_function("dup")(self._ctx)
+        self._backend.openssl_assert(copied_ctx != self._backend._ffi.NULL)
+        copied_ctx = self._backend._ffi.gc(
+            copied_ctx, self._ctx_function("free")
+        )
+        return _ResumableHashContext(
+            self._backend, self.algorithm, ctx=copied_ctx
+        )
+
+    def update(self, data):
+        res = getattr(self._backend._lib, self._prefix + "_Update")(
+            self._ctx, self._backend._ffi.from_buffer(data), len(data)
+        )
+        self._backend.openssl_assert(res == 1)
+
+    def finalize(self):
+        buf = self._backend._ffi.new(
+            "unsigned char[]", self.algorithm.digest_size
+        )
+        res = getattr(self._backend._lib, self._prefix + "_Final")(
+            buf, self._ctx
+        )
+        self._backend.openssl_assert(res == 1)
+        return self._backend._ffi.buffer(buf)[:]
+
+    def export_state(self):
+        words = self._backend._ffi.new("uint64_t[]", self._word_count)
+        nl = self._backend._ffi.new("uint64_t *")
+        nh = self._backend._ffi.new("uint64_t *")
+        buffered = self._backend._ffi.new("unsigned char[]", self._block_size)
+        num = self._backend._ffi.new("size_t *")
+        self._ctx_function("get_state")(
+            self._ctx, words, nl, nh, buffered, num
+        )
+        # The state is written field by field, rather than as the raw
+        # context, so that it can be loaded on a platform with a different
+        # struct layout or byte order.
+        header = self._state_struct.pack(
+            _STATE_VERSION, len(self.algorithm.name),
+            self.algorithm.name.encode("ascii"), nh[0], nl[0], *words
+        )
+        return header + self._backend._ffi.buffer(buffered, num[0])[:]
+
+    def _load_state(self, ctx, state):
+        if (
+            len(state) < self._state_struct.size or
+            len(state) - self._state_struct.size >= self._block_size
+        ):
+            raise ValueError("Invalid {} hash state.".format(
+                self.algorithm.name))
+
+        values = self._state_struct.unpack_from(state)
+        version, _, name, nh, nl = values[:5]
+        words = values[5:]
+        buffered = state[self._state_struct.size:]
+        total_bits = (nh << self._word_bits) | nl
+        if (
+            version != _STATE_VERSION or
+            name != self.algorithm.name.encode("ascii") or
+            any(v >> self._word_bits for v in (nh, nl) + words) or
+            total_bits % 8 or
+            total_bits // 8 % self._block_size != len(buffered)
+        ):
+            raise ValueError("Invalid {} hash state.".format(
+                self.algorithm.name))
+
+        res = self._ctx_function("set_state")(
+            ctx, list(words), nl, nh, buffered, len(buffered)
+        )
+        self._backend.openssl_assert(res == 1)
+
+    def _ctx_function(self, name):
+        return getattr(self._backend._lib, self._ctx_functions + name)
+
+
+def _evp_md_for_digest(backend, algorithm):
+    evp_md = backend._evp_md_from_algorithm(algorithm)
+    if evp_md == backend._ffi.NULL:
+        raise UnsupportedAlgorithm(
+            "{} is not a supported hash on this backend.".format(
+                algorithm.name),
+            _Reasons.UNSUPPORTED_HASH
+        )
+    return evp_md
+
+
+def _hash_digest(backend, algorithm, data):
+    if isinstance(algorithm, hashes.ExtendableOutputFunction):
+        # EVP_Digest can't produce a variable length output.
+        ctx = _HashContext(backend, algorithm)
+        ctx.update(data)
+        return ctx.finalize()
+
+    evp_md = _evp_md_for_digest(backend, algorithm)
+
+    buf = backend._ffi.new("unsigned char[]", backend._lib.EVP_MAX_MD_SIZE)
+    outlen = backend._ffi.new("unsigned int *")
+    res = backend._lib.EVP_Digest(
+        backend._ffi.from_buffer(data), len(data), buf, outlen, evp_md,
+        backend._ffi.NULL
+    )
+    backend.openssl_assert(res != 0)
+    backend.openssl_assert(outlen[0] == algorithm.digest_size)
+    return backend._ffi.buffer(buf)[:outlen[0]]
+
+
+def _hash_digest_many(backend, algorithm, buffers):
+    if isinstance(algorithm, hashes.ExtendableOutputFunction):
+        return [_hash_digest(backend, algorithm, data) for data in buffers]
+
+    evp_md = _evp_md_for_digest(backend, algorithm)
+    if not buffers:
+        return []
+
+    # The from_buffer objects keep the buffers alive for the call.
+    data_ptrs = [backend._ffi.from_buffer(data) for data in buffers]
+    data = backend._ffi.new("const void *[]", data_ptrs)
+    data_len = backend._ffi.new("size_t[]", [len(d) for d in buffers])
+    digest_size = algorithm.digest_size
+    buf = backend._ffi_new_uninitialized(
+        "unsigned char[]", len(buffers) * digest_size
+    )
+    res = backend._lib.Cryptography_EVP_Digest_many(
+        evp_md, data, data_len, len(buffers), buf, digest_size
+    )
+    backend.openssl_assert(res == 1)
+    digests = backend._ffi.buffer(buf)[:]
+    return [
+        digests[i:i + digest_size]
+        for i in range(0, len(digests), digest_size)
+    ]
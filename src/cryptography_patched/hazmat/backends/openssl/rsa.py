@@ -24,6 +24,7 @@ from cryptography_patched.hazmat.primitives.asymmetric.padding import (
 from cryptography_patched.hazmat.primitives.asymmetric.rsa import (
     RSAPrivateKeyWithSerialization, RSAPublicKeyWithSerialization
 )
+from cryptography_patched.hazmat.primitives.asymmetric.utils import Prehashed
 
 
 def _get_rsa_pss_salt_length(pss, key, hash_algorithm):
@@ -223,6 +224,10 @@ def _rsa_sig_sign(backend, padding, algorithm, private_key, data):
         backend, padding, algorithm, private_key, data,
         backend._lib.EVP_PKEY_sign_init
     )
+    return _rsa_sig_sign_with_ctx(backend, pkey_ctx, data)
+
+
+def _rsa_sig_sign_with_ctx(backend, pkey_ctx, data):
     buflen = backend._ffi.new("size_t *")
     res = backend._lib.EVP_PKEY_sign(
         pkey_ctx,
@@ -260,6 +265,75 @@ def _rsa_sig_verify(backend, padding, algorithm, public_key, signature, data):
         backend, padding, algorithm, public_key, data,
         backend._lib.EVP_PKEY_verify_init
     )
+    if not _rsa_sig_verify_with_ctx(backend, pkey_ctx, signature, data):
+        raise InvalidSignature
+
+
+def _rsa_sig_dup_ctx(backend, pkey_ctx):
+    pkey_ctx = backend._lib.EVP_PKEY_CTX_dup(pkey_ctx)
+    backend.openssl_assert(pkey_ctx != backend._ffi.NULL)
+    return backend._ffi.gc(pkey_ctx, backend._lib.EVP_PKEY_CTX_free)
+
+
+class _RSAPreparedSignatureContext(object):
+    def __init__(self, backend, key, padding, algorithm, init_func):
+        self._backend = backend
+        self._algorithm = algorithm
+        if isinstance(algorithm, Prehashed):
+            algorithm = algorithm._algorithm
+        if not backend.hash_supported(algorithm):
+            raise UnsupportedAlgorithm(
+                "{} is not a supported hash on this backend.".format(
+                    algorithm.name),
+                _Reasons.UNSUPPORTED_HASH
+            )
+        # The configured context is only ever duplicated, never used, so the
+        # prepared object can be shared between threads.
+        self._pkey_ctx = _rsa_sig_setup(
+            backend, padding, algorithm, key, None, init_func
+        )
+
+    def _digest(self, data):
+        data, _ = _calculate_digest_and_algorithm(
+            self._backend, data, self._algorithm
+        )
+        return data
+
+    def _ctx(self):
+        return _rsa_sig_dup_ctx(self._backend, self._pkey_ctx)
+
+
+class _RSAPreparedSigner(_RSAPreparedSignatureContext):
+    def __init__(self, backend, private_key, padding, algorithm):
+        super(_RSAPreparedSigner, self).__init__(
+            backend, private_key, padding, algorithm,
+            backend._lib.EVP_PKEY_sign_init
+        )
+
+    def sign(self, data):
+        return _rsa_sig_sign_with_ctx(
+            self._backend, self._ctx(), self._digest(data)
+        )
+
+
+class _RSAPreparedVerifier(_RSAPreparedSignatureContext):
+    def __init__(self, backend, public_key, padding, algorithm):
+        super(_RSAPreparedVerifier, self).__init__(
+            backend, public_key, padding, algorithm,
+            backend._lib.EVP_PKEY_verify_init
+        )
+
+    def verify(self, signature, data):
+        if not self._check(signature, data):
+            raise InvalidSignature
+
+    def _check(self, signature, data):
+        return _rsa_sig_verify_with_ctx(
+            self._backend, self._ctx(), signature, self._digest(data)
+        )
+
+
+def _rsa_sig_verify_with_ctx(backend, pkey_ctx, signature, data):
     res = backend._lib.EVP_PKEY_verify(
         pkey_ctx, signature, len(signature), data, len(data)
     )
@@ -269,7 +343,8 @@ def _rsa_sig_verify(backend, padding, algorithm, public_key, signature, data):
     backend.openssl_assert(res >= 0)
     if res == 0:
         backend._consume_errors()
-        raise InvalidSignature
+        return False
+    return True
 
 
 @utils.register_interface(AsymmetricSignatureContext)
@@ -417,6 +492,9 @@ class _RSAPrivateKey(object):
         )
         return _rsa_sig_sign(self._backend, padding, algorithm, self, data)
 
+    def prepare_signer(self, padding, algorithm):
+        return _RSAPreparedSigner(self._backend, self, padding, algorithm)
+
 
 @utils.register_interface(RSAPublicKeyWithSerialization)
 class _RSAPublicKey(object):
@@ -476,3 +554,10 @@ class _RSAPublicKey(object):
         return _rsa_sig_verify(
             self._backend, padding, algorithm, self, signature, data
         )
+
+    def prepare_verifier(self, padding, algorithm):
+        return _RSAPreparedVerifier(self._backend, self, padding, algorithm)
+
+    def _batch_verifier(self, padding, algorithm):
+        check = self.prepare_verifier(padding, algorithm)._check
+        return lambda items: [check(sig, data) for sig, data in items]
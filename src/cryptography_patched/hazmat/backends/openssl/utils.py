@@ -37,9 +37,7 @@ def _evp_pkey_derive(backend, evp_pkey, peer_public_key):
 
 def _calculate_digest_and_algorithm(backend, data, algorithm):
     if not isinstance(algorithm, Prehashed):
-        hash_ctx = hashes.Hash(algorithm, backend)
-        hash_ctx.update(data)
-        data = hash_ctx.finalize()
+        data = hashes.digest(algorithm, data, backend)
     else:
         algorithm = algorithm._algorithm
 
@@ -52,6 +50,48 @@ def _calculate_digest_and_algorithm(backend, data, algorithm):
     return (data, algorithm)
 
 
+def _eddsa_sign_many(backend, evp_pkey, sig_size, messages):
+    if not messages:
+        return []
+
+    # The from_buffer objects keep the messages alive for the call.
+    data_ptrs = [backend._ffi.from_buffer(data) for data in messages]
+    data = backend._ffi.new("const void *[]", data_ptrs)
+    data_len = backend._ffi.new("size_t[]", [len(d) for d in messages])
+    buf = backend._ffi_new_uninitialized(
+        "unsigned char[]", len(messages) * sig_size
+    )
+    res = backend._lib.Cryptography_EVP_DigestSign_many(
+        evp_pkey, data, data_len, len(messages), buf, sig_size
+    )
+    backend.openssl_assert(res == 1)
+    signatures = backend._ffi.buffer(buf)[:]
+    return [
+        signatures[i:i + sig_size]
+        for i in range(0, len(signatures), sig_size)
+    ]
+
+
+def _eddsa_verify_many(backend, evp_pkey, items):
+    if not items:
+        return []
+
+    sig_ptrs = [backend._ffi.from_buffer(sig) for sig, _ in items]
+    data_ptrs = [backend._ffi.from_buffer(data) for _, data in items]
+    sig = backend._ffi.new("const void *[]", sig_ptrs)
+    sig_len = backend._ffi.new("size_t[]", [len(s) for s, _ in items])
+    data = backend._ffi.new("const void *[]", data_ptrs)
+    data_len = backend._ffi.new("size_t[]", [len(d) for _, d in items])
+    results = backend._ffi.new("int[]", len(items))
+    res = backend._lib.Cryptography_EVP_DigestVerify_many(
+        evp_pkey, sig, sig_len, data, data_len, len(items), results
+    )
+    backend.openssl_assert(res == 1)
+    # Failed verifications leave errors on the queue.
+    backend._consume_errors()
+    return [result == 1 for result in results]
+
+
 def _check_not_prehashed(signature_algorithm):
     if isinstance(signature_algorithm, Prehashed):
         raise TypeError(
@@ -251,6 +251,8 @@ def cryptography_has_oneshot_evp_digest_sign_verify():
     return [
         "EVP_DigestSign",
         "EVP_DigestVerify",
+        "Cryptography_EVP_DigestSign_many",
+        "Cryptography_EVP_DigestVerify_many",
     ]
 
 
@@ -364,6 +366,54 @@ def cryptography_has_verified_chain():
     ]
 
 
+def cryptography_has_md5_ctx():
+    return [
+        "MD5_Init",
+        "MD5_Update",
+        "MD5_Final",
+        "Cryptography_MD5_CTX_new",
+        "Cryptography_MD5_CTX_dup",
+        "Cryptography_MD5_CTX_free",
+        "Cryptography_MD5_CTX_get_state",
+        "Cryptography_MD5_CTX_set_state",
+    ]
+
+
+def cryptography_has_sha_ctx():
+    return [
+        "SHA1_Init",
+        "SHA1_Update",
+        "SHA1_Final",
+        "SHA224_Init",
+        "SHA224_Update",
+        "SHA224_Final",
+        "SHA256_Init",
+        "SHA256_Update",
+        "SHA256_Final",
+        "SHA384_Init",
+        "SHA384_Update",
+        "SHA384_Final",
+        "SHA512_Init",
+        "SHA512_Update",
+        "SHA512_Final",
+        "Cryptography_SHA_CTX_new",
+        "Cryptography_SHA_CTX_dup",
+        "Cryptography_SHA_CTX_free",
+        "Cryptography_SHA_CTX_get_state",
+        "Cryptography_SHA_CTX_set_state",
+        "Cryptography_SHA256_CTX_new",
+        "Cryptography_SHA256_CTX_dup",
+        "Cryptography_SHA256_CTX_free",
+        "Cryptography_SHA256_CTX_get_state",
+        "Cryptography_SHA256_CTX_set_state",
+        "Cryptography_SHA512_CTX_new",
+        "Cryptography_SHA512_CTX_dup",
+        "Cryptography_SHA512_CTX_free",
+        "Cryptography_SHA512_CTX_get_state",
+        "Cryptography_SHA512_CTX_set_state",
+    ]
+
+
 # This is a mapping of
 # {condition: function-returning-names-dependent-on-that-condition} so we can
 # loop over them and delete unsupported names at runtime. It will be removed
@@ -438,4 +488,6 @@ CONDITIONAL_NAMES = {
     ),
     "Cryptography_HAS_ENGINE": cryptography_has_engine,
     "Cryptography_HAS_VERIFIED_CHAIN": cryptography_has_verified_chain,
+    "Cryptography_HAS_MD5_CTX": cryptography_has_md5_ctx,
+    "Cryptography_HAS_SHA_CTX": cryptography_has_sha_ctx,
 }
@@ -8,6 +8,13 @@ import abc
 
 import six
 
+from cryptography_patched.exceptions import InvalidSignature
+
+
+# The number of signatures each executor task verifies. Contexts are only
+# reused within a task, so this trades reuse against spreading the work.
+_VERIFY_CHUNK_SIZE = 256
+
 
 @six.add_metaclass(abc.ABCMeta)
 class AsymmetricSignatureContext(object):
@@ -38,3 +45,86 @@ class AsymmetricVerificationContext(object):
         Raises an exception if the bytes provided to update do not match the
         signature or the signature does not match the public key.
         """
+
+
+def verify_many(items, executor=None):
+    items = list(items)
+    if executor is None:
+        return _verify_items(items)
+
+    results = []
+    chunks = [
+        items[i:i + _VERIFY_CHUNK_SIZE]
+        for i in six.moves.range(0, len(items), _VERIFY_CHUNK_SIZE)
+    ]
+    for chunk_results in executor.map(_verify_items, chunks):
+        results.extend(chunk_results)
+    return results
+
+
+def _verify_items(items):
+    # Each call has its own verifiers, so no two threads ever share an
+    # OpenSSL context. Items are grouped by verifier, which then checks all
+    # of its signatures in one call. The items keep their keys alive, so a
+    # key's id() identifies it for the whole call.
+    groups = {}
+    for index, item in enumerate(items):
+        public_key, signature, data = item[:3]
+        args = tuple(item[3:])
+        cache_key = (id(public_key),) + tuple(_arg_key(arg) for arg in args)
+        group = groups.get(cache_key)
+        if group is None:
+            group = groups[cache_key] = (public_key, args, [], [])
+        group[2].append(index)
+        group[3].append((signature, data))
+
+    results = [None] * len(items)
+    for public_key, args, indices, pairs in groups.values():
+        verifier = _batch_verifier(public_key, args)
+        for index, result in zip(indices, verifier(pairs)):
+            results[index] = result
+    return results
+
+
+def _arg_key(arg):
+    # Paddings and algorithms that callers commonly create for every item
+    # are compared by their parameters, so that e.g. two PKCS1v15()
+    # instances share a verifier. Anything else only matches itself.
+    from cryptography_patched.hazmat.primitives import hashes
+    from cryptography_patched.hazmat.primitives.asymmetric import (
+        ec, padding, utils
+    )
+
+    if isinstance(arg, hashes.HashAlgorithm):
+        return (type(arg), arg.digest_size)
+    elif type(arg) is padding.PKCS1v15:
+        return (padding.PKCS1v15,)
+    elif type(arg) is padding.PSS and type(arg._mgf) is padding.MGF1:
+        return (
+            padding.PSS, _arg_key(arg._mgf._algorithm), arg._salt_length
+        )
+    elif type(arg) is ec.ECDSA:
+        return (ec.ECDSA, _arg_key(arg.algorithm))
+    elif type(arg) is utils.Prehashed:
+        return (utils.Prehashed, _arg_key(arg._algorithm))
+    else:
+        return (id(arg),)
+
+
+def _batch_verifier(public_key, args):
+    batch_verifier = getattr(public_key, "_batch_verifier", None)
+    if batch_verifier is not None:
+        return batch_verifier(*args)
+
+    def verify(items):
+        results = []
+        for signature, data in items:
+            try:
+                public_key.verify(signature, data, *args)
+            except InvalidSignature:
+                results.append(False)
+            else:
+                results.append(True)
+        return results
+
+    return verify
@@ -0,0 +1,189 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import collections
+import multiprocessing
+import threading
+import time
+
+import six
+
+from cryptography_patched import utils
+
+
+_clock = getattr(time, "monotonic", time.time)
+
+
+def _timed(worker, args):
+    start = _clock()
+    result = worker(*args)
+    return result, _clock() - start
+
+
+class _GenerationPool(object):
+    """
+    Keeps up to ``size`` generated objects ready, asking ``executor`` to make
+    more whenever the number ready or being made falls to ``low_water``.
+
+    ``worker(*args)`` runs in the executor and must return something that can
+    be pickled, which ``load`` turns back into the object in this process.
+    ``generate(*args)`` makes one directly, for when the pool is empty.
+    If a job fails the pool stops asking for more until the error has been
+    raised from a request that found the pool empty.
+    """
+
+    def __init__(self, generate, worker, load, args, size, low_water,
+                 executor):
+        if not isinstance(size, six.integer_types):
+            raise TypeError("size must be an integer.")
+
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+
+        if low_water is None:
+            low_water = size // 2
+
+        if not isinstance(low_water, six.integer_types):
+            raise TypeError("low_water must be an integer or None.")
+
+        if not 0 <= low_water < size:
+            raise ValueError("low_water must be at least 0 and below size.")
+
+        # An executor created here is owned, and shut down, by this object.
+        self._owns_executor = executor is None
+        if executor is None:
+            from concurrent import futures
+            executor = futures.ProcessPoolExecutor(
+                min(size, multiprocessing.cpu_count())
+            )
+
+        self._generate = generate
+        self._worker = worker
+        self._load = load
+        self._args = args
+        self._size = size
+        self._low_water = low_water
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._ready = collections.deque()
+        self._jobs = set()
+        self._closed = False
+        self._error = None
+        self._generated = 0
+        self._generation_time = 0.0
+        self._misses = 0
+        self._refill()
+
+    size = utils.read_only_property("_size")
+    low_water = utils.read_only_property("_low_water")
+
+    @property
+    def depth(self):
+        return len(self._ready)
+
+    @property
+    def in_flight(self):
+        return len(self._jobs)
+
+    @property
+    def generated(self):
+        return self._generated
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def mean_generation_time(self):
+        with self._lock:
+            if not self._generated:
+                return None
+            return self._generation_time / self._generated
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._closed = True
+            jobs = list(self._jobs)
+        for job in jobs:
+            job.cancel()
+        if self._owns_executor:
+            self._executor.shutdown(wait)
+
+    def _get(self):
+        with self._lock:
+            if self._ready:
+                item = self._ready.popleft()
+            elif self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            else:
+                item = None
+                self._misses += 1
+        self._refill()
+
+        if item is None:
+            # Waiting on a job that is already running could take as long as
+            # starting from scratch, so an empty pool generates directly.
+            item, elapsed = _timed(self._generate, self._args)
+            self._record(elapsed)
+        return item
+
+    def _record(self, elapsed):
+        with self._lock:
+            self._generated += 1
+            self._generation_time += elapsed
+
+    def _refill(self):
+        jobs = []
+        with self._lock:
+            if (
+                self._closed or
+                self._error is not None or
+                len(self._ready) + len(self._jobs) > self._low_water
+            ):
+                return
+            for _ in six.moves.range(
+                self._size - len(self._ready) - len(self._jobs)
+            ):
+                try:
+                    job = self._executor.submit(
+                        _timed, self._worker, self._args
+                    )
+                except Exception:
+                    # The executor can't take work, for example because it
+                    # was shut down, so requests are served directly.
+                    break
+                self._jobs.add(job)
+                jobs.append(job)
+
+        # Callbacks are added without holding the lock, since a job that has
+        # already finished runs its callback straight away.
+        for job in jobs:
+            job.add_done_callback(self._done)
+
+    def _done(self, job):
+        item = error = None
+        if not job.cancelled():
+            try:
+                result, elapsed = job.result()
+                item = self._load(result)
+            except Exception as e:
+                error = e
+            else:
+                self._record(elapsed)
+
+        with self._lock:
+            self._jobs.discard(job)
+            if error is not None:
+                self._error = error
+            elif item is not None and not self._closed:
+                self._ready.append(item)
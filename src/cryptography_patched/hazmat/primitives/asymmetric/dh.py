@@ -9,12 +9,51 @@ import abc
 import six
 
 from cryptography_patched import utils
+from cryptography_patched.exceptions import UnsupportedAlgorithm, _Reasons
+from cryptography_patched.hazmat.backends.interfaces import DHBackend
+from cryptography_patched.hazmat.primitives.asymmetric import _pool
 
 
 def generate_parameters(generator, key_size, backend):
     return backend.generate_dh_parameters(generator, key_size)
 
 
+def _generate_parameter_numbers(generator, key_size, backend):
+    return backend.generate_dh_parameters(
+        generator, key_size
+    ).parameter_numbers()
+
+
+class DHParametersPool(_pool._GenerationPool):
+    def __init__(self, generator, key_size, backend, size=4, low_water=None,
+                 executor=None):
+        if not isinstance(backend, DHBackend):
+            raise UnsupportedAlgorithm(
+                "Backend object does not implement DHBackend.",
+                _Reasons.BACKEND_MISSING_INTERFACE
+            )
+
+        if key_size < 512:
+            raise ValueError("DH key_size must be at least 512 bits")
+
+        if generator not in (2, 5):
+            raise ValueError("DH generator must be 2 or 5")
+
+        self._generator = generator
+        self._key_size = key_size
+        super(DHParametersPool, self).__init__(
+            generate_parameters, _generate_parameter_numbers,
+            lambda numbers: numbers.parameters(backend),
+            (generator, key_size, backend), size, low_water, executor
+        )
+
+    generator = utils.read_only_property("_generator")
+    key_size = utils.read_only_property("_key_size")
+
+    def generate_parameters(self):
+        return self._get()
+
+
 class DHPrivateNumbers(object):
     def __init__(self, x, public_numbers):
         if not isinstance(x, six.integer_types):
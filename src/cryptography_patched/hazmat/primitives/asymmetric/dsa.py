@@ -9,6 +9,9 @@ import abc
 import six
 
 from cryptography_patched import utils
+from cryptography_patched.exceptions import UnsupportedAlgorithm, _Reasons
+from cryptography_patched.hazmat.backends.interfaces import DSABackend
+from cryptography_patched.hazmat.primitives.asymmetric import _pool
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -127,6 +130,35 @@ def generate_private_key(key_size, backend):
     return backend.generate_dsa_private_key_and_parameters(key_size)
 
 
+def _generate_parameter_numbers(key_size, backend):
+    return backend.generate_dsa_parameters(key_size).parameter_numbers()
+
+
+class DSAParametersPool(_pool._GenerationPool):
+    def __init__(self, key_size, backend, size=4, low_water=None,
+                 executor=None):
+        if not isinstance(backend, DSABackend):
+            raise UnsupportedAlgorithm(
+                "Backend object does not implement DSABackend.",
+                _Reasons.BACKEND_MISSING_INTERFACE
+            )
+
+        if key_size not in (1024, 2048, 3072):
+            raise ValueError("Key size must be 1024 or 2048 or 3072 bits.")
+
+        self._key_size = key_size
+        super(DSAParametersPool, self).__init__(
+            generate_parameters, _generate_parameter_numbers,
+            lambda numbers: numbers.parameters(backend),
+            (key_size, backend), size, low_water, executor
+        )
+
+    key_size = utils.read_only_property("_key_size")
+
+    def generate_parameters(self):
+        return self._get()
+
+
 def _check_dsa_parameters(parameters):
     if parameters.p.bit_length() not in [1024, 2048, 3072]:
         raise ValueError("p must be exactly 1024, 2048, or 3072 bits long")
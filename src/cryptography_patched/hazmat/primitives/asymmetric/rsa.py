@@ -16,6 +16,7 @@ import six
 from cryptography_patched import utils
 from cryptography_patched.exceptions import UnsupportedAlgorithm, _Reasons
 from cryptography_patched.hazmat.backends.interfaces import RSABackend
+from cryptography_patched.hazmat.primitives.asymmetric import _pool
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -119,6 +120,37 @@ def generate_private_key(public_exponent, key_size, backend):
     return backend.generate_rsa_private_key(public_exponent, key_size)
 
 
+def _generate_private_numbers(public_exponent, key_size, backend):
+    return backend.generate_rsa_private_key(
+        public_exponent, key_size
+    ).private_numbers()
+
+
+class RSAKeyPool(_pool._GenerationPool):
+    def __init__(self, public_exponent, key_size, backend, size=8,
+                 low_water=None, executor=None):
+        if not isinstance(backend, RSABackend):
+            raise UnsupportedAlgorithm(
+                "Backend object does not implement RSABackend.",
+                _Reasons.BACKEND_MISSING_INTERFACE
+            )
+
+        _verify_rsa_parameters(public_exponent, key_size)
+        self._public_exponent = public_exponent
+        self._key_size = key_size
+        super(RSAKeyPool, self).__init__(
+            generate_private_key, _generate_private_numbers,
+            lambda numbers: numbers.private_key(backend),
+            (public_exponent, key_size, backend), size, low_water, executor
+        )
+
+    public_exponent = utils.read_only_property("_public_exponent")
+    key_size = utils.read_only_property("_key_size")
+
+    def generate_private_key(self):
+        return self._get()
+
+
 def _verify_rsa_parameters(public_exponent, key_size):
     if public_exponent < 3:
         raise ValueError("public_exponent must be >= 3.")
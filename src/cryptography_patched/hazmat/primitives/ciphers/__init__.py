@@ -6,7 +6,8 @@ from __future__ import absolute_import, division, print_function
 
 from cryptography_patched.hazmat.primitives.ciphers.base import (
     AEADCipherContext, AEADDecryptionContext, AEADEncryptionContext,
-    BlockCipherAlgorithm, Cipher, CipherAlgorithm, CipherContext
+    BlockCipherAlgorithm, Cipher, CipherAlgorithm, CipherContext,
+    decrypt_buffer, encrypt_buffer
 )
 
 
@@ -18,4 +19,6 @@ __all__ = [
     "AEADCipherContext",
     "AEADDecryptionContext",
     "AEADEncryptionContext",
+    "encrypt_buffer",
+    "decrypt_buffer",
 ]
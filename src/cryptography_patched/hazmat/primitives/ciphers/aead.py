@@ -5,12 +5,43 @@
 from __future__ import absolute_import, division, print_function
 
 import os
+import struct
 
 from cryptography_patched import exceptions, utils
 from cryptography_patched.hazmat.backends.openssl import aead
 from cryptography_patched.hazmat.backends.openssl.backend import backend
 
 
+def _check_buffer(buf, size):
+    if len(buf) < size:
+        raise ValueError(
+            "buffer must be at least {} bytes for this payload".format(size)
+        )
+
+
+def _prepare_items(cipher, items, encrypting):
+    # Validate the whole batch up front so that a bad item late in the batch
+    # doesn't leave the caller with a partially processed result.
+    prepared = []
+    for nonce, data, associated_data in items:
+        if associated_data is None:
+            associated_data = b""
+
+        if encrypting and (
+            len(data) > cipher._MAX_SIZE or
+            len(associated_data) > cipher._MAX_SIZE
+        ):
+            # This is OverflowError to match what cffi would raise
+            raise OverflowError(
+                "Data or associated data too long. Max 2**32 bytes"
+            )
+
+        cipher._check_params(nonce, data, associated_data)
+        prepared.append((nonce, data, associated_data))
+
+    return prepared
+
+
 class ChaCha20Poly1305(object):
     _MAX_SIZE = 2 ** 32
 
@@ -26,6 +57,9 @@ class ChaCha20Poly1305(object):
             raise ValueError("ChaCha20Poly1305 key must be 32 bytes.")
 
         self._key = key
+        self._ctx_cache = aead._AEADContextCache(
+            backend, aead._aead_cipher_name(self), key, 16
+        )
 
     @classmethod
     def generate_key(cls):
@@ -55,6 +89,40 @@ class ChaCha20Poly1305(object):
             backend, self, nonce, data, associated_data, 16
         )
 
+    def encrypt_into(self, nonce, data, associated_data, buf):
+        if associated_data is None:
+            associated_data = b""
+
+        if len(data) > self._MAX_SIZE or len(associated_data) > self._MAX_SIZE:
+            # This is OverflowError to match what cffi would raise
+            raise OverflowError(
+                "Data or associated data too long. Max 2**32 bytes"
+            )
+
+        self._check_params(nonce, data, associated_data)
+        _check_buffer(buf, len(data) + 16)
+        return aead._encrypt_into(
+            backend, self, nonce, data, associated_data, 16, buf
+        )
+
+    def decrypt_into(self, nonce, data, associated_data, buf):
+        if associated_data is None:
+            associated_data = b""
+
+        self._check_params(nonce, data, associated_data)
+        _check_buffer(buf, len(data) - 16)
+        return aead._decrypt_into(
+            backend, self, nonce, data, associated_data, 16, buf
+        )
+
+    def encrypt_many(self, items):
+        items = _prepare_items(self, items, True)
+        return aead._encrypt_many(backend, self, items, 16)
+
+    def decrypt_many(self, items):
+        items = _prepare_items(self, items, False)
+        return aead._decrypt_many(backend, self, items, 16)
+
     def _check_params(self, nonce, data, associated_data):
         utils._check_byteslike("nonce", nonce)
         utils._check_bytes("data", data)
@@ -86,6 +154,10 @@ class AESCCM(object):
                 exceptions._Reasons.UNSUPPORTED_CIPHER
             )
 
+        self._ctx_cache = aead._AEADContextCache(
+            backend, aead._aead_cipher_name(self), key, tag_length
+        )
+
     @classmethod
     def generate_key(cls, bit_length):
         if not isinstance(bit_length, int):
@@ -121,6 +193,43 @@ class AESCCM(object):
             backend, self, nonce, data, associated_data, self._tag_length
         )
 
+    def encrypt_into(self, nonce, data, associated_data, buf):
+        if associated_data is None:
+            associated_data = b""
+
+        if len(data) > self._MAX_SIZE or len(associated_data) > self._MAX_SIZE:
+            # This is OverflowError to match what cffi would raise
+            raise OverflowError(
+                "Data or associated data too long. Max 2**32 bytes"
+            )
+
+        self._check_params(nonce, data, associated_data)
+        self._validate_lengths(nonce, len(data))
+        _check_buffer(buf, len(data) + self._tag_length)
+        return aead._encrypt_into(
+            backend, self, nonce, data, associated_data, self._tag_length, buf
+        )
+
+    def decrypt_into(self, nonce, data, associated_data, buf):
+        if associated_data is None:
+            associated_data = b""
+
+        self._check_params(nonce, data, associated_data)
+        _check_buffer(buf, len(data) - self._tag_length)
+        return aead._decrypt_into(
+            backend, self, nonce, data, associated_data, self._tag_length, buf
+        )
+
+    def encrypt_many(self, items):
+        items = _prepare_items(self, items, True)
+        for nonce, data, associated_data in items:
+            self._validate_lengths(nonce, len(data))
+        return aead._encrypt_many(backend, self, items, self._tag_length)
+
+    def decrypt_many(self, items):
+        items = _prepare_items(self, items, False)
+        return aead._decrypt_many(backend, self, items, self._tag_length)
+
     def _validate_lengths(self, nonce, data_len):
         # For information about computing this, see
         # https://tools.ietf.org/html/rfc3610#section-2.1
@@ -145,6 +254,9 @@ class AESGCM(object):
             raise ValueError("AESGCM key must be 128, 192, or 256 bits.")
 
         self._key = key
+        self._ctx_cache = aead._AEADContextCache(
+            backend, aead._aead_cipher_name(self), key, 16
+        )
 
     @classmethod
     def generate_key(cls, bit_length):
@@ -180,9 +292,195 @@ class AESGCM(object):
             backend, self, nonce, data, associated_data, 16
         )
 
+    def encrypt_into(self, nonce, data, associated_data, buf):
+        if associated_data is None:
+            associated_data = b""
+
+        if len(data) > self._MAX_SIZE or len(associated_data) > self._MAX_SIZE:
+            # This is OverflowError to match what cffi would raise
+            raise OverflowError(
+                "Data or associated data too long. Max 2**32 bytes"
+            )
+
+        self._check_params(nonce, data, associated_data)
+        _check_buffer(buf, len(data) + 16)
+        return aead._encrypt_into(
+            backend, self, nonce, data, associated_data, 16, buf
+        )
+
+    def decrypt_into(self, nonce, data, associated_data, buf):
+        if associated_data is None:
+            associated_data = b""
+
+        self._check_params(nonce, data, associated_data)
+        _check_buffer(buf, len(data) - 16)
+        return aead._decrypt_into(
+            backend, self, nonce, data, associated_data, 16, buf
+        )
+
+    def encrypt_many(self, items):
+        items = _prepare_items(self, items, True)
+        return aead._encrypt_many(backend, self, items, 16)
+
+    def decrypt_many(self, items):
+        items = _prepare_items(self, items, False)
+        return aead._decrypt_many(backend, self, items, 16)
+
     def _check_params(self, nonce, data, associated_data):
         utils._check_byteslike("nonce", nonce)
         utils._check_bytes("data", data)
         utils._check_bytes("associated_data", associated_data)
         if len(nonce) == 0:
             raise ValueError("Nonce must be at least 1 byte")
+
+
+class StreamingAEAD(object):
+    # Each segment is sealed with the nonce
+    #   nonce_prefix (7 bytes) || segment counter (4 bytes) || last flag (1)
+    # which is the STREAM construction of Hoang, Reyhanitabar, Rogaway and
+    # Vizar. The last flag stops truncation and the counter stops segments
+    # being dropped or reordered.
+    _NONCE_PREFIX_SIZE = 7
+    _MAX_SEGMENTS = 2 ** 32
+    _TAG_SIZE = 16
+
+    def __init__(self, aead, segment_size=64 * 1024):
+        if not isinstance(aead, (AESGCM, ChaCha20Poly1305)):
+            raise TypeError("aead must be an AESGCM or ChaCha20Poly1305")
+
+        if not isinstance(segment_size, int):
+            raise TypeError("segment_size must be an integer")
+
+        if not 1 <= segment_size <= aead._MAX_SIZE:
+            raise ValueError(
+                "segment_size must be between 1 and 2**32 bytes"
+            )
+
+        self._aead = aead
+        self._segment_size = segment_size
+
+    segment_size = utils.read_only_property("_segment_size")
+
+    def encryptor(self, nonce_prefix, associated_data):
+        return _StreamingAEADEncryptionContext(
+            self, *self._check_params(nonce_prefix, associated_data)
+        )
+
+    def decryptor(self, nonce_prefix, associated_data):
+        return _StreamingAEADDecryptionContext(
+            self, *self._check_params(nonce_prefix, associated_data)
+        )
+
+    def _check_params(self, nonce_prefix, associated_data):
+        if associated_data is None:
+            associated_data = b""
+
+        utils._check_bytes("nonce_prefix", nonce_prefix)
+        utils._check_bytes("associated_data", associated_data)
+        if len(nonce_prefix) != self._NONCE_PREFIX_SIZE:
+            raise ValueError("nonce_prefix must be 7 bytes")
+
+        if len(associated_data) > self._aead._MAX_SIZE:
+            # This is OverflowError to match what cffi would raise
+            raise OverflowError("Associated data too long. Max 2**32 bytes")
+
+        return nonce_prefix, associated_data
+
+    def _nonce(self, nonce_prefix, counter, last):
+        if counter >= self._MAX_SEGMENTS:
+            raise OverflowError("Too many segments. Max 2**32 segments")
+
+        return nonce_prefix + struct.pack(">IB", counter, int(last))
+
+
+class _StreamingAEADEncryptionContext(object):
+    def __init__(self, stream, nonce_prefix, associated_data):
+        self._stream = stream
+        self._nonce_prefix = nonce_prefix
+        self._associated_data = associated_data
+        self._buffer = bytearray()
+        self._counter = 0
+        self._finalized = False
+
+    def update(self, data):
+        if self._finalized:
+            raise exceptions.AlreadyFinalized("Context was already finalized.")
+
+        utils._check_byteslike("data", data)
+        self._buffer += data
+        # Only seal a segment once we know more data follows it, so that the
+        # segment holding the end of the plaintext is always the one flagged
+        # as last.
+        segment_size = self._stream._segment_size
+        segments = []
+        offset = 0
+        while len(self._buffer) - offset > segment_size:
+            segments.append(self._seal(
+                bytes(self._buffer[offset:offset + segment_size]), False
+            ))
+            offset += segment_size
+
+        del self._buffer[:offset]
+        return b"".join(segments)
+
+    def finalize(self):
+        if self._finalized:
+            raise exceptions.AlreadyFinalized("Context was already finalized.")
+
+        segment = self._seal(bytes(self._buffer), True)
+        self._buffer = None
+        self._finalized = True
+        return segment
+
+    def _seal(self, segment, last):
+        nonce = self._stream._nonce(self._nonce_prefix, self._counter, last)
+        self._counter += 1
+        return self._stream._aead.encrypt(
+            nonce, segment, self._associated_data
+        )
+
+
+class _StreamingAEADDecryptionContext(object):
+    def __init__(self, stream, nonce_prefix, associated_data):
+        self._stream = stream
+        self._nonce_prefix = nonce_prefix
+        self._associated_data = associated_data
+        self._buffer = bytearray()
+        self._counter = 0
+        self._finalized = False
+
+    def update(self, data):
+        if self._finalized:
+            raise exceptions.AlreadyFinalized("Context was already finalized.")
+
+        utils._check_byteslike("data", data)
+        self._buffer += data
+        # A full segment can't be opened until we know whether it is the
+        # last one, which is only once more ciphertext has arrived.
+        segment_size = self._stream._segment_size + StreamingAEAD._TAG_SIZE
+        segments = []
+        offset = 0
+        while len(self._buffer) - offset > segment_size:
+            segments.append(self._open(
+                bytes(self._buffer[offset:offset + segment_size]), False
+            ))
+            offset += segment_size
+
+        del self._buffer[:offset]
+        return b"".join(segments)
+
+    def finalize(self):
+        if self._finalized:
+            raise exceptions.AlreadyFinalized("Context was already finalized.")
+
+        segment = self._open(bytes(self._buffer), True)
+        self._buffer = None
+        self._finalized = True
+        return segment
+
+    def _open(self, segment, last):
+        nonce = self._stream._nonce(self._nonce_prefix, self._counter, last)
+        self._counter += 1
+        return self._stream._aead.decrypt(
+            nonce, segment, self._associated_data
+        )
@@ -111,37 +111,157 @@ class Cipher(object):
         self.mode = mode
         self._backend = backend
 
-    def encryptor(self):
+    def encryptor(self, reusable=False):
         if isinstance(self.mode, modes.ModeWithAuthenticationTag):
             if self.mode.tag is not None:
                 raise ValueError(
                     "Authentication tag must be None when encrypting."
                 )
+        self._check_reusable(reusable)
         ctx = self._backend.create_symmetric_encryption_ctx(
             self.algorithm, self.mode
         )
-        return self._wrap_ctx(ctx, encrypt=True)
+        return self._wrap_ctx(ctx, encrypt=True, reusable=reusable)
 
-    def decryptor(self):
+    def decryptor(self, reusable=False):
+        self._check_reusable(reusable)
         ctx = self._backend.create_symmetric_decryption_ctx(
             self.algorithm, self.mode
         )
-        return self._wrap_ctx(ctx, encrypt=False)
+        return self._wrap_ctx(ctx, encrypt=False, reusable=reusable)
+
+    def _check_reusable(self, reusable):
+        if reusable and (
+            not isinstance(self.mode, (
+                modes.ModeWithInitializationVector, modes.ModeWithTweak,
+                modes.ModeWithNonce
+            )) or
+            isinstance(self.mode, modes.ModeWithAuthenticationTag)
+        ):
+            raise ValueError(
+                "Only contexts for modes with an initialization vector, "
+                "tweak or nonce and no authentication tag can be reusable."
+            )
 
-    def _wrap_ctx(self, ctx, encrypt):
+    def _wrap_ctx(self, ctx, encrypt, reusable):
         if isinstance(self.mode, modes.ModeWithAuthenticationTag):
             if encrypt:
                 return _AEADEncryptionContext(ctx)
             else:
                 return _AEADCipherContext(ctx)
         else:
-            return _CipherContext(ctx)
+            if reusable and getattr(ctx, "finalize_for_reset", None) is None:
+                raise UnsupportedAlgorithm(
+                    "Backend object does not support reusable cipher "
+                    "contexts.",
+                    _Reasons.UNSUPPORTED_CIPHER
+                )
+            return _CipherContext(ctx, reusable)
+
+
+_DEFAULT_WINDOW_SIZE = 1024 * 1024
+
+
+def encrypt_buffer(cipher, src, dst=None, window_size=_DEFAULT_WINDOW_SIZE,
+                   iv_for_window=None):
+    return _process_buffer(
+        cipher, cipher.encryptor, src, dst, window_size, iv_for_window
+    )
+
+
+def decrypt_buffer(cipher, src, dst=None, window_size=_DEFAULT_WINDOW_SIZE,
+                   iv_for_window=None):
+    return _process_buffer(
+        cipher, cipher.decryptor, src, dst, window_size, iv_for_window
+    )
+
+
+def _process_buffer(cipher, create_ctx, src, dst, window_size, iv_for_window):
+    if isinstance(cipher.mode, modes.ModeWithAuthenticationTag):
+        raise TypeError(
+            "Modes with an authentication tag can't be used with "
+            "encrypt_buffer or decrypt_buffer."
+        )
+
+    if isinstance(cipher.algorithm, BlockCipherAlgorithm):
+        block_size = cipher.algorithm.block_size // 8
+    else:
+        block_size = 1
+
+    if (
+        not isinstance(window_size, six.integer_types) or
+        window_size < 1 or window_size % block_size
+    ):
+        raise ValueError(
+            "window_size must be a positive multiple of the block size "
+            "({} bytes).".format(block_size)
+        )
+
+    src = memoryview(src)
+    if dst is None:
+        dst = src
+    else:
+        dst = memoryview(dst)
+
+    if dst.readonly:
+        raise TypeError("dst must be a writable buffer.")
+
+    if len(dst) < len(src):
+        raise ValueError(
+            "dst must be at least {} bytes for this payload".format(len(src))
+        )
+
+    # Each XTS update is encrypted as a separate data unit with the same
+    # tweak, so splitting a buffer into windows needs a tweak per window.
+    if (
+        isinstance(cipher.mode, modes.XTS) and iv_for_window is None and
+        len(src) > window_size
+    ):
+        raise ValueError(
+            "iv_for_window is required for XTS buffers larger than "
+            "window_size."
+        )
+
+    ctx = create_ctx(reusable=iv_for_window is not None)
+    scratch = None
+    written = 0
+    for index, start in enumerate(six.moves.range(0, len(src), window_size)):
+        end = min(start + window_size, len(src))
+        if iv_for_window is not None:
+            ctx.reset(iv_for_window(index))
+
+        # update_into needs block_size - 1 bytes of room past the output,
+        # which the end of dst may not have. Those windows go through a
+        # scratch buffer instead.
+        if len(dst) - written >= end - start + block_size - 1:
+            written += ctx.update_into(src[start:end], dst[written:])
+        else:
+            if scratch is None:
+                scratch = memoryview(bytearray(window_size + block_size - 1))
+            n = ctx.update_into(src[start:end], scratch)
+            dst[written:written + n] = scratch[:n]
+            written += n
+
+        if iv_for_window is not None:
+            written += _write_final(ctx, dst, written)
+
+    if iv_for_window is None:
+        written += _write_final(ctx, dst, written)
+    return written
+
+
+def _write_final(ctx, dst, written):
+    data = ctx.finalize()
+    dst[written:written + len(data)] = data
+    return len(data)
 
 
 @utils.register_interface(CipherContext)
 class _CipherContext(object):
-    def __init__(self, ctx):
+    def __init__(self, ctx, reusable=False):
         self._ctx = ctx
+        self._reusable = reusable
+        self._finalized_ctx = None
 
     def update(self, data):
         if self._ctx is None:
@@ -156,10 +276,27 @@ class _CipherContext(object):
     def finalize(self):
         if self._ctx is None:
             raise AlreadyFinalized("Context was already finalized.")
-        data = self._ctx.finalize()
+        # Only a reusable context keeps its key schedule once finalized.
+        if self._reusable:
+            data = self._ctx.finalize_for_reset()
+            self._finalized_ctx = self._ctx
+        else:
+            data = self._ctx.finalize()
         self._ctx = None
         return data
 
+    def reset(self, iv):
+        if not self._reusable:
+            raise TypeError(
+                "Only contexts created with reusable=True can be reset."
+            )
+        utils._check_byteslike("iv", iv)
+        ctx = self._ctx
+        if ctx is None:
+            ctx = self._finalized_ctx
+        ctx.reset(iv)
+        self._ctx = ctx
+
 
 @utils.register_interface(AEADCipherContext)
 @utils.register_interface(CipherContext)
@@ -15,6 +15,11 @@ from cryptography_patched.exceptions import (
 from cryptography_patched.hazmat.backends.interfaces import HashBackend
 
 
+# The size of the buffer files are read into by update_from_file, chosen to
+# amortize the per-read overhead without holding much memory.
+_FILE_CHUNK_SIZE = 256 * 1024
+
+
 @six.add_metaclass(abc.ABCMeta)
 class HashAlgorithm(object):
     @abc.abstractproperty
@@ -92,6 +97,39 @@ class Hash(object):
         utils._check_byteslike("data", data)
         self._ctx.update(data)
 
+    def update_from_file(self, fileobj, chunk_size=_FILE_CHUNK_SIZE):
+        if self._ctx is None:
+            raise AlreadyFinalized("Context was already finalized.")
+        if not isinstance(chunk_size, six.integer_types) or chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        readinto = getattr(fileobj, "readinto", None)
+        if readinto is None:
+            while True:
+                data = fileobj.read(chunk_size)
+                if data is None:
+                    raise ValueError(
+                        "non-blocking file objects are not supported"
+                    )
+                if not data:
+                    break
+                utils._check_byteslike("data", data)
+                self._ctx.update(data)
+            return
+
+        # Reading into one reused buffer avoids creating a bytes object for
+        # every chunk.
+        buf = memoryview(bytearray(chunk_size))
+        while True:
+            n = readinto(buf)
+            if n is None:
+                raise ValueError(
+                    "non-blocking file objects are not supported"
+                )
+            if not n:
+                break
+            self._ctx.update(buf[:n])
+
     def copy(self):
         if self._ctx is None:
             raise AlreadyFinalized("Context was already finalized.")
@@ -107,6 +145,95 @@ class Hash(object):
         return digest
 
 
+class ResumableHash(Hash):
+    def __init__(self, algorithm, backend, state=None, ctx=None):
+        if ctx is None:
+            if not isinstance(backend, HashBackend):
+                raise UnsupportedAlgorithm(
+                    "Backend object does not implement HashBackend.",
+                    _Reasons.BACKEND_MISSING_INTERFACE
+                )
+
+            if not isinstance(algorithm, HashAlgorithm):
+                raise TypeError("Expected instance of hashes.HashAlgorithm.")
+
+            if state is not None:
+                utils._check_bytes("state", state)
+
+            create_ctx = getattr(backend, "create_resumable_hash_ctx", None)
+            if create_ctx is None:
+                raise UnsupportedAlgorithm(
+                    "Backend object does not support resumable hashes.",
+                    _Reasons.UNSUPPORTED_HASH
+                )
+            ctx = create_ctx(algorithm, state)
+
+        super(ResumableHash, self).__init__(algorithm, backend, ctx)
+
+    def copy(self):
+        if self._ctx is None:
+            raise AlreadyFinalized("Context was already finalized.")
+        return ResumableHash(
+            self.algorithm, backend=self._backend, ctx=self._ctx.copy()
+        )
+
+    def export_state(self):
+        if self._ctx is None:
+            raise AlreadyFinalized("Context was already finalized.")
+        return self._ctx.export_state()
+
+
+def digest(algorithm, data, backend):
+    if not isinstance(backend, HashBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HashBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not isinstance(algorithm, HashAlgorithm):
+        raise TypeError("Expected instance of hashes.HashAlgorithm.")
+
+    utils._check_byteslike("data", data)
+    return _digest(algorithm, data, backend)
+
+
+def digest_many(algorithm, buffers, backend):
+    if not isinstance(backend, HashBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HashBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not isinstance(algorithm, HashAlgorithm):
+        raise TypeError("Expected instance of hashes.HashAlgorithm.")
+
+    buffers = list(buffers)
+    for data in buffers:
+        utils._check_byteslike("data", data)
+
+    hash_digest_many = getattr(backend, "hash_digest_many", None)
+    if hash_digest_many is None:
+        return [_digest(algorithm, data, backend) for data in buffers]
+    return hash_digest_many(algorithm, buffers)
+
+
+def _digest(algorithm, data, backend):
+    # hash_digest is an optional fast path that HashBackend doesn't require,
+    # so other backends hash through a context instead.
+    hash_digest = getattr(backend, "hash_digest", None)
+    if hash_digest is None:
+        h = Hash(algorithm, backend)
+        h.update(data)
+        return h.finalize()
+    return hash_digest(algorithm, data)
+
+
+def file_digest(algorithm, fileobj, backend, chunk_size=_FILE_CHUNK_SIZE):
+    h = Hash(algorithm, backend)
+    h.update_from_file(fileobj, chunk_size)
+    return h.finalize()
+
+
 @utils.register_interface(HashAlgorithm)
 class SHA1(object):
     name = "sha1"
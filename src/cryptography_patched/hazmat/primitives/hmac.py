@@ -4,6 +4,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+import six
+
 from cryptography_patched import utils
 from cryptography_patched.exceptions import (
     AlreadyFinalized, UnsupportedAlgorithm, _Reasons
@@ -64,3 +66,65 @@ class HMAC(object):
 
         ctx, self._ctx = self._ctx, None
         ctx.verify(signature)
+
+
+class HMACKey(object):
+    def __init__(self, key, algorithm, backend):
+        # The keyed context is never finalized. Every MAC starts from a copy
+        # of it, which skips hashing the key pads again.
+        h = HMAC(key, algorithm, backend)
+        self._key = key
+        self._algorithm = algorithm
+        self._backend = backend
+        self._ctx = h._ctx
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    def hmac(self):
+        return HMAC(
+            self._key, self._algorithm, self._backend, ctx=self._ctx.copy()
+        )
+
+    def generate_tag(self, data):
+        utils._check_byteslike("data", data)
+        ctx = self._ctx.copy()
+        ctx.update(data)
+        return ctx.finalize()
+
+    def verify_tag(self, data, signature):
+        utils._check_byteslike("data", data)
+        utils._check_bytes("signature", signature)
+        ctx = self._ctx.copy()
+        ctx.update(data)
+        ctx.verify(signature)
+
+
+class HMACKeyCache(object):
+    def __init__(self, max_size):
+        if not isinstance(max_size, six.integer_types):
+            raise TypeError("max_size must be an integer.")
+
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+
+        self._keys = utils._LRUCache(max_size)
+
+    def get(self, key, algorithm, backend):
+        if not isinstance(key, bytes):
+            utils._check_byteslike("key", key)
+            key = bytes(key)
+
+        # Only keys that passed HMACKey's checks are ever stored, so a hit
+        # doesn't need to validate the arguments again.
+        cache_key = (
+            key, type(algorithm), getattr(algorithm, "name", None),
+            getattr(algorithm, "digest_size", None), backend
+        )
+        hmac_key = self._keys.get(cache_key)
+        if hmac_key is None:
+            hmac_key = HMACKey(key, algorithm, backend)
+            self._keys.set(cache_key, hmac_key)
+        return hmac_key
+
+    def clear(self):
+        self._keys.clear()
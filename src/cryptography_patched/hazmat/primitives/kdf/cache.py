@@ -0,0 +1,88 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import numbers
+import os
+import struct
+import time
+
+import six
+
+from cryptography_patched import utils
+from cryptography_patched.hazmat.primitives import hashes, hmac
+from cryptography_patched.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography_patched.hazmat.primitives.kdf.scrypt import Scrypt
+
+
+_clock = getattr(time, "monotonic", time.time)
+
+
+def _kdf_parameters(kdf):
+    if isinstance(kdf, PBKDF2HMAC):
+        return [
+            b"pbkdf2", kdf._algorithm.name.encode("ascii"), kdf._length,
+            kdf._salt, kdf._iterations
+        ]
+    elif isinstance(kdf, Scrypt):
+        return [b"scrypt", kdf._length, kdf._salt, kdf._n, kdf._r, kdf._p]
+    else:
+        raise TypeError("kdf must be a PBKDF2HMAC or Scrypt instance.")
+
+
+class VerificationCache(object):
+    def __init__(self, max_size, ttl, backend):
+        if not isinstance(max_size, six.integer_types):
+            raise TypeError("max_size must be an integer.")
+
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+
+        if not isinstance(ttl, numbers.Real):
+            raise TypeError("ttl must be a number of seconds.")
+
+        if ttl <= 0:
+            raise ValueError("ttl must be positive.")
+
+        # Entries are keyed on a MAC under a key that only lives in this
+        # object, so neither the passwords nor anything that could be used
+        # to guess them offline are kept. It also means looking a tag up
+        # can't leak anything useful through timing.
+        self._hmac_key = hmac.HMACKey(os.urandom(32), hashes.SHA256(), backend)
+        self._ttl = ttl
+        self._entries = utils._LRUCache(max_size)
+
+    ttl = utils.read_only_property("_ttl")
+
+    def verify(self, kdf, key_material, expected_key):
+        utils._check_byteslike("key_material", key_material)
+        utils._check_bytes("expected_key", expected_key)
+        tag = self._tag(
+            _kdf_parameters(kdf) + [bytes(key_material), expected_key]
+        )
+
+        expires = self._entries.get(tag)
+        if expires is not None and _clock() < expires:
+            return
+
+        # Only successful verifications are remembered, so a wrong password
+        # always pays the full cost of the key derivation.
+        kdf.verify(key_material, expected_key)
+        self._entries.set(tag, _clock() + self._ttl)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _tag(self, fields):
+        ctx = self._hmac_key.hmac()
+        for field in fields:
+            if isinstance(field, six.integer_types):
+                field = str(field).encode("ascii")
+            ctx.update(struct.pack(">Q", len(field)))
+            ctx.update(field)
+        return ctx.finalize()
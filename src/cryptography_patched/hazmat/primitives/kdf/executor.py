@@ -0,0 +1,150 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import collections
+import functools
+import multiprocessing
+import threading
+from concurrent import futures
+
+import six
+
+from cryptography_patched import utils
+from cryptography_patched.hazmat.primitives.kdf import KeyDerivationFunction
+
+
+class KDFQueueFullError(Exception):
+    pass
+
+
+def _derive(kdf, key_material):
+    return kdf.derive(key_material)
+
+
+def _verify(kdf, key_material, expected_key):
+    kdf.verify(key_material, expected_key)
+
+
+class KDFExecutor(object):
+    def __init__(self, executor=None, max_concurrency=None, max_pending=None):
+        if max_concurrency is None:
+            max_concurrency = multiprocessing.cpu_count()
+
+        if not isinstance(max_concurrency, six.integer_types):
+            raise TypeError("max_concurrency must be an integer.")
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
+        if max_pending is not None:
+            if not isinstance(max_pending, six.integer_types):
+                raise TypeError("max_pending must be an integer or None.")
+
+            if max_pending < 0:
+                raise ValueError("max_pending must not be negative.")
+
+        # An executor created here is owned, and shut down, by this object.
+        self._owns_executor = executor is None
+        if executor is None:
+            executor = futures.ThreadPoolExecutor(max_concurrency)
+
+        self._executor = executor
+        self._max_concurrency = max_concurrency
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = collections.deque()
+        self._running = 0
+
+    max_concurrency = utils.read_only_property("_max_concurrency")
+    max_pending = utils.read_only_property("_max_pending")
+
+    def derive(self, kdf, key_material):
+        utils._check_byteslike("key_material", key_material)
+        return self._submit(_derive, kdf, bytes(key_material))
+
+    def verify(self, kdf, key_material, expected_key):
+        utils._check_byteslike("key_material", key_material)
+        utils._check_bytes("expected_key", expected_key)
+        return self._submit(_verify, kdf, bytes(key_material), expected_key)
+
+    def derive_async(self, kdf, key_material, loop=None):
+        import asyncio
+        return asyncio.wrap_future(self.derive(kdf, key_material), loop=loop)
+
+    def verify_async(self, kdf, key_material, expected_key, loop=None):
+        import asyncio
+        return asyncio.wrap_future(
+            self.verify(kdf, key_material, expected_key), loop=loop
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pending, self._pending = self._pending, collections.deque()
+        for future, _, _ in pending:
+            future.cancel()
+        if self._owns_executor:
+            self._executor.shutdown(wait)
+
+    def _submit(self, func, kdf, *args):
+        if not isinstance(kdf, KeyDerivationFunction):
+            raise TypeError(
+                "kdf must be an instance of KeyDerivationFunction."
+            )
+
+        future = futures.Future()
+        with self._lock:
+            if (
+                self._max_pending is not None and
+                self._running >= self._max_concurrency and
+                len(self._pending) >= self._max_pending
+            ):
+                raise KDFQueueFullError(
+                    "Too many key derivations are waiting to run."
+                )
+            self._pending.append((future, func, (kdf,) + args))
+        self._start_pending()
+        return future
+
+    def _start_pending(self):
+        # Jobs are held here, rather than in the executor's own queue, so at
+        # most max_concurrency of them occupy the executor at once and the
+        # rest wait in order without starving other work submitted to it.
+        while True:
+            with self._lock:
+                if self._running >= self._max_concurrency or not self._pending:
+                    return
+                future, func, args = self._pending.popleft()
+                self._running += 1
+
+            if not future.set_running_or_notify_cancel():
+                self._finish()
+                continue
+
+            try:
+                job = self._executor.submit(func, *args)
+            except Exception as e:
+                future.set_exception(e)
+                self._finish()
+            else:
+                job.add_done_callback(functools.partial(self._done, future))
+
+    def _done(self, future, job):
+        try:
+            future.set_result(job.result())
+        except Exception as e:
+            future.set_exception(e)
+        self._finish()
+
+    def _finish(self):
+        with self._lock:
+            self._running -= 1
+        self._start_pending()
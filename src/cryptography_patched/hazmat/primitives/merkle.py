@@ -0,0 +1,211 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import collections
+
+import six
+
+from cryptography_patched import utils
+from cryptography_patched.exceptions import (
+    AlreadyFinalized, InvalidSignature, UnsupportedAlgorithm, _Reasons
+)
+from cryptography_patched.hazmat.backends.interfaces import HashBackend
+from cryptography_patched.hazmat.primitives import constant_time, hashes
+
+
+# The leaf and node prefixes from RFC 6962 section 2.1, which keep a leaf
+# from being passed off as an interior node.
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+# The number of leaves handed to an executor before waiting for the oldest
+# one, which bounds the amount of leaf data held in memory.
+_MAX_PENDING_LEAVES = 64
+
+
+def _check_args(algorithm, backend):
+    if not isinstance(backend, HashBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HashBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not isinstance(algorithm, hashes.HashAlgorithm):
+        raise TypeError("Expected instance of hashes.HashAlgorithm.")
+
+
+def hash_leaf(algorithm, data, backend):
+    _check_args(algorithm, backend)
+    utils._check_byteslike("data", data)
+    return _hash_leaf(algorithm, data, backend)
+
+
+def _hash_leaf(algorithm, data, backend):
+    h = hashes.Hash(algorithm, backend)
+    h.update(_LEAF_PREFIX)
+    h.update(data)
+    return h.finalize()
+
+
+def _hash_node(algorithm, left, right, backend):
+    return hashes.digest(algorithm, _NODE_PREFIX + left + right, backend)
+
+
+class MerkleTreeHash(object):
+    def __init__(self, algorithm, backend, leaf_size=1024 * 1024,
+                 executor=None):
+        _check_args(algorithm, backend)
+        if not isinstance(leaf_size, six.integer_types) or leaf_size < 1:
+            raise ValueError("leaf_size must be a positive integer.")
+
+        self._algorithm = algorithm
+        self._backend = backend
+        self._leaf_size = leaf_size
+        self._executor = executor
+        self._buffer = bytearray()
+        self._leaf_hashes = []
+        self._pending = collections.deque()
+        self._finalized = False
+
+    algorithm = utils.read_only_property("_algorithm")
+    leaf_size = utils.read_only_property("_leaf_size")
+
+    def update(self, data):
+        if self._finalized:
+            raise AlreadyFinalized("Context was already finalized.")
+        utils._check_byteslike("data", data)
+
+        data = memoryview(data)
+        offset = 0
+        if self._buffer:
+            offset = min(len(data), self._leaf_size - len(self._buffer))
+            self._buffer += data[:offset]
+            if len(self._buffer) < self._leaf_size:
+                return
+            self._add_leaf(bytes(self._buffer))
+            self._buffer = bytearray()
+
+        while len(data) - offset >= self._leaf_size:
+            self._add_leaf(data[offset:offset + self._leaf_size].tobytes())
+            offset += self._leaf_size
+
+        self._buffer += data[offset:]
+
+    def finalize(self):
+        if self._finalized:
+            raise AlreadyFinalized("Context was already finalized.")
+
+        # The last leaf may be short, and an empty input is a single empty
+        # leaf.
+        if self._buffer or not (self._leaf_hashes or self._pending):
+            self._add_leaf(bytes(self._buffer))
+        self._buffer = None
+
+        while self._pending:
+            self._leaf_hashes.append(self._pending.popleft().result())
+
+        self._finalized = True
+        return MerkleTree(self._algorithm, self._leaf_hashes, self._backend)
+
+    def _add_leaf(self, leaf):
+        if self._executor is None:
+            self._leaf_hashes.append(
+                _hash_leaf(self._algorithm, leaf, self._backend)
+            )
+            return
+
+        self._pending.append(self._executor.submit(
+            _hash_leaf, self._algorithm, leaf, self._backend
+        ))
+        while len(self._pending) > _MAX_PENDING_LEAVES:
+            self._leaf_hashes.append(self._pending.popleft().result())
+
+
+class MerkleTree(object):
+    def __init__(self, algorithm, leaf_hashes, backend):
+        _check_args(algorithm, backend)
+        leaf_hashes = list(leaf_hashes)
+        if not leaf_hashes:
+            raise ValueError("A Merkle tree needs at least one leaf.")
+
+        for leaf_hash in leaf_hashes:
+            utils._check_bytes("leaf_hash", leaf_hash)
+            if len(leaf_hash) != algorithm.digest_size:
+                raise ValueError(
+                    "Leaf hashes must be {} bytes.".format(
+                        algorithm.digest_size
+                    )
+                )
+
+        self._algorithm = algorithm
+        self._backend = backend
+
+        # Each level pairs up the nodes of the one below, and an unpaired
+        # last node is moved up unchanged. This gives the same root as the
+        # recursive definition in RFC 6962.
+        self._levels = [leaf_hashes]
+        while len(self._levels[-1]) > 1:
+            below = self._levels[-1]
+            level = hashes.digest_many(algorithm, [
+                _NODE_PREFIX + below[i] + below[i + 1]
+                for i in six.moves.range(0, len(below) - 1, 2)
+            ], backend)
+            if len(below) % 2:
+                level.append(below[-1])
+            self._levels.append(level)
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    @property
+    def root(self):
+        return self._levels[-1][0]
+
+    @property
+    def leaf_hashes(self):
+        return list(self._levels[0])
+
+    def inclusion_proof(self, index):
+        if not isinstance(index, six.integer_types):
+            raise TypeError("index must be an integer.")
+
+        if not 0 <= index < len(self._levels[0]):
+            raise ValueError("index is out of range for this tree.")
+
+        proof = []
+        for level in self._levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append(level[sibling])
+            index //= 2
+        return proof
+
+
+def verify_inclusion(algorithm, root, leaf_hash, index, leaf_count, proof,
+                     backend):
+    _check_args(algorithm, backend)
+    utils._check_bytes("root", root)
+    utils._check_bytes("leaf_hash", leaf_hash)
+    if not 0 <= index < leaf_count:
+        raise ValueError("index is out of range for this tree.")
+
+    node = leaf_hash
+    proof = iter(proof)
+    try:
+        while leaf_count > 1:
+            if index % 2:
+                node = _hash_node(algorithm, next(proof), node, backend)
+            elif index + 1 < leaf_count:
+                node = _hash_node(algorithm, node, next(proof), backend)
+            index //= 2
+            leaf_count = (leaf_count + 1) // 2
+    except StopIteration:
+        raise InvalidSignature("Inclusion proof is too short.")
+
+    for _ in proof:
+        raise InvalidSignature("Inclusion proof is too long.")
+
+    if not constant_time.bytes_eq(node, root):
+        raise InvalidSignature("Inclusion proof did not match the root.")
@@ -7,8 +7,9 @@ from __future__ import absolute_import, division, print_function
 from cryptography_patched.hazmat.primitives.serialization.base import (
     BestAvailableEncryption, Encoding, KeySerializationEncryption,
     NoEncryption, ParameterFormat, PrivateFormat, PublicFormat,
-    load_der_parameters, load_der_private_key, load_der_public_key,
-    load_pem_parameters, load_pem_private_key, load_pem_public_key,
+    PublicKeyCache, load_der_parameters, load_der_private_key,
+    load_der_public_key, load_pem_parameters, load_pem_private_key,
+    load_pem_public_key,
 )
 from cryptography_patched.hazmat.primitives.serialization.ssh import (
     load_ssh_public_key
@@ -22,5 +23,5 @@ __all__ = [
     "load_pem_parameters", "load_pem_private_key", "load_pem_public_key",
     "load_ssh_public_key", "Encoding", "PrivateFormat", "PublicFormat",
     "ParameterFormat", "KeySerializationEncryption", "BestAvailableEncryption",
-    "NoEncryption",
+    "NoEncryption", "PublicKeyCache",
 ]
@@ -5,6 +5,7 @@
 from __future__ import absolute_import, division, print_function
 
 import abc
+import threading
 from enum import Enum
 
 import six
@@ -36,6 +37,60 @@ def load_der_parameters(data, backend):
     return backend.load_der_parameters(data)
 
 
+class PublicKeyCache(object):
+    def __init__(self, max_size):
+        if not isinstance(max_size, six.integer_types):
+            raise TypeError("max_size must be an integer.")
+
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+
+        self._keys = utils._LRUCache(max_size)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def load_pem_public_key(self, data, backend):
+        return self._load(load_pem_public_key, Encoding.PEM, data, backend)
+
+    def load_der_public_key(self, data, backend):
+        return self._load(load_der_public_key, Encoding.DER, data, backend)
+
+    def clear(self):
+        self._keys.clear()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _load(self, loader, encoding, data, backend):
+        if not isinstance(data, bytes):
+            utils._check_byteslike("data", data)
+            data = bytes(data)
+
+        # Public key objects have no methods that change them, so one object
+        # can be handed to every caller that loads the same bytes. Data that
+        # fails to load is never stored.
+        cache_key = (encoding, data, backend)
+        key = self._keys.get(cache_key)
+        with self._lock:
+            if key is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if key is None:
+            key = loader(data, backend)
+            self._keys.set(cache_key, key)
+        return key
+
+
 class Encoding(Enum):
     PEM = "PEM"
     DER = "DER"
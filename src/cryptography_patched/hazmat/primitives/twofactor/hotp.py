@@ -43,6 +43,7 @@ class HOTP(object):
         self._length = length
         self._algorithm = algorithm
         self._backend = backend
+        self._hmac_key = hmac.HMACKey(key, algorithm, backend)
 
     def generate(self, counter):
         truncated_value = self._dynamic_truncate(counter)
@@ -53,10 +54,32 @@ class HOTP(object):
         if not constant_time.bytes_eq(self.generate(counter), hotp):
             raise InvalidToken("Supplied HOTP value does not match.")
 
+    def verify_window(self, hotp, counter, look_ahead):
+        if not isinstance(look_ahead, six.integer_types):
+            raise TypeError("look_ahead must be an integer.")
+
+        if look_ahead < 0:
+            raise ValueError("look_ahead must not be negative.")
+
+        matched = self._match(hotp, range(counter, counter + look_ahead + 1))
+        if matched is None:
+            raise InvalidToken("Supplied HOTP value does not match.")
+        return matched
+
+    def _match(self, hotp, counters):
+        # Every candidate is generated and compared, so the time taken
+        # doesn't depend on which counter, if any, matched.
+        matched = None
+        for counter in counters:
+            if (
+                constant_time.bytes_eq(self.generate(counter), hotp) and
+                matched is None
+            ):
+                matched = counter
+        return matched
+
     def _dynamic_truncate(self, counter):
-        ctx = hmac.HMAC(self._key, self._algorithm, self._backend)
-        ctx.update(struct.pack(">Q", counter))
-        hmac_value = ctx.finalize()
+        hmac_value = self._hmac_key.generate_tag(struct.pack(">Q", counter))
 
         offset = six.indexbytes(hmac_value, len(hmac_value) - 1) & 0b1111
         p = hmac_value[offset:offset + 4]
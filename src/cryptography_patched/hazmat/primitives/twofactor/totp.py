@@ -4,6 +4,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+import six
+
 from cryptography_patched.exceptions import (
     UnsupportedAlgorithm, _Reasons
 )
@@ -34,6 +36,28 @@ class TOTP(object):
         if not constant_time.bytes_eq(self.generate(time), totp):
             raise InvalidToken("Supplied TOTP value does not match.")
 
+    def verify_with_drift(self, totp, time, steps):
+        if not isinstance(steps, six.integer_types):
+            raise TypeError("steps must be an integer.")
+
+        if steps < 0:
+            raise ValueError("steps must not be negative.")
+
+        # Counters are tried closest to the current time step first, so the
+        # smallest drift wins if more than one of them matches.
+        counter = int(time / self._time_step)
+        counters = [counter]
+        for drift in range(1, steps + 1):
+            counters.append(counter - drift)
+            counters.append(counter + drift)
+
+        matched = self._hotp._match(
+            totp, [c for c in counters if c >= 0]
+        )
+        if matched is None:
+            raise InvalidToken("Supplied TOTP value does not match.")
+        return matched
+
     def get_provisioning_uri(self, account_name, issuer):
         return _generate_uri(self._hotp, "totp", account_name, issuer, [
             ("period", int(self._time_step)),
@@ -6,8 +6,10 @@ from __future__ import absolute_import, division, print_function
 
 import abc
 import binascii
+import collections
 import inspect
 import sys
+import threading
 import warnings
 
 
@@ -171,3 +173,38 @@ def cached_property(func):
         setattr(instance, cached_name, result)
         return result
     return property(inner)
+
+
+class _LRUCache(object):
+    """
+    A small thread-safe mapping that holds at most ``max_size`` entries,
+    evicting the least recently used entry when it is full.
+    """
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                return default
+            self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
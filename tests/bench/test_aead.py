@@ -0,0 +1,87 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import pytest
+
+from cryptography_patched.hazmat.primitives.ciphers.aead import (
+    AESCCM, AESGCM, ChaCha20Poly1305
+)
+
+from ..hazmat.primitives.test_aead import _aead_supported
+
+
+_BATCH_SIZE = 1000
+
+
+def _items(nonce_len, size):
+    return [
+        (os.urandom(nonce_len), b"\x00" * size, b"")
+        for _ in range(_BATCH_SIZE)
+    ]
+
+
+def _ciphers():
+    ciphers = [AESGCM(AESGCM.generate_key(128))]
+    if _aead_supported(ChaCha20Poly1305):
+        ciphers.append(ChaCha20Poly1305(ChaCha20Poly1305.generate_key()))
+    if _aead_supported(AESCCM):
+        ciphers.append(AESCCM(AESCCM.generate_key(128)))
+    return ciphers
+
+
+@pytest.fixture(params=_ciphers(), ids=lambda c: type(c).__name__)
+def cipher(request):
+    return request.param
+
+
+@pytest.mark.parametrize("size", [64, 1024])
+def test_encrypt_loop(benchmark, cipher, size):
+    items = _items(12, size)
+
+    def encrypt_loop():
+        return [cipher.encrypt(n, data, ad) for n, data, ad in items]
+
+    benchmark(encrypt_loop)
+
+
+@pytest.mark.parametrize("size", [64, 1024])
+def test_encrypt_many(benchmark, cipher, size):
+    items = _items(12, size)
+    benchmark(cipher.encrypt_many, items)
+
+
+@pytest.mark.parametrize("size", [64, 1024])
+def test_encrypt_into_loop(benchmark, cipher, size):
+    items = _items(12, size)
+    buf = bytearray(size + 16)
+
+    def encrypt_into_loop():
+        for n, data, ad in items:
+            cipher.encrypt_into(n, data, ad, buf)
+
+    benchmark(encrypt_into_loop)
+
+
+@pytest.mark.parametrize("size", [64, 1024])
+def test_decrypt_loop(benchmark, cipher, size):
+    items = _items(12, size)
+    cts = cipher.encrypt_many(items)
+    items = [(n, ct, ad) for (n, _, ad), ct in zip(items, cts)]
+
+    def decrypt_loop():
+        return [cipher.decrypt(n, ct, ad) for n, ct, ad in items]
+
+    benchmark(decrypt_loop)
+
+
+@pytest.mark.parametrize("size", [64, 1024])
+def test_decrypt_many(benchmark, cipher, size):
+    items = _items(12, size)
+    cts = cipher.encrypt_many(items)
+    items = [(n, ct, ad) for (n, _, ad), ct in zip(items, cts)]
+    benchmark(cipher.decrypt_many, items)
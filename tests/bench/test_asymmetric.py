@@ -0,0 +1,112 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from cryptography_patched.exceptions import InvalidSignature
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives import hashes
+from cryptography_patched.hazmat.primitives.asymmetric import (
+    ec, ed25519, padding, rsa, verify_many
+)
+
+from ..doubles import DummyExecutor
+
+
+def _rsa_items():
+    private_key = rsa.generate_private_key(65537, 2048, default_backend())
+    pad = padding.PKCS1v15()
+    algorithm = hashes.SHA256()
+    return [
+        (private_key.public_key(), private_key.sign(data, pad, algorithm),
+         data, pad, algorithm)
+        for data in [b"event %d" % i for i in range(100)]
+    ]
+
+
+def _ecdsa_items():
+    private_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    algorithm = ec.ECDSA(hashes.SHA256())
+    return [
+        (private_key.public_key(), private_key.sign(data, algorithm), data,
+         algorithm)
+        for data in [b"event %d" % i for i in range(100)]
+    ]
+
+
+def _ed25519_items():
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    return [
+        (private_key.public_key(), private_key.sign(data), data)
+        for data in [b"event %d" % i for i in range(100)]
+    ]
+
+
+_ITEMS = {
+    "rsa": _rsa_items,
+    "ecdsa": _ecdsa_items,
+    "ed25519": _ed25519_items,
+}
+
+
+@pytest.mark.parametrize("kind", sorted(_ITEMS))
+def test_verify_loop(benchmark, kind):
+    items = _ITEMS[kind]()
+
+    def verify():
+        results = []
+        for item in items:
+            try:
+                item[0].verify(*item[1:])
+            except InvalidSignature:
+                results.append(False)
+            else:
+                results.append(True)
+        return results
+
+    assert all(benchmark(verify))
+
+
+@pytest.mark.parametrize("kind", sorted(_ITEMS))
+def test_verify_many(benchmark, kind):
+    items = _ITEMS[kind]()
+    assert all(benchmark(verify_many, items))
+
+
+def test_ed25519_sign_loop(benchmark):
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    messages = [b"event %d" % i for i in range(100)]
+    benchmark(lambda: [private_key.sign(data) for data in messages])
+
+
+def test_ed25519_sign_many(benchmark):
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    messages = [b"event %d" % i for i in range(100)]
+    benchmark(private_key.sign_many, messages)
+
+
+def test_ed25519_verify_public_key_many(benchmark):
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    messages = [b"event %d" % i for i in range(100)]
+    items = list(zip(private_key.sign_many(messages), messages))
+    assert all(benchmark(private_key.public_key().verify_many, items))
+
+
+def test_rsa_generate_private_key(benchmark):
+    benchmark.pedantic(
+        rsa.generate_private_key, args=(65537, 2048, default_backend()),
+        rounds=10
+    )
+
+
+def test_rsa_key_pool(benchmark):
+    pytest.importorskip("concurrent.futures")
+    pool = rsa.RSAKeyPool(
+        65537, 2048, default_backend(), size=11, low_water=0,
+        executor=DummyExecutor()
+    )
+    benchmark.pedantic(pool.generate_private_key, rounds=10)
+    assert pool.misses == 0
@@ -0,0 +1,69 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import os
+
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives.ciphers import (
+    Cipher, algorithms, encrypt_buffer, modes
+)
+
+
+def test_cbc_new_context(benchmark):
+    key = os.urandom(32)
+    iv = os.urandom(16)
+    data = b"\x00" * 64
+
+    def encrypt():
+        encryptor = Cipher(
+            algorithms.AES(key), modes.CBC(iv), default_backend()
+        ).encryptor()
+        return encryptor.update(data) + encryptor.finalize()
+
+    benchmark(encrypt)
+
+
+def test_cbc_reset_context(benchmark):
+    key = os.urandom(32)
+    iv = os.urandom(16)
+    data = b"\x00" * 64
+    encryptor = Cipher(
+        algorithms.AES(key), modes.CBC(iv), default_backend()
+    ).encryptor(reusable=True)
+    encryptor.finalize()
+
+    def encrypt():
+        encryptor.reset(iv)
+        return encryptor.update(data) + encryptor.finalize()
+
+    benchmark(encrypt)
+
+
+def test_ctr_update_loop(benchmark):
+    cipher = Cipher(
+        algorithms.AES(os.urandom(32)), modes.CTR(os.urandom(16)),
+        default_backend()
+    )
+    data = bytearray(16 * 1024 * 1024)
+
+    def encrypt():
+        encryptor = cipher.encryptor()
+        out = [
+            encryptor.update(bytes(data[i:i + 1024 * 1024]))
+            for i in range(0, len(data), 1024 * 1024)
+        ]
+        return b"".join(out) + encryptor.finalize()
+
+    benchmark(encrypt)
+
+
+def test_ctr_encrypt_buffer(benchmark):
+    cipher = Cipher(
+        algorithms.AES(os.urandom(32)), modes.CTR(os.urandom(16)),
+        default_backend()
+    )
+    data = bytearray(16 * 1024 * 1024)
+    benchmark(encrypt_buffer, cipher, data)
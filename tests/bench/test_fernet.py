@@ -0,0 +1,43 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from cryptography_patched.fernet import Fernet
+
+
+@pytest.mark.parametrize("size", [100, 1024, 64 * 1024])
+def test_fernet_encrypt(benchmark, size):
+    fernet = Fernet(Fernet.generate_key())
+    data = b"\x00" * size
+    benchmark(fernet.encrypt, data)
+
+
+@pytest.mark.parametrize("size", [100, 1024, 64 * 1024])
+def test_fernet_decrypt(benchmark, size):
+    fernet = Fernet(Fernet.generate_key())
+    token = fernet.encrypt(b"\x00" * size)
+    benchmark(fernet.decrypt, token)
+
+
+def test_fernet_decrypt_loop(benchmark):
+    fernet = Fernet(Fernet.generate_key())
+    tokens = [fernet.encrypt(b"\x00" * 100) for _ in range(1000)]
+    benchmark(lambda: [fernet.decrypt(token) for token in tokens])
+
+
+def test_fernet_decrypt_many(benchmark):
+    fernet = Fernet(Fernet.generate_key())
+    tokens = fernet.encrypt_many([b"\x00" * 100] * 1000)
+    benchmark(fernet.decrypt_many, tokens)
+
+
+def test_fernet_decrypt_many_threads(benchmark):
+    futures = pytest.importorskip("concurrent.futures")
+    fernet = Fernet(Fernet.generate_key())
+    tokens = fernet.encrypt_many([b"\x00" * 100] * 1000)
+    with futures.ThreadPoolExecutor(4) as executor:
+        benchmark(fernet.decrypt_many, tokens, executor=executor)
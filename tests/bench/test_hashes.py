@@ -0,0 +1,74 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import io
+
+import pytest
+
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives import hashes
+
+
+@pytest.mark.parametrize("size", [64, 4096])
+def test_hash_object(benchmark, size):
+    data = b"\x00" * size
+    backend = default_backend()
+
+    def digest():
+        h = hashes.Hash(hashes.SHA256(), backend)
+        h.update(data)
+        return h.finalize()
+
+    benchmark(digest)
+
+
+@pytest.mark.parametrize("size", [64, 4096])
+def test_digest(benchmark, size):
+    data = b"\x00" * size
+    benchmark(hashes.digest, hashes.SHA256(), data, default_backend())
+
+
+def test_digest_loop(benchmark):
+    buffers = [b"\x00" * 4096] * 1000
+    backend = default_backend()
+
+    def digest():
+        return [hashes.digest(hashes.SHA256(), data, backend)
+                for data in buffers]
+
+    benchmark(digest)
+
+
+def test_digest_many(benchmark):
+    buffers = [b"\x00" * 4096] * 1000
+    benchmark(
+        hashes.digest_many, hashes.SHA256(), buffers, default_backend()
+    )
+
+
+def test_file_read_loop(benchmark):
+    f = io.BytesIO(b"\x00" * 16 * 1024 * 1024)
+    backend = default_backend()
+
+    def digest():
+        f.seek(0)
+        h = hashes.Hash(hashes.SHA256(), backend)
+        for data in iter(lambda: f.read(256 * 1024), b""):
+            h.update(data)
+        return h.finalize()
+
+    benchmark(digest)
+
+
+def test_file_digest(benchmark):
+    f = io.BytesIO(b"\x00" * 16 * 1024 * 1024)
+    backend = default_backend()
+
+    def digest():
+        f.seek(0)
+        return hashes.file_digest(hashes.SHA256(), f, backend)
+
+    benchmark(digest)
@@ -0,0 +1,38 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives import hashes, hmac
+
+
+KEY = b"\x00" * 32
+DATA = b"\x00" * 256
+
+
+def test_hmac(benchmark):
+    def generate():
+        h = hmac.HMAC(KEY, hashes.SHA256(), default_backend())
+        h.update(DATA)
+        return h.finalize()
+
+    benchmark(generate)
+
+
+def test_hmac_key(benchmark):
+    key = hmac.HMACKey(KEY, hashes.SHA256(), default_backend())
+    benchmark(key.generate_tag, DATA)
+
+
+def test_hmac_key_cache(benchmark):
+    cache = hmac.HMACKeyCache(16)
+    algorithm = hashes.SHA256()
+
+    def generate():
+        return cache.get(
+            KEY, algorithm, default_backend()
+        ).generate_tag(DATA)
+
+    benchmark(generate)
@@ -0,0 +1,35 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives import hashes
+from cryptography_patched.hazmat.primitives.kdf.cache import VerificationCache
+from cryptography_patched.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+
+def _pbkdf2():
+    return PBKDF2HMAC(
+        hashes.SHA256(), 32, b"salt", 100000, default_backend()
+    )
+
+
+def test_pbkdf2_verify(benchmark):
+    key = _pbkdf2().derive(b"password")
+
+    def verify():
+        _pbkdf2().verify(b"password", key)
+
+    benchmark(verify)
+
+
+def test_pbkdf2_verify_cached(benchmark):
+    key = _pbkdf2().derive(b"password")
+    verifications = VerificationCache(100, 60, default_backend())
+
+    def verify():
+        verifications.verify(_pbkdf2(), b"password", key)
+
+    benchmark(verify)
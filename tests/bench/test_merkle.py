@@ -0,0 +1,44 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives import hashes
+from cryptography_patched.hazmat.primitives.merkle import MerkleTreeHash
+
+
+DATA = b"\x00" * (64 * 1024 * 1024)
+
+
+def test_hash(benchmark):
+    def digest():
+        h = hashes.Hash(hashes.SHA256(), default_backend())
+        h.update(DATA)
+        return h.finalize()
+
+    benchmark(digest)
+
+
+@pytest.mark.parametrize("workers", [None, 2, 4, 8])
+def test_merkle_tree_hash(benchmark, workers):
+    executor = None
+    if workers is not None:
+        futures = pytest.importorskip("concurrent.futures")
+        executor = futures.ThreadPoolExecutor(workers)
+
+    def digest():
+        h = MerkleTreeHash(
+            hashes.SHA256(), default_backend(), executor=executor
+        )
+        h.update(DATA)
+        return h.finalize().root
+
+    try:
+        benchmark(digest)
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,45 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives import serialization
+from cryptography_patched.hazmat.primitives.asymmetric import ec
+
+
+def _public_keys():
+    return [
+        ec.generate_private_key(
+            ec.SECP256R1(), default_backend()
+        ).public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        for _ in range(100)
+    ]
+
+
+def test_load_pem_public_key(benchmark):
+    keys = _public_keys()
+    backend = default_backend()
+
+    def load():
+        for data in keys:
+            serialization.load_pem_public_key(data, backend)
+
+    benchmark(load)
+
+
+def test_public_key_cache(benchmark):
+    keys = _public_keys()
+    backend = default_backend()
+    cache = serialization.PublicKeyCache(len(keys))
+
+    def load():
+        for data in keys:
+            cache.load_pem_public_key(data, backend)
+
+    benchmark(load)
+    assert cache.misses == len(keys)
@@ -0,0 +1,67 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+import pytest
+
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives import hashes, hmac
+from cryptography_patched.hazmat.primitives.ciphers import (
+    Cipher, algorithms, modes
+)
+
+
+# Each benchmark processes the same total amount of data split across the
+# threads, so the time per round drops as threads are added when OpenSSL
+# runs without holding the GIL.
+TOTAL_SIZE = 64 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+def _sha256(data):
+    h = hashes.Hash(hashes.SHA256(), default_backend())
+    h.update(data)
+    h.finalize()
+
+
+def _hmac_sha256(data):
+    h = hmac.HMAC(b"\x00" * 32, hashes.SHA256(), default_backend())
+    h.update(data)
+    h.finalize()
+
+
+def _aes_ctr(data):
+    encryptor = Cipher(
+        algorithms.AES(b"\x00" * 32), modes.CTR(b"\x00" * 16),
+        default_backend()
+    ).encryptor()
+    encryptor.update(data)
+    encryptor.finalize()
+
+
+def _run_threads(func, threads):
+    data = b"\x00" * CHUNK_SIZE
+    chunks = TOTAL_SIZE // CHUNK_SIZE // threads
+
+    def work():
+        for _ in range(chunks):
+            func(data)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+@pytest.mark.parametrize("threads", [1, 2, 4, 8])
+@pytest.mark.parametrize(
+    "func", [_sha256, _hmac_sha256, _aes_ctr],
+    ids=["sha256", "hmac-sha256", "aes-ctr"]
+)
+def test_threads(benchmark, func, threads):
+    benchmark(_run_threads, func, threads)
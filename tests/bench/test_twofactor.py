@@ -0,0 +1,15 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography_patched.hazmat.backends import default_backend
+from cryptography_patched.hazmat.primitives.hashes import SHA1
+from cryptography_patched.hazmat.primitives.twofactor.totp import TOTP
+
+
+def test_totp_verify_with_drift(benchmark):
+    totp = TOTP(b"12345678901234567890", 6, SHA1(), 30, default_backend())
+    token = totp.generate(1000000)
+    benchmark(totp.verify_with_drift, token, 1000000, 2)
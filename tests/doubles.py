@@ -5,6 +5,7 @@
 from __future__ import absolute_import, division, print_function
 
 from cryptography import utils
+from cryptography_patched.hazmat.backends.interfaces import HashBackend
 from cryptography_patched.hazmat.primitives import hashes, serialization
 from cryptography_patched.hazmat.primitives.asymmetric import padding
 from cryptography_patched.hazmat.primitives.ciphers import CipherAlgorithm
@@ -33,6 +34,23 @@ class DummyHashAlgorithm(object):
     digest_size = None
 
 
+@utils.register_interface(HashBackend)
+class DummyHashBackend(object):
+    """
+    Provides only the methods HashBackend requires, by delegating to another
+    backend.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def hash_supported(self, algorithm):
+        return self._backend.hash_supported(algorithm)
+
+    def create_hash_ctx(self, algorithm):
+        return self._backend.create_hash_ctx(algorithm)
+
+
 @utils.register_interface(serialization.KeySerializationEncryption)
 class DummyKeySerializationEncryption(object):
     pass
@@ -41,3 +59,31 @@ class DummyKeySerializationEncryption(object):
 @utils.register_interface(padding.AsymmetricPadding)
 class DummyAsymmetricPadding(object):
     name = "dummy-padding"
+
+
+class DummyExecutor(object):
+    """
+    Runs each job as soon as it is submitted, so anything waiting on the
+    returned future sees the result straight away.
+    """
+
+    def __init__(self):
+        self.submitted = 0
+        self.shut_down = False
+
+    def submit(self, func, *args):
+        from concurrent import futures
+
+        if self.shut_down:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+
+        self.submitted += 1
+        future = futures.Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        self.shut_down = True
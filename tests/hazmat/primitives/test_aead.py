@@ -6,13 +6,16 @@ from __future__ import absolute_import, division, print_function
 
 import binascii
 import os
+import threading
 
 import pytest
 
-from cryptography_patched.exceptions import InvalidTag, UnsupportedAlgorithm, _Reasons
+from cryptography_patched.exceptions import (
+    AlreadyFinalized, InvalidTag, UnsupportedAlgorithm, _Reasons
+)
 from cryptography_patched.hazmat.backends.interfaces import CipherBackend
 from cryptography_patched.hazmat.primitives.ciphers.aead import (
-    AESCCM, AESGCM, ChaCha20Poly1305
+    AESCCM, AESGCM, ChaCha20Poly1305, StreamingAEAD
 )
 
 from .utils import _load_all_params
@@ -182,6 +185,48 @@ class TestChaCha20Poly1305(object):
         computed_pt2 = chacha2.decrypt(bytearray(nonce), ct2, ad)
         assert computed_pt2 == pt
 
+    def test_encrypt_decrypt_many(self, backend):
+        key = ChaCha20Poly1305.generate_key()
+        chacha = ChaCha20Poly1305(key)
+        items = [
+            (os.urandom(12), b"data" * i, b"ad" * i) for i in range(5)
+        ]
+        items.append((bytearray(os.urandom(12)), b"", None))
+        cts = chacha.encrypt_many(items)
+        assert cts == [
+            chacha.encrypt(nonce, data, ad) for nonce, data, ad in items
+        ]
+        pts = chacha.decrypt_many([
+            (nonce, ct, ad) for (nonce, _, ad), ct in zip(items, cts)
+        ])
+        assert pts == [data for _, data, _ in items]
+
+    def test_many_empty(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key())
+        assert chacha.encrypt_many([]) == []
+        assert chacha.decrypt_many(iter([])) == []
+
+    def test_encrypt_many_validates_all_items(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key())
+        with pytest.raises(ValueError):
+            chacha.encrypt_many([(b"0" * 12, b"ok", None), (b"00", b"", None)])
+
+        with pytest.raises(TypeError):
+            chacha.encrypt_many([(b"0" * 12, object(), None)])
+
+        with pytest.raises(OverflowError):
+            chacha.encrypt_many([(b"0" * 12, FakeData(), None)])
+
+    def test_decrypt_many_invalid_tag(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key())
+        nonce = os.urandom(12)
+        ct = chacha.encrypt(nonce, b"data", None)
+        with pytest.raises(InvalidTag):
+            chacha.decrypt_many([(nonce, ct, None), (nonce, ct, b"wrong")])
+
+        with pytest.raises(InvalidTag):
+            chacha.decrypt_many([(nonce, b"0", None)])
+
 
 @pytest.mark.skipif(
     _aead_supported(AESCCM),
@@ -347,6 +392,38 @@ class TestAESCCM(object):
         computed_pt2 = aesccm2.decrypt(bytearray(nonce), ct2, ad)
         assert computed_pt2 == pt
 
+    def test_encrypt_decrypt_many(self, backend):
+        key = AESCCM.generate_key(128)
+        aesccm = AESCCM(key, tag_length=8)
+        # Mixed nonce lengths force the context to be rebuilt mid-batch.
+        items = [
+            (os.urandom(7 + i), b"data" * i, b"ad" * i) for i in range(7)
+        ]
+        items.append((os.urandom(13), b"", None))
+        cts = aesccm.encrypt_many(items)
+        assert cts == [
+            aesccm.encrypt(nonce, data, ad) for nonce, data, ad in items
+        ]
+        pts = aesccm.decrypt_many([
+            (nonce, ct, ad) for (nonce, _, ad), ct in zip(items, cts)
+        ])
+        assert pts == [data for _, data, _ in items]
+
+    def test_encrypt_many_nonce_too_long(self, backend):
+        aesccm = AESCCM(AESCCM.generate_key(128))
+        with pytest.raises(ValueError):
+            aesccm.encrypt_many([
+                (os.urandom(12), b"ok", None),
+                (os.urandom(13), b"encrypt me" * 6600, None),
+            ])
+
+    def test_decrypt_many_invalid_tag(self, backend):
+        aesccm = AESCCM(AESCCM.generate_key(128))
+        nonce = os.urandom(12)
+        ct = aesccm.encrypt(nonce, b"data", None)
+        with pytest.raises(InvalidTag):
+            aesccm.decrypt_many([(nonce, ct, None), (nonce, ct, b"wrong")])
+
 
 def _load_gcm_vectors():
     vectors = _load_all_params(
@@ -458,3 +535,283 @@ class TestAESGCM(object):
         assert ct2 == ct
         computed_pt2 = aesgcm2.decrypt(bytearray(nonce), ct2, ad)
         assert computed_pt2 == pt
+
+    def test_encrypt_decrypt_many(self, backend):
+        key = AESGCM.generate_key(256)
+        aesgcm = AESGCM(key)
+        items = [
+            (os.urandom(12), b"data" * i, b"ad" * i) for i in range(5)
+        ]
+        items.append((os.urandom(16), b"longer nonce", None))
+        items.append((os.urandom(12), b"", None))
+        cts = aesgcm.encrypt_many(items)
+        assert cts == [
+            aesgcm.encrypt(nonce, data, ad) for nonce, data, ad in items
+        ]
+        pts = aesgcm.decrypt_many([
+            (nonce, ct, ad) for (nonce, _, ad), ct in zip(items, cts)
+        ])
+        assert pts == [data for _, data, _ in items]
+
+    def test_encrypt_many_validates_all_items(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        with pytest.raises(ValueError):
+            aesgcm.encrypt_many([(b"0" * 12, b"ok", None), (b"", b"", None)])
+
+        with pytest.raises(TypeError):
+            aesgcm.decrypt_many([(b"0" * 12, b"0" * 16, object())])
+
+    def test_decrypt_many_invalid_tag(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        nonce = os.urandom(12)
+        ct = aesgcm.encrypt(nonce, b"data", None)
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt_many([(nonce, ct, None), (nonce, ct, b"wrong")])
+
+
+def _supported_aeads():
+    aeads = [AESGCM(AESGCM.generate_key(128))]
+    if _aead_supported(ChaCha20Poly1305):
+        aeads.append(ChaCha20Poly1305(ChaCha20Poly1305.generate_key()))
+    if _aead_supported(AESCCM):
+        aeads.append(AESCCM(AESCCM.generate_key(128)))
+    return aeads
+
+
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+@pytest.mark.parametrize(
+    "aead", _supported_aeads(), ids=lambda aead: type(aead).__name__
+)
+class TestAEADContextReuse(object):
+    def test_context_reused(self, aead, backend):
+        aead.encrypt(os.urandom(12), b"data", None)
+        ctx = aead._ctx_cache.get(12, 1)
+        aead.encrypt(os.urandom(12), b"more data", None)
+        assert aead._ctx_cache.get(12, 1) is ctx
+
+    def test_nonce_length_changes(self, aead, backend):
+        if isinstance(aead, ChaCha20Poly1305):
+            pytest.skip("ChaCha20Poly1305 only supports 12 byte nonces")
+
+        for nonce in [os.urandom(12), os.urandom(13), os.urandom(12)]:
+            ct = aead.encrypt(nonce, b"data", b"ad")
+            assert aead.decrypt(nonce, ct, b"ad") == b"data"
+
+    def test_recovers_after_invalid_tag(self, aead, backend):
+        nonce = os.urandom(12)
+        ct = aead.encrypt(nonce, b"data", None)
+        with pytest.raises(InvalidTag):
+            aead.decrypt(nonce, ct, b"wrong")
+
+        assert aead.decrypt(nonce, ct, None) == b"data"
+        assert aead.encrypt(nonce, b"data", None) == ct
+
+    def test_threads(self, aead, backend):
+        nonces = [os.urandom(12) for _ in range(50)]
+        expected = [aead.encrypt(nonce, b"data", None) for nonce in nonces]
+        errors = []
+
+        def worker():
+            try:
+                for nonce, ct in zip(nonces, expected):
+                    assert aead.encrypt(nonce, b"data", None) == ct
+                    assert aead.decrypt(nonce, ct, None) == b"data"
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+
+def _tag_length(aead):
+    return getattr(aead, "_tag_length", 16)
+
+
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+@pytest.mark.parametrize(
+    "aead", _supported_aeads(), ids=lambda aead: type(aead).__name__
+)
+class TestAEADInto(object):
+    def test_encrypt_into(self, aead, backend):
+        nonce = os.urandom(12)
+        ct = aead.encrypt(nonce, b"encrypt me", b"ad")
+        buf = bytearray(len(ct) + 4)
+        n = aead.encrypt_into(nonce, b"encrypt me", b"ad", buf)
+        assert n == len(ct)
+        assert bytes(buf[:n]) == ct
+        assert buf[n:] == b"\x00" * 4
+
+    def test_encrypt_into_memoryview_offset(self, aead, backend):
+        nonce = os.urandom(12)
+        ct = aead.encrypt(nonce, b"encrypt me", None)
+        buf = bytearray(len(ct) + 8)
+        n = aead.encrypt_into(nonce, b"encrypt me", None, memoryview(buf)[8:])
+        assert n == len(ct)
+        assert buf[:8] == b"\x00" * 8
+        assert bytes(buf[8:]) == ct
+
+    def test_decrypt_into(self, aead, backend):
+        nonce = os.urandom(12)
+        ct = aead.encrypt(nonce, b"decrypt me", b"ad")
+        buf = bytearray(len(ct))
+        n = aead.decrypt_into(nonce, ct, b"ad", buf)
+        assert n == len(b"decrypt me")
+        assert bytes(buf[:n]) == b"decrypt me"
+
+    def test_buffer_too_small(self, aead, backend):
+        nonce = os.urandom(12)
+        tag_length = _tag_length(aead)
+        with pytest.raises(ValueError):
+            aead.encrypt_into(
+                nonce, b"data", None, bytearray(3 + tag_length)
+            )
+
+        ct = aead.encrypt(nonce, b"data", None)
+        with pytest.raises(ValueError):
+            aead.decrypt_into(nonce, ct, None, bytearray(3))
+
+    def test_decrypt_into_data_too_short(self, aead, backend):
+        with pytest.raises(InvalidTag):
+            aead.decrypt_into(b"0" * 12, b"0", None, bytearray(16))
+
+    def test_decrypt_into_invalid_tag_clears_buffer(self, aead, backend):
+        nonce = os.urandom(12)
+        ct = aead.encrypt(nonce, b"secret data", None)
+        buf = bytearray(b"\xff" * len(ct))
+        with pytest.raises(InvalidTag):
+            aead.decrypt_into(nonce, ct, b"wrong", buf)
+
+        assert buf[:len(b"secret data")] == b"\x00" * len(b"secret data")
+
+
+def _stream_encrypt(stream, prefix, ad, chunks):
+    encryptor = stream.encryptor(prefix, ad)
+    ct = b"".join(encryptor.update(chunk) for chunk in chunks)
+    return ct + encryptor.finalize()
+
+
+def _stream_decrypt(stream, prefix, ad, chunks):
+    decryptor = stream.decryptor(prefix, ad)
+    pt = b"".join(decryptor.update(chunk) for chunk in chunks)
+    return pt + decryptor.finalize()
+
+
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+class TestStreamingAEAD(object):
+    @pytest.mark.parametrize(
+        "aead", [
+            aead for aead in _supported_aeads()
+            if not isinstance(aead, AESCCM)
+        ],
+        ids=lambda aead: type(aead).__name__
+    )
+    @pytest.mark.parametrize("length", [0, 1, 15, 16, 17, 64, 100])
+    def test_roundtrip(self, aead, length, backend):
+        stream = StreamingAEAD(aead, segment_size=16)
+        prefix = os.urandom(7)
+        pt = os.urandom(length)
+        chunks = [pt[i:i + 5] for i in range(0, len(pt), 5)]
+        ct = _stream_encrypt(stream, prefix, b"ad", chunks)
+        segments = max(1, -(-length // 16))
+        assert len(ct) == length + 16 * segments
+        assert _stream_encrypt(stream, prefix, b"ad", [pt]) == ct
+        assert _stream_decrypt(stream, prefix, b"ad", [ct]) == pt
+        ct_chunks = [ct[i:i + 7] for i in range(0, len(ct), 7)]
+        assert _stream_decrypt(stream, prefix, b"ad", ct_chunks) == pt
+
+    def test_segment_format(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        stream = StreamingAEAD(aesgcm, segment_size=4)
+        prefix = b"\x01" * 7
+        ct = _stream_encrypt(stream, prefix, None, [b"abcdefghij"])
+        assert ct == (
+            aesgcm.encrypt(prefix + b"\x00\x00\x00\x00\x00", b"abcd", None) +
+            aesgcm.encrypt(prefix + b"\x00\x00\x00\x01\x00", b"efgh", None) +
+            aesgcm.encrypt(prefix + b"\x00\x00\x00\x02\x01", b"ij", None)
+        )
+
+    def test_update_returns_segments_incrementally(self, backend):
+        stream = StreamingAEAD(AESGCM(AESGCM.generate_key(128)), 8)
+        prefix = os.urandom(7)
+        encryptor = stream.encryptor(prefix, None)
+        assert encryptor.update(b"a" * 8) == b""
+        assert len(encryptor.update(b"a")) == 8 + 16
+
+        ct = _stream_encrypt(stream, prefix, None, [b"a" * 17])
+        decryptor = stream.decryptor(prefix, None)
+        assert decryptor.update(ct[:24]) == b""
+        assert decryptor.update(ct[24:25]) == b"a" * 8
+        assert decryptor.update(ct[25:]) == b"a" * 8
+        assert decryptor.finalize() == b"a"
+
+    def test_truncation_detected(self, backend):
+        stream = StreamingAEAD(AESGCM(AESGCM.generate_key(128)), 8)
+        prefix = os.urandom(7)
+        ct = _stream_encrypt(stream, prefix, None, [b"a" * 20])
+        with pytest.raises(InvalidTag):
+            _stream_decrypt(stream, prefix, None, [ct[:48]])
+
+        with pytest.raises(InvalidTag):
+            _stream_decrypt(stream, prefix, None, [ct[:10]])
+
+    def test_reordering_detected(self, backend):
+        stream = StreamingAEAD(AESGCM(AESGCM.generate_key(128)), 8)
+        prefix = os.urandom(7)
+        ct = _stream_encrypt(stream, prefix, None, [b"a" * 8 + b"b" * 8])
+        with pytest.raises(InvalidTag):
+            _stream_decrypt(stream, prefix, None, [ct[24:48] + ct[:24]])
+
+    def test_wrong_associated_data_or_prefix(self, backend):
+        stream = StreamingAEAD(AESGCM(AESGCM.generate_key(128)), 8)
+        prefix = os.urandom(7)
+        ct = _stream_encrypt(stream, prefix, b"ad", [b"data"])
+        with pytest.raises(InvalidTag):
+            _stream_decrypt(stream, prefix, b"other", [ct])
+
+        with pytest.raises(InvalidTag):
+            _stream_decrypt(stream, os.urandom(7), b"ad", [ct])
+
+    def test_already_finalized(self, backend):
+        stream = StreamingAEAD(AESGCM(AESGCM.generate_key(128)))
+        prefix = os.urandom(7)
+        encryptor = stream.encryptor(prefix, None)
+        ct = encryptor.finalize()
+        with pytest.raises(AlreadyFinalized):
+            encryptor.update(b"")
+        with pytest.raises(AlreadyFinalized):
+            encryptor.finalize()
+
+        decryptor = stream.decryptor(prefix, None)
+        assert decryptor.update(ct) == b""
+        assert decryptor.finalize() == b""
+        with pytest.raises(AlreadyFinalized):
+            decryptor.update(b"")
+        with pytest.raises(AlreadyFinalized):
+            decryptor.finalize()
+
+    def test_invalid_params(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        with pytest.raises(TypeError):
+            StreamingAEAD(object())
+
+        with pytest.raises(TypeError):
+            StreamingAEAD(aesgcm, segment_size="16")
+
+        with pytest.raises(ValueError):
+            StreamingAEAD(aesgcm, segment_size=0)
+
+        stream = StreamingAEAD(aesgcm)
+        assert stream.segment_size == 64 * 1024
+        with pytest.raises(ValueError):
+            stream.encryptor(b"0" * 12, None)
+
+        with pytest.raises(TypeError):
+            stream.decryptor(b"0" * 7, object())
+
+        with pytest.raises(TypeError):
+            stream.encryptor(b"0" * 7, None).update(object())
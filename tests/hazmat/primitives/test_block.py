@@ -5,6 +5,8 @@
 from __future__ import absolute_import, division, print_function
 
 import binascii
+import mmap
+import os
 
 import pytest
 
@@ -13,7 +15,7 @@ from cryptography_patched.exceptions import (
 )
 from cryptography_patched.hazmat.backends.interfaces import CipherBackend
 from cryptography_patched.hazmat.primitives.ciphers import (
-    Cipher, algorithms, base, modes
+    Cipher, algorithms, base, decrypt_buffer, encrypt_buffer, modes
 )
 
 from .utils import (
@@ -130,6 +132,212 @@ class TestCipherContext(object):
         with pytest.raises(ValueError):
             decryptor.finalize()
 
+    @pytest.mark.parametrize(
+        ("mode_factory", "iv_length"),
+        [
+            (modes.CBC, 16),
+            (modes.CTR, 16),
+            (modes.OFB, 16),
+            (modes.CFB, 16),
+            (modes.CFB8, 16),
+        ]
+    )
+    def test_reset(self, backend, mode_factory, iv_length):
+        key = b"\x01" * 16
+        ivs = [b"\x00" * iv_length, b"\x02" * iv_length, b"\x03" * iv_length]
+        mode = mode_factory(ivs[0])
+        if not backend.cipher_supported(algorithms.AES(key), mode):
+            pytest.skip("Does not support AES {}".format(mode.name))
+
+        data = b"a" * 48
+        expected = []
+        for iv in ivs:
+            encryptor = Cipher(
+                algorithms.AES(key), mode_factory(iv), backend
+            ).encryptor()
+            expected.append(encryptor.update(data) + encryptor.finalize())
+
+        cipher = Cipher(algorithms.AES(key), mode, backend)
+        encryptor = cipher.encryptor(reusable=True)
+        decryptor = cipher.decryptor(reusable=True)
+        results = []
+        for i, iv in enumerate(ivs):
+            if i:
+                encryptor.reset(iv)
+                decryptor.reset(iv)
+            ct = encryptor.update(data) + encryptor.finalize()
+            assert decryptor.update(ct) + decryptor.finalize() == data
+            results.append(ct)
+
+        assert results == expected
+
+    def test_reset_before_finalize(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CBC(b"\x00" * 16), backend
+        )
+        encryptor = cipher.encryptor(reusable=True)
+        encryptor.update(b"a" * 24)
+        encryptor.reset(b"\x00" * 16)
+        ct = encryptor.update(b"b" * 16) + encryptor.finalize()
+        other = cipher.encryptor()
+        assert ct == other.update(b"b" * 16) + other.finalize()
+
+    def test_reset_invalid_iv(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CBC(b"\x00" * 16), backend
+        )
+        encryptor = cipher.encryptor(reusable=True)
+        encryptor.finalize()
+        with pytest.raises(ValueError):
+            encryptor.reset(b"\x00" * 8)
+        with pytest.raises(TypeError):
+            encryptor.reset(u"\x00" * 16)
+        with pytest.raises(AlreadyFinalized):
+            encryptor.update(b"a" * 16)
+
+    def test_reset_not_reusable(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CBC(b"\x00" * 16), backend
+        )
+        encryptor = cipher.encryptor()
+        with pytest.raises(TypeError):
+            encryptor.reset(b"\x00" * 16)
+        encryptor.finalize()
+        with pytest.raises(TypeError):
+            encryptor.reset(b"\x00" * 16)
+
+    @pytest.mark.parametrize(
+        "mode", [modes.ECB(), modes.GCM(b"\x00" * 12)]
+    )
+    def test_reusable_unsupported_mode(self, backend, mode):
+        cipher = Cipher(algorithms.AES(b"\x00" * 16), mode, backend)
+        with pytest.raises(ValueError):
+            cipher.encryptor(reusable=True)
+        with pytest.raises(ValueError):
+            cipher.decryptor(reusable=True)
+
+
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+class TestProcessBuffer(object):
+    @pytest.mark.parametrize(
+        "mode", [modes.CBC(b"\x01" * 16), modes.CTR(b"\x01" * 16)]
+    )
+    @pytest.mark.parametrize("size", [0, 16, 48, 160])
+    @pytest.mark.parametrize("window_size", [16, 32, 1024])
+    def test_roundtrip(self, backend, mode, size, window_size):
+        cipher = Cipher(algorithms.AES(b"\x00" * 16), mode, backend)
+        data = os.urandom(size)
+        encryptor = cipher.encryptor()
+        expected = encryptor.update(data) + encryptor.finalize()
+
+        dst = bytearray(size)
+        assert encrypt_buffer(
+            cipher, data, dst, window_size=window_size
+        ) == size
+        assert dst == expected
+
+        buf = bytearray(data)
+        assert encrypt_buffer(cipher, buf, window_size=window_size) == size
+        assert buf == expected
+        assert decrypt_buffer(cipher, buf, window_size=window_size) == size
+        assert buf == data
+
+    def test_unaligned_ctr(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x01" * 16), backend
+        )
+        data = os.urandom(100)
+        encryptor = cipher.encryptor()
+        buf = bytearray(data)
+        assert encrypt_buffer(cipher, buf, window_size=32) == 100
+        assert buf == encryptor.update(data) + encryptor.finalize()
+
+    def test_unaligned_cbc(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CBC(b"\x01" * 16), backend
+        )
+        with pytest.raises(ValueError):
+            encrypt_buffer(cipher, bytearray(20), window_size=16)
+
+    def test_mmap(self, backend, tmpdir):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x01" * 16), backend
+        )
+        data = os.urandom(4096)
+        path = str(tmpdir.join("data"))
+        with open(path, "wb") as f:
+            f.write(data)
+
+        with open(path, "r+b") as f:
+            m = mmap.mmap(f.fileno(), 0)
+            try:
+                encrypt_buffer(cipher, m, window_size=1024)
+                m.flush()
+            finally:
+                m.close()
+
+        with open(path, "rb") as f:
+            ct = f.read()
+
+        encryptor = cipher.encryptor()
+        assert ct == encryptor.update(data) + encryptor.finalize()
+
+    def test_xts_iv_for_window(self, backend):
+        key = b"\x00" * 16 + b"\x01" * 16
+        tweaks = [os.urandom(16) for _ in range(4)]
+        cipher = Cipher(algorithms.AES(key), modes.XTS(tweaks[0]), backend)
+        if not backend.cipher_supported(cipher.algorithm, cipher.mode):
+            pytest.skip("Does not support AES XTS")
+
+        data = os.urandom(512 * 4)
+        expected = b""
+        for i, tweak in enumerate(tweaks):
+            encryptor = Cipher(
+                algorithms.AES(key), modes.XTS(tweak), backend
+            ).encryptor()
+            expected += encryptor.update(data[i * 512:(i + 1) * 512])
+            expected += encryptor.finalize()
+
+        buf = bytearray(data)
+        encrypt_buffer(
+            cipher, buf, window_size=512, iv_for_window=tweaks.__getitem__
+        )
+        assert buf == expected
+        decrypt_buffer(
+            cipher, buf, window_size=512, iv_for_window=tweaks.__getitem__
+        )
+        assert buf == data
+
+    def test_xts_requires_iv_for_window(self, backend):
+        key = b"\x00" * 16 + b"\x01" * 16
+        cipher = Cipher(algorithms.AES(key), modes.XTS(b"\x00" * 16), backend)
+        with pytest.raises(ValueError):
+            encrypt_buffer(cipher, bytearray(1024), window_size=512)
+
+    def test_authenticated_mode(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.GCM(b"\x00" * 12), backend
+        )
+        with pytest.raises(TypeError):
+            encrypt_buffer(cipher, bytearray(16))
+
+    @pytest.mark.parametrize("window_size", [0, 15, 1.5])
+    def test_invalid_window_size(self, backend, window_size):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x00" * 16), backend
+        )
+        with pytest.raises(ValueError):
+            encrypt_buffer(cipher, bytearray(16), window_size=window_size)
+
+    def test_invalid_dst(self, backend):
+        cipher = Cipher(
+            algorithms.AES(b"\x00" * 16), modes.CTR(b"\x00" * 16), backend
+        )
+        with pytest.raises(TypeError):
+            encrypt_buffer(cipher, b"\x00" * 16)
+        with pytest.raises(ValueError):
+            encrypt_buffer(cipher, b"\x00" * 16, bytearray(15))
+
 
 @pytest.mark.supported(
     only_if=lambda backend: backend.cipher_supported(
@@ -10,14 +10,17 @@ import os
 
 import pytest
 
+from cryptography_patched.exceptions import _Reasons
 from cryptography_patched.hazmat.backends.interfaces import (
     DERSerializationBackend, DHBackend, PEMSerializationBackend)
 from cryptography_patched.hazmat.primitives import serialization
 from cryptography_patched.hazmat.primitives.asymmetric import dh
 from cryptography_patched.utils import int_from_bytes
 
-from ...doubles import DummyKeySerializationEncryption
-from ...utils import load_nist_vectors, load_vectors_from_file
+from ...doubles import DummyExecutor, DummyKeySerializationEncryption
+from ...utils import (
+    load_nist_vectors, load_vectors_from_file, raises_unsupported_algorithm
+)
 
 
 def _skip_dhx_unsupported(backend, is_dhx):
@@ -156,6 +159,28 @@ class TestDH(object):
         with pytest.raises(ValueError):
             dh.generate_parameters(7, 512, backend)
 
+    def test_parameters_pool(self, backend):
+        pytest.importorskip("concurrent.futures")
+        pool = dh.DHParametersPool(
+            2, 512, backend, size=2, low_water=0, executor=DummyExecutor()
+        )
+        assert (pool.generator, pool.key_size, pool.depth) == (2, 512, 2)
+        parameters = pool.generate_parameters()
+        assert isinstance(parameters, dh.DHParameters)
+        numbers = parameters.parameter_numbers()
+        assert (numbers.g, numbers.p.bit_length()) == (2, 512)
+        assert pool.depth == 1
+
+    def test_parameters_pool_invalid_arguments(self, backend):
+        with pytest.raises(ValueError):
+            dh.DHParametersPool(7, 512, backend)
+        with pytest.raises(ValueError):
+            dh.DHParametersPool(2, 511, backend)
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            dh.DHParametersPool(2, 512, object())
+
     def test_dh_parameters_supported(self, backend):
         valid_p = int(
             b"907c7211ae61aaaba1825ff53b6cb71ac6df9f1a424c033f4a0a41ac42fad3a9"
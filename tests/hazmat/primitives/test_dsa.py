@@ -9,7 +9,9 @@ import os
 
 import pytest
 
-from cryptography_patched.exceptions import AlreadyFinalized, InvalidSignature
+from cryptography_patched.exceptions import (
+    AlreadyFinalized, InvalidSignature, _Reasons
+)
 from cryptography_patched.hazmat.backends.interfaces import (
     DSABackend, PEMSerializationBackend
 )
@@ -23,10 +25,12 @@ from cryptography_patched.utils import CryptographyDeprecationWarning
 from .fixtures_dsa import (
     DSA_KEY_1024, DSA_KEY_2048, DSA_KEY_3072
 )
-from ...doubles import DummyHashAlgorithm, DummyKeySerializationEncryption
+from ...doubles import (
+    DummyExecutor, DummyHashAlgorithm, DummyKeySerializationEncryption
+)
 from ...utils import (
     load_fips_dsa_key_pair_vectors, load_fips_dsa_sig_vectors,
-    load_vectors_from_file,
+    load_vectors_from_file, raises_unsupported_algorithm
 )
 
 
@@ -56,6 +60,28 @@ class TestDSA(object):
         with pytest.raises(ValueError):
             dsa.generate_parameters(1, backend)
 
+    def test_parameters_pool(self, backend):
+        pytest.importorskip("concurrent.futures")
+        pool = dsa.DSAParametersPool(
+            1024, backend, size=2, low_water=0, executor=DummyExecutor()
+        )
+        assert (pool.key_size, pool.depth) == (1024, 2)
+        parameters = pool.generate_parameters()
+        assert isinstance(parameters, dsa.DSAParameters)
+        assert parameters.parameter_numbers().p.bit_length() == 1024
+        assert isinstance(
+            parameters.generate_private_key(), dsa.DSAPrivateKey
+        )
+        assert pool.depth == 1
+
+    def test_parameters_pool_invalid_arguments(self, backend):
+        with pytest.raises(ValueError):
+            dsa.DSAParametersPool(1000, backend)
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            dsa.DSAParametersPool(1024, object())
+
     @pytest.mark.parametrize(
         "vector",
         load_vectors_from_file(
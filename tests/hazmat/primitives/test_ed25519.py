@@ -98,6 +98,42 @@ class TestEd25519Signing(object):
         with pytest.raises(InvalidSignature):
             key.public_key().verify(b"0" * 64, b"test data")
 
+    def test_sign_many(self, backend):
+        key = Ed25519PrivateKey.generate()
+        messages = [b"", b"test data", bytearray(b"more data"), b"\x00" * 1000]
+        signatures = key.sign_many(messages)
+        assert signatures == [key.sign(bytes(m)) for m in messages]
+        assert all(len(s) == 64 for s in signatures)
+        assert key.sign_many([]) == []
+        assert key.sign_many(iter([b"abc"])) == [key.sign(b"abc")]
+
+        with pytest.raises(TypeError):
+            key.sign_many([b"abc", u"abc"])
+
+    def test_verify_many(self, backend):
+        key = Ed25519PrivateKey.generate()
+        public_key = key.public_key()
+        signature = key.sign(b"test data")
+        assert public_key.verify_many([
+            (signature, b"test data"),
+            (signature, b"wrong data"),
+            (b"0" * 64, b"test data"),
+            (signature[:-1], b"test data"),
+            (key.sign(b""), memoryview(b"")),
+        ]) == [True, False, False, False, True]
+        assert public_key.verify_many([]) == []
+        # The failures must not leave anything on the error queue.
+        public_key.verify(signature, b"test data")
+
+        with pytest.raises(TypeError):
+            public_key.verify_many([(bytearray(signature), b"test data")])
+        with pytest.raises(TypeError):
+            public_key.verify_many([(signature, u"test data")])
+
+    def test_many_not_required_by_interfaces(self):
+        assert "sign_many" not in Ed25519PrivateKey.__abstractmethods__
+        assert "verify_many" not in Ed25519PublicKey.__abstractmethods__
+
     def test_generate(self, backend):
         key = Ed25519PrivateKey.generate()
         assert key
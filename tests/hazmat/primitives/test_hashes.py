@@ -5,6 +5,8 @@
 from __future__ import absolute_import, division, print_function
 
 import binascii
+import io
+import os
 
 import pytest
 
@@ -13,7 +15,7 @@ from cryptography_patched.hazmat.backends.interfaces import HashBackend
 from cryptography_patched.hazmat.primitives import hashes
 
 from .utils import generate_base_hash_test
-from ...doubles import DummyHashAlgorithm
+from ...doubles import DummyHashAlgorithm, DummyHashBackend
 from ...utils import raises_unsupported_algorithm
 
 
@@ -46,6 +48,256 @@ class TestHashContext(object):
             hashes.Hash(DummyHashAlgorithm(), backend)
 
 
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestUpdateFromFile(object):
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1024 * 1024])
+    def test_update_from_file(self, backend, chunk_size):
+        data = os.urandom(10000)
+        h = hashes.Hash(hashes.SHA256(), backend)
+        h.update(b"prefix")
+        h.update_from_file(io.BytesIO(data), chunk_size)
+        assert h.finalize() == hashes.digest(
+            hashes.SHA256(), b"prefix" + data, backend
+        )
+
+    def test_update_from_file_on_disk(self, backend, tmpdir):
+        data = os.urandom(1000000)
+        path = tmpdir.join("data")
+        path.write_binary(data)
+        with open(str(path), "rb") as f:
+            assert hashes.file_digest(
+                hashes.SHA256(), f, backend
+            ) == hashes.digest(hashes.SHA256(), data, backend)
+
+    def test_update_from_file_without_readinto(self, backend):
+        class Reader(object):
+            def __init__(self, data):
+                self._f = io.BytesIO(data)
+
+            def read(self, size):
+                return self._f.read(size)
+
+        data = os.urandom(1000)
+        assert hashes.file_digest(
+            hashes.SHA256(), Reader(data), backend, chunk_size=64
+        ) == hashes.digest(hashes.SHA256(), data, backend)
+
+    def test_update_from_file_non_blocking(self, backend):
+        class NonBlockingReader(object):
+            def read(self, size):
+                return None
+
+        class NonBlockingRawReader(NonBlockingReader):
+            def readinto(self, buf):
+                return None
+
+        h = hashes.Hash(hashes.SHA256(), backend)
+        with pytest.raises(ValueError):
+            h.update_from_file(NonBlockingReader())
+        with pytest.raises(ValueError):
+            h.update_from_file(NonBlockingRawReader())
+
+    def test_update_from_file_empty(self, backend):
+        assert hashes.file_digest(
+            hashes.SHA256(), io.BytesIO(), backend
+        ) == hashes.digest(hashes.SHA256(), b"", backend)
+
+    def test_update_from_file_reject_text(self, backend):
+        h = hashes.Hash(hashes.SHA256(), backend)
+        with pytest.raises(TypeError):
+            h.update_from_file(io.StringIO(u"abc"))
+
+    @pytest.mark.parametrize("chunk_size", [0, -1, 1.5])
+    def test_update_from_file_invalid_chunk_size(self, backend, chunk_size):
+        h = hashes.Hash(hashes.SHA256(), backend)
+        with pytest.raises(ValueError):
+            h.update_from_file(io.BytesIO(b"abc"), chunk_size)
+
+    def test_update_from_file_after_finalize(self, backend):
+        h = hashes.Hash(hashes.SHA256(), backend)
+        h.finalize()
+        with pytest.raises(AlreadyFinalized):
+            h.update_from_file(io.BytesIO(b"abc"))
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestResumableHash(object):
+    @pytest.mark.parametrize(
+        "algorithm",
+        [
+            hashes.MD5(), hashes.SHA1(), hashes.SHA224(), hashes.SHA256(),
+            hashes.SHA384(), hashes.SHA512()
+        ]
+    )
+    @pytest.mark.parametrize("size", [0, 1, 63, 64, 65, 127, 128, 1000])
+    def test_export_import(self, backend, algorithm, size):
+        data = os.urandom(size)
+        h = hashes.ResumableHash(algorithm, backend)
+        h.update(data)
+        state = h.export_state()
+        resumed = hashes.ResumableHash(algorithm, backend, state)
+        assert resumed.export_state() == state
+        resumed.update(b"more data")
+        assert resumed.finalize() == hashes.digest(
+            algorithm, data + b"more data", backend
+        )
+
+    def test_copy(self, backend):
+        h = hashes.ResumableHash(hashes.SHA256(), backend)
+        h.update(b"abc")
+        copy = h.copy()
+        assert isinstance(copy, hashes.ResumableHash)
+        h.update(b"def")
+        assert copy.export_state() != h.export_state()
+        assert copy.finalize() == hashes.digest(
+            hashes.SHA256(), b"abc", backend
+        )
+
+    def test_state_is_algorithm_specific(self, backend):
+        h = hashes.ResumableHash(hashes.SHA256(), backend)
+        h.update(b"abc")
+        with pytest.raises(ValueError):
+            hashes.ResumableHash(hashes.SHA224(), backend, h.export_state())
+
+    def test_invalid_state(self, backend):
+        h = hashes.ResumableHash(hashes.SHA256(), backend)
+        h.update(b"abc")
+        state = h.export_state()
+        for invalid in [
+            b"", state[:-1], state + b"d", b"\x02" + state[1:],
+            state[:-4] + b"\xff" * 4 + state[-3:],
+        ]:
+            with pytest.raises(ValueError):
+                hashes.ResumableHash(hashes.SHA256(), backend, invalid)
+
+        with pytest.raises(TypeError):
+            hashes.ResumableHash(hashes.SHA256(), backend, bytearray(state))
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.ResumableHash(hashes.BLAKE2b(64), backend)
+
+    def test_low_level_hashes_unavailable(self, backend, monkeypatch):
+        # Builds without deprecated APIs don't have the low level functions.
+        lib = getattr(backend, "_lib", None)
+        if getattr(lib, "Cryptography_HAS_SHA_CTX", None) is None:
+            pytest.skip("Requires the OpenSSL backend")
+        monkeypatch.setattr(lib, "Cryptography_HAS_SHA_CTX", 0)
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.ResumableHash(hashes.SHA256(), backend)
+
+    def test_raises_after_finalize(self, backend):
+        h = hashes.ResumableHash(hashes.SHA256(), backend)
+        h.finalize()
+        with pytest.raises(AlreadyFinalized):
+            h.export_state()
+        with pytest.raises(AlreadyFinalized):
+            h.copy()
+
+    def test_invalid_backend(self):
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            hashes.ResumableHash(hashes.SHA256(), object())
+
+    def test_backend_without_resumable_hashes(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.ResumableHash(hashes.SHA256(), DummyHashBackend(backend))
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestDigest(object):
+    def test_digest(self, backend):
+        h = hashes.Hash(hashes.SHA256(), backend=backend)
+        h.update(b"abc")
+        assert hashes.digest(hashes.SHA256(), b"abc", backend) == h.finalize()
+
+    def test_digest_bytes_like(self, backend):
+        assert hashes.digest(
+            hashes.SHA256(), bytearray(b"abc"), backend
+        ) == hashes.digest(hashes.SHA256(), b"abc", backend)
+
+    def test_digest_reject_unicode(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest(hashes.SHA256(), u"\u00FC", backend)
+
+    def test_digest_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest(hashes.SHA256, b"abc", backend)
+
+    def test_digest_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest(DummyHashAlgorithm(), b"abc", backend)
+
+    def test_digest_invalid_backend(self):
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            hashes.digest(hashes.SHA256(), b"abc", object())
+
+    def test_digest_backend_without_fast_path(self, backend):
+        assert hashes.digest(
+            hashes.SHA256(), b"abc", DummyHashBackend(backend)
+        ) == hashes.digest(hashes.SHA256(), b"abc", backend)
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestDigestMany(object):
+    @pytest.mark.parametrize(
+        "algorithm",
+        [hashes.SHA256(), hashes.SHA512(), hashes.BLAKE2b(64)]
+    )
+    def test_digest_many(self, backend, algorithm):
+        if not backend.hash_supported(algorithm):
+            pytest.skip("Does not support {}".format(algorithm.name))
+        buffers = [b"", b"abc", bytearray(b"\x00" * 4096), memoryview(b"xyz")]
+        assert hashes.digest_many(algorithm, buffers, backend) == [
+            hashes.digest(algorithm, data, backend) for data in buffers
+        ]
+
+    def test_digest_many_iterable(self, backend):
+        assert hashes.digest_many(
+            hashes.SHA256(), (b"x" * i for i in range(3)), backend
+        ) == [hashes.digest(hashes.SHA256(), b"x" * i, backend)
+              for i in range(3)]
+
+    def test_digest_many_empty(self, backend):
+        assert hashes.digest_many(hashes.SHA256(), [], backend) == []
+
+    def test_digest_many_xof(self, backend):
+        if not backend.hash_supported(hashes.SHAKE128(16)):
+            pytest.skip("Does not support SHAKE128")
+        buffers = [b"abc", b"def"]
+        assert hashes.digest_many(hashes.SHAKE128(16), buffers, backend) == [
+            hashes.digest(hashes.SHAKE128(16), data, backend)
+            for data in buffers
+        ]
+
+    def test_digest_many_reject_unicode(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest_many(hashes.SHA256(), [b"abc", u"\u00FC"], backend)
+
+    def test_digest_many_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest_many(hashes.SHA256, [b"abc"], backend)
+
+    def test_digest_many_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest_many(DummyHashAlgorithm(), [b"abc"], backend)
+
+    def test_digest_many_invalid_backend(self):
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            hashes.digest_many(hashes.SHA256(), [b"abc"], object())
+
+    def test_digest_many_backend_without_fast_path(self, backend):
+        buffers = [b"", b"abc", bytearray(b"def")]
+        assert hashes.digest_many(
+            hashes.SHA256(), buffers, DummyHashBackend(backend)
+        ) == hashes.digest_many(hashes.SHA256(), buffers, backend)
+
+
 @pytest.mark.supported(
     only_if=lambda backend: backend.hash_supported(hashes.SHA1()),
     skip_message="Does not support SHA1",
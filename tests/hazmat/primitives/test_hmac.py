@@ -95,3 +95,79 @@ def test_invalid_backend():
 
     with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
         hmac.HMAC(b"key", hashes.SHA1(), pretend_backend)
+
+
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestHMACKey(object):
+    def test_generate_tag(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        h = hmac.HMAC(b"key", hashes.SHA256(), backend)
+        h.update(b"message")
+        expected = h.finalize()
+        assert key.generate_tag(b"message") == expected
+        assert key.generate_tag(b"message") == expected
+        assert key.generate_tag(b"other") != expected
+        assert isinstance(key.algorithm, hashes.SHA256)
+
+    def test_hmac(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        h = key.hmac()
+        h.update(b"mess")
+        h.update(b"age")
+        assert h.finalize() == key.generate_tag(b"message")
+
+    def test_verify_tag(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        tag = key.generate_tag(b"message")
+        key.verify_tag(b"message", tag)
+        with pytest.raises(InvalidSignature):
+            key.verify_tag(b"other", tag)
+        with pytest.raises(TypeError):
+            key.verify_tag(b"message", u"tag")
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            hmac.HMACKey(b"key", hashes.SHA256, backend)
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hmac.HMACKey(b"key", DummyHashAlgorithm(), backend)
+
+
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestHMACKeyCache(object):
+    def test_get(self, backend):
+        cache = hmac.HMACKeyCache(2)
+        key = cache.get(b"key", hashes.SHA256(), backend)
+        assert cache.get(b"key", hashes.SHA256(), backend) is key
+        assert cache.get(bytearray(b"key"), hashes.SHA256(), backend) is key
+        assert cache.get(b"key", hashes.SHA1(), backend) is not key
+        assert cache.get(b"key2", hashes.SHA256(), backend) is not key
+        assert key.generate_tag(b"message") == hmac.HMACKey(
+            b"key", hashes.SHA256(), backend
+        ).generate_tag(b"message")
+
+    def test_evicts_least_recently_used(self, backend):
+        cache = hmac.HMACKeyCache(2)
+        key1 = cache.get(b"key1", hashes.SHA256(), backend)
+        key2 = cache.get(b"key2", hashes.SHA256(), backend)
+        assert cache.get(b"key1", hashes.SHA256(), backend) is key1
+        cache.get(b"key3", hashes.SHA256(), backend)
+        assert cache.get(b"key1", hashes.SHA256(), backend) is key1
+        assert cache.get(b"key2", hashes.SHA256(), backend) is not key2
+
+    def test_clear(self, backend):
+        cache = hmac.HMACKeyCache(2)
+        key = cache.get(b"key", hashes.SHA256(), backend)
+        cache.clear()
+        assert cache.get(b"key", hashes.SHA256(), backend) is not key
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            hmac.HMACKeyCache(1.5)
+        with pytest.raises(ValueError):
+            hmac.HMACKeyCache(0)
+
+        cache = hmac.HMACKeyCache(2)
+        with pytest.raises(TypeError):
+            cache.get(u"key", hashes.SHA256(), backend)
+        with pytest.raises(TypeError):
+            cache.get(b"key", hashes.SHA256, backend)
@@ -0,0 +1,142 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+import six
+
+from cryptography_patched.exceptions import AlreadyFinalized, InvalidKey
+from cryptography_patched.hazmat.backends.interfaces import (
+    HMACBackend, PBKDF2HMACBackend, ScryptBackend
+)
+from cryptography_patched.hazmat.primitives import hashes
+from cryptography_patched.hazmat.primitives.kdf import cache
+from cryptography_patched.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography_patched.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography_patched.hazmat.primitives.kdf.scrypt import Scrypt
+
+
+def _pbkdf2(backend, salt=b"salt", iterations=1000):
+    return PBKDF2HMAC(hashes.SHA256(), 32, salt, iterations, backend)
+
+
+def _used_pbkdf2(backend, **kwargs):
+    # A KDF that raises AlreadyFinalized if it is used, to show a
+    # verification was answered from the cache.
+    kdf = _pbkdf2(backend, **kwargs)
+    kdf.derive(b"")
+    return kdf
+
+
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+@pytest.mark.requires_backend_interface(interface=PBKDF2HMACBackend)
+class TestVerificationCache(object):
+    def test_verify(self, backend):
+        key = _pbkdf2(backend).derive(b"password")
+        verifications = cache.VerificationCache(10, 60, backend)
+
+        verifications.verify(_pbkdf2(backend), b"password", key)
+        assert len(verifications) == 1
+        verifications.verify(_used_pbkdf2(backend), b"password", key)
+        verifications.verify(
+            _used_pbkdf2(backend), bytearray(b"password"), key
+        )
+
+    def test_failures_not_cached(self, backend):
+        key = _pbkdf2(backend).derive(b"password")
+        verifications = cache.VerificationCache(10, 60, backend)
+
+        with pytest.raises(InvalidKey):
+            verifications.verify(_pbkdf2(backend), b"wrong", key)
+        assert len(verifications) == 0
+        with pytest.raises(InvalidKey):
+            verifications.verify(_pbkdf2(backend), b"wrong", key)
+
+    def test_keyed_on_all_inputs(self, backend):
+        key = _pbkdf2(backend).derive(b"password")
+        verifications = cache.VerificationCache(10, 60, backend)
+        verifications.verify(_pbkdf2(backend), b"password", key)
+
+        with pytest.raises(AlreadyFinalized):
+            verifications.verify(_used_pbkdf2(backend), b"passwore", key)
+        with pytest.raises(AlreadyFinalized):
+            verifications.verify(
+                _used_pbkdf2(backend, salt=b"salu"), b"password", key
+            )
+        with pytest.raises(AlreadyFinalized):
+            verifications.verify(
+                _used_pbkdf2(backend, iterations=1001), b"password", key
+            )
+        with pytest.raises(AlreadyFinalized):
+            verifications.verify(
+                _used_pbkdf2(backend), b"password", key[:-1] + b"\x00"
+            )
+
+    def test_ttl(self, backend, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache, "_clock", lambda: now[0])
+        key = _pbkdf2(backend).derive(b"password")
+        verifications = cache.VerificationCache(10, 60, backend)
+        verifications.verify(_pbkdf2(backend), b"password", key)
+
+        now[0] += 59
+        verifications.verify(_used_pbkdf2(backend), b"password", key)
+        now[0] += 1
+        with pytest.raises(AlreadyFinalized):
+            verifications.verify(_used_pbkdf2(backend), b"password", key)
+        verifications.verify(_pbkdf2(backend), b"password", key)
+        verifications.verify(_used_pbkdf2(backend), b"password", key)
+
+    def test_max_size(self, backend):
+        keys = [_pbkdf2(backend).derive(six.int2byte(i) * 8) for i in range(3)]
+        verifications = cache.VerificationCache(2, 60, backend)
+        for i, key in enumerate(keys):
+            verifications.verify(_pbkdf2(backend), six.int2byte(i) * 8, key)
+
+        assert len(verifications) == 2
+        with pytest.raises(AlreadyFinalized):
+            verifications.verify(_used_pbkdf2(backend), b"\x00" * 8, keys[0])
+        verifications.verify(_used_pbkdf2(backend), b"\x02" * 8, keys[2])
+
+    def test_clear(self, backend):
+        key = _pbkdf2(backend).derive(b"password")
+        verifications = cache.VerificationCache(10, 60, backend)
+        verifications.verify(_pbkdf2(backend), b"password", key)
+        verifications.clear()
+        assert len(verifications) == 0
+        with pytest.raises(AlreadyFinalized):
+            verifications.verify(_used_pbkdf2(backend), b"password", key)
+
+    @pytest.mark.requires_backend_interface(interface=ScryptBackend)
+    def test_scrypt(self, backend):
+        key = Scrypt(b"salt", 32, 16, 1, 1, backend).derive(b"password")
+        verifications = cache.VerificationCache(10, 60, backend)
+        verifications.verify(
+            Scrypt(b"salt", 32, 16, 1, 1, backend), b"password", key
+        )
+        kdf = Scrypt(b"salt", 32, 16, 1, 1, backend)
+        kdf.derive(b"")
+        verifications.verify(kdf, b"password", key)
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            cache.VerificationCache(1.0, 60, backend)
+        with pytest.raises(ValueError):
+            cache.VerificationCache(0, 60, backend)
+        with pytest.raises(TypeError):
+            cache.VerificationCache(10, "60", backend)
+        with pytest.raises(ValueError):
+            cache.VerificationCache(10, 0, backend)
+
+        verifications = cache.VerificationCache(10, 60, backend)
+        with pytest.raises(TypeError):
+            verifications.verify(
+                HKDF(hashes.SHA256(), 32, None, None, backend), b"a", b"b"
+            )
+        with pytest.raises(TypeError):
+            verifications.verify(_pbkdf2(backend), u"password", b"key")
+        with pytest.raises(TypeError):
+            verifications.verify(_pbkdf2(backend), b"password", u"key")
@@ -0,0 +1,153 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+import pytest
+
+from cryptography_patched import utils
+from cryptography_patched.exceptions import InvalidKey
+from cryptography_patched.hazmat.backends.interfaces import (
+    PBKDF2HMACBackend, ScryptBackend
+)
+from cryptography_patched.hazmat.primitives import hashes
+from cryptography_patched.hazmat.primitives.kdf import KeyDerivationFunction
+from cryptography_patched.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography_patched.hazmat.primitives.kdf.scrypt import Scrypt
+
+# The executor needs concurrent.futures, which Python 2 only has through
+# the futures backport.
+futures = pytest.importorskip("concurrent.futures")
+kdf_executor = pytest.importorskip(
+    "cryptography_patched.hazmat.primitives.kdf.executor"
+)
+KDFExecutor = kdf_executor.KDFExecutor
+KDFQueueFullError = kdf_executor.KDFQueueFullError
+
+
+def _pbkdf2(backend):
+    return PBKDF2HMAC(hashes.SHA256(), 32, b"salt", 1000, backend)
+
+
+@utils.register_interface(KeyDerivationFunction)
+class _BlockingKDF(object):
+    # A KDF that doesn't return until it is released, so tests can control
+    # how many derivations are running.
+    def __init__(self, release):
+        self._release = release
+
+    def derive(self, key_material):
+        self._release.wait()
+        return key_material
+
+    def verify(self, key_material, expected_key):
+        pass
+
+
+class TestKDFExecutor(object):
+    @pytest.mark.requires_backend_interface(interface=PBKDF2HMACBackend)
+    def test_derive(self, backend):
+        expected = _pbkdf2(backend).derive(b"password")
+        with KDFExecutor(max_concurrency=2) as executor:
+            results = [
+                executor.derive(_pbkdf2(backend), bytearray(b"password"))
+                for _ in range(5)
+            ]
+            assert [f.result() for f in results] == [expected] * 5
+
+    @pytest.mark.requires_backend_interface(interface=PBKDF2HMACBackend)
+    def test_verify(self, backend):
+        expected = _pbkdf2(backend).derive(b"password")
+        with KDFExecutor() as executor:
+            executor.verify(_pbkdf2(backend), b"password", expected).result()
+            with pytest.raises(InvalidKey):
+                executor.verify(
+                    _pbkdf2(backend), b"wrong", expected
+                ).result()
+
+    @pytest.mark.requires_backend_interface(interface=ScryptBackend)
+    def test_process_pool(self, backend):
+        kdf = Scrypt(b"salt", 32, 16, 1, 1, backend)
+        expected = Scrypt(b"salt", 32, 16, 1, 1, backend).derive(b"password")
+        with futures.ProcessPoolExecutor(1) as pool:
+            executor = KDFExecutor(pool, max_concurrency=1)
+            assert executor.derive(kdf, b"password").result() == expected
+
+    @pytest.mark.requires_backend_interface(interface=PBKDF2HMACBackend)
+    def test_derive_async(self, backend):
+        asyncio = pytest.importorskip("asyncio")
+        expected = _pbkdf2(backend).derive(b"password")
+        loop = asyncio.new_event_loop()
+        try:
+            with KDFExecutor() as executor:
+                result = loop.run_until_complete(
+                    executor.derive_async(
+                        _pbkdf2(backend), b"password", loop=loop
+                    )
+                )
+                assert result == expected
+                with pytest.raises(InvalidKey):
+                    loop.run_until_complete(
+                        executor.verify_async(
+                            _pbkdf2(backend), b"wrong", expected, loop=loop
+                        )
+                    )
+        finally:
+            loop.close()
+
+    def test_concurrency_limit_and_queue(self):
+        release = threading.Event()
+        executor = KDFExecutor(max_concurrency=2, max_pending=1)
+        try:
+            running = [
+                executor.derive(_BlockingKDF(release), b"a"),
+                executor.derive(_BlockingKDF(release), b"b"),
+            ]
+            queued = executor.derive(_BlockingKDF(release), b"c")
+            assert not queued.running()
+            with pytest.raises(KDFQueueFullError):
+                executor.derive(_BlockingKDF(release), b"d")
+
+            release.set()
+            assert [f.result() for f in running] == [b"a", b"b"]
+            assert queued.result() == b"c"
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_cancel_queued(self):
+        release = threading.Event()
+        executor = KDFExecutor(max_concurrency=1)
+        try:
+            running = executor.derive(_BlockingKDF(release), b"a")
+            queued = executor.derive(_BlockingKDF(release), b"b")
+            assert queued.cancel()
+            after = executor.derive(_BlockingKDF(release), b"c")
+            release.set()
+            assert running.result() == b"a"
+            assert after.result() == b"c"
+            assert queued.cancelled()
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_invalid_arguments(self):
+        with pytest.raises(TypeError):
+            KDFExecutor(max_concurrency=1.0)
+        with pytest.raises(ValueError):
+            KDFExecutor(max_concurrency=0)
+        with pytest.raises(TypeError):
+            KDFExecutor(max_pending=1.0)
+        with pytest.raises(ValueError):
+            KDFExecutor(max_pending=-1)
+
+        with KDFExecutor() as executor:
+            with pytest.raises(TypeError):
+                executor.derive(object(), b"password")
+            with pytest.raises(TypeError):
+                executor.derive(_BlockingKDF(None), u"password")
+            with pytest.raises(TypeError):
+                executor.verify(_BlockingKDF(None), b"password", u"key")
@@ -0,0 +1,187 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import binascii
+import os
+
+import pytest
+
+from cryptography_patched.exceptions import (
+    AlreadyFinalized, InvalidSignature, _Reasons
+)
+from cryptography_patched.hazmat.backends.interfaces import HashBackend
+from cryptography_patched.hazmat.primitives import hashes
+from cryptography_patched.hazmat.primitives.merkle import (
+    MerkleTree, MerkleTreeHash, hash_leaf, verify_inclusion
+)
+
+from ...doubles import DummyHashAlgorithm
+from ...utils import raises_unsupported_algorithm
+
+
+def _rfc6962_root(backend, leaves):
+    # The recursive Merkle Tree Hash definition from RFC 6962 section 2.1.
+    if len(leaves) == 1:
+        return hashes.digest(hashes.SHA256(), b"\x00" + leaves[0], backend)
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return hashes.digest(
+        hashes.SHA256(),
+        b"\x01" + _rfc6962_root(backend, leaves[:k]) +
+        _rfc6962_root(backend, leaves[k:]),
+        backend
+    )
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestMerkleTreeHash(object):
+    def test_empty(self, backend):
+        h = MerkleTreeHash(hashes.SHA256(), backend)
+        tree = h.finalize()
+        # The empty-string leaf hash from the RFC 6962 test vectors.
+        assert tree.root == binascii.unhexlify(
+            b"6e340b9cffb37a989ca544e6bb780a2c78901d3fb33738768511a30617afa01d"
+        )
+        assert tree.leaf_hashes == [tree.root]
+
+    @pytest.mark.parametrize("size", [1, 15, 16, 17, 48, 100, 200])
+    def test_matches_rfc6962(self, backend, size):
+        data = os.urandom(size)
+        h = MerkleTreeHash(hashes.SHA256(), backend, leaf_size=16)
+        h.update(data)
+        tree = h.finalize()
+        leaves = [data[i:i + 16] for i in range(0, len(data), 16)]
+        assert tree.root == _rfc6962_root(backend, leaves)
+        assert tree.leaf_hashes == [
+            hash_leaf(hashes.SHA256(), leaf, backend) for leaf in leaves
+        ]
+
+    def test_update_chunking(self, backend):
+        data = os.urandom(1000)
+        h = MerkleTreeHash(hashes.SHA256(), backend, leaf_size=64)
+        h.update(data)
+        expected = h.finalize().root
+
+        h = MerkleTreeHash(hashes.SHA256(), backend, leaf_size=64)
+        for i in range(0, len(data), 7):
+            h.update(data[i:i + 7])
+        assert h.finalize().root == expected
+
+        h = MerkleTreeHash(hashes.SHA256(), backend, leaf_size=64)
+        h.update(bytearray(data[:10]))
+        h.update(b"")
+        h.update(memoryview(data)[10:])
+        assert h.finalize().root == expected
+
+    def test_executor(self, backend):
+        futures = pytest.importorskip("concurrent.futures")
+        data = os.urandom(4096)
+        h = MerkleTreeHash(hashes.SHA256(), backend, leaf_size=32)
+        h.update(data)
+        expected = h.finalize()
+
+        with futures.ThreadPoolExecutor(4) as executor:
+            h = MerkleTreeHash(
+                hashes.SHA256(), backend, leaf_size=32, executor=executor
+            )
+            h.update(data)
+            tree = h.finalize()
+
+        assert tree.root == expected.root
+        assert tree.leaf_hashes == expected.leaf_hashes
+
+    def test_use_after_finalize(self, backend):
+        h = MerkleTreeHash(hashes.SHA256(), backend)
+        h.finalize()
+        with pytest.raises(AlreadyFinalized):
+            h.update(b"abc")
+        with pytest.raises(AlreadyFinalized):
+            h.finalize()
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            MerkleTreeHash(hashes.SHA256, backend)
+        with pytest.raises(ValueError):
+            MerkleTreeHash(hashes.SHA256(), backend, leaf_size=0)
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            MerkleTreeHash(hashes.SHA256(), object())
+        with pytest.raises(TypeError):
+            MerkleTreeHash(hashes.SHA256(), backend).update(u"abc")
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            MerkleTreeHash(DummyHashAlgorithm(), backend).finalize()
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestMerkleTree(object):
+    def test_from_leaf_hashes(self, backend):
+        h = MerkleTreeHash(hashes.SHA256(), backend, leaf_size=8)
+        h.update(os.urandom(100))
+        tree = h.finalize()
+        rebuilt = MerkleTree(hashes.SHA256(), tree.leaf_hashes, backend)
+        assert rebuilt.root == tree.root
+        assert isinstance(rebuilt.algorithm, hashes.SHA256)
+
+    def test_invalid_leaf_hashes(self, backend):
+        with pytest.raises(ValueError):
+            MerkleTree(hashes.SHA256(), [], backend)
+        with pytest.raises(ValueError):
+            MerkleTree(hashes.SHA256(), [b"\x00" * 31], backend)
+        with pytest.raises(TypeError):
+            MerkleTree(hashes.SHA256(), [u"\x00" * 32], backend)
+
+    @pytest.mark.parametrize("leaf_count", [1, 2, 3, 4, 5, 7, 8, 13])
+    def test_inclusion_proofs(self, backend, leaf_count):
+        leaves = [os.urandom(8) for _ in range(leaf_count)]
+        h = MerkleTreeHash(hashes.SHA256(), backend, leaf_size=8)
+        h.update(b"".join(leaves))
+        tree = h.finalize()
+        for index, leaf in enumerate(leaves):
+            proof = tree.inclusion_proof(index)
+            verify_inclusion(
+                hashes.SHA256(), tree.root,
+                hash_leaf(hashes.SHA256(), leaf, backend), index, leaf_count,
+                proof, backend
+            )
+
+    def test_inclusion_proof_invalid_index(self, backend):
+        tree = MerkleTree(hashes.SHA256(), [b"\x00" * 32] * 3, backend)
+        with pytest.raises(ValueError):
+            tree.inclusion_proof(3)
+        with pytest.raises(ValueError):
+            tree.inclusion_proof(-1)
+        with pytest.raises(TypeError):
+            tree.inclusion_proof(1.0)
+
+    def test_verify_inclusion_invalid(self, backend):
+        leaf_hashes = [
+            hash_leaf(hashes.SHA256(), os.urandom(8), backend)
+            for _ in range(5)
+        ]
+        tree = MerkleTree(hashes.SHA256(), leaf_hashes, backend)
+        proof = tree.inclusion_proof(2)
+
+        def verify(leaf_hash, index, leaf_count, proof):
+            verify_inclusion(
+                hashes.SHA256(), tree.root, leaf_hash, index, leaf_count,
+                proof, backend
+            )
+
+        verify(leaf_hashes[2], 2, 5, proof)
+        with pytest.raises(InvalidSignature):
+            verify(leaf_hashes[3], 2, 5, proof)
+        with pytest.raises(InvalidSignature):
+            verify(leaf_hashes[2], 3, 5, proof)
+        with pytest.raises(InvalidSignature):
+            verify(leaf_hashes[2], 2, 5, proof[:-1])
+        with pytest.raises(InvalidSignature):
+            verify(leaf_hashes[2], 2, 5, proof + [proof[0]])
+        with pytest.raises(ValueError):
+            verify(leaf_hashes[2], 5, 5, proof)
@@ -36,7 +36,8 @@ from .utils import (
     _check_rsa_private_numbers, generate_rsa_verification_test
 )
 from ...doubles import (
-    DummyAsymmetricPadding, DummyHashAlgorithm, DummyKeySerializationEncryption
+    DummyAsymmetricPadding, DummyExecutor, DummyHashAlgorithm,
+    DummyKeySerializationEncryption
 )
 from ...utils import (
     load_nist_vectors, load_pkcs1_vectors, load_rsa_nist_vectors,
@@ -1336,6 +1337,193 @@ class TestRSAPKCS1Verification(object):
     ))
 
 
+@pytest.mark.requires_backend_interface(interface=RSABackend)
+class TestRSAPrepared(object):
+    @pytest.mark.parametrize(
+        "pad",
+        [
+            padding.PKCS1v15(),
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA256()),
+                salt_length=padding.PSS.MAX_LENGTH
+            ),
+        ]
+    )
+    def test_sign_verify(self, backend, pad):
+        private_key = RSA_KEY_2048.private_key(backend)
+        public_key = private_key.public_key()
+        signer = private_key.prepare_signer(pad, hashes.SHA256())
+        verifier = public_key.prepare_verifier(pad, hashes.SHA256())
+        for data in [b"", b"abc", b"def" * 100]:
+            signature = signer.sign(data)
+            public_key.verify(signature, data, pad, hashes.SHA256())
+            verifier.verify(signature, data)
+            verifier.verify(
+                private_key.sign(data, pad, hashes.SHA256()), data
+            )
+            with pytest.raises(InvalidSignature):
+                verifier.verify(signature, data + b"x")
+
+    def test_prehashed(self, backend):
+        private_key = RSA_KEY_2048.private_key(backend)
+        prehashed = asym_utils.Prehashed(hashes.SHA256())
+        digest = hashes.digest(hashes.SHA256(), b"abc", backend)
+        signature = private_key.prepare_signer(
+            padding.PKCS1v15(), prehashed
+        ).sign(digest)
+        private_key.public_key().verify(
+            signature, b"abc", padding.PKCS1v15(), hashes.SHA256()
+        )
+        verifier = private_key.public_key().prepare_verifier(
+            padding.PKCS1v15(), prehashed
+        )
+        verifier.verify(signature, digest)
+        with pytest.raises(ValueError):
+            verifier.verify(signature, b"abc")
+
+    def test_threads(self, backend):
+        futures = pytest.importorskip("concurrent.futures")
+        private_key = RSA_KEY_2048.private_key(backend)
+        signature = private_key.sign(b"abc", padding.PKCS1v15(), hashes.SHA1())
+        verifier = private_key.public_key().prepare_verifier(
+            padding.PKCS1v15(), hashes.SHA1()
+        )
+        with futures.ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(
+                lambda _: verifier.verify(signature, b"abc"), range(100)
+            ))
+        assert results == [None] * 100
+
+    def test_invalid_arguments(self, backend):
+        private_key = RSA_KEY_2048.private_key(backend)
+        with pytest.raises(TypeError):
+            private_key.prepare_signer(object(), hashes.SHA256())
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_PADDING):
+            private_key.public_key().prepare_verifier(
+                DummyAsymmetricPadding(), hashes.SHA256()
+            )
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            private_key.prepare_signer(
+                padding.PKCS1v15(), DummyHashAlgorithm()
+            )
+
+    def test_not_required_by_interfaces(self):
+        assert "prepare_signer" not in rsa.RSAPrivateKey.__abstractmethods__
+        assert (
+            "prepare_verifier" not in rsa.RSAPublicKey.__abstractmethods__
+        )
+
+    def test_digest_too_large(self, backend):
+        private_key = RSA_KEY_512.private_key(backend)
+        with pytest.raises(ValueError):
+            private_key.prepare_signer(
+                padding.PSS(
+                    mgf=padding.MGF1(hashes.SHA512()),
+                    salt_length=padding.PSS.MAX_LENGTH
+                ),
+                hashes.SHA512()
+            )
+
+
+@pytest.mark.requires_backend_interface(interface=RSABackend)
+class TestRSAKeyPool(object):
+    def test_serves_from_pool(self, backend):
+        pytest.importorskip("concurrent.futures")
+        executor = DummyExecutor()
+        pool = rsa.RSAKeyPool(
+            65537, 1024, backend, size=3, low_water=1, executor=executor
+        )
+        assert (pool.size, pool.low_water) == (3, 1)
+        assert (pool.public_exponent, pool.key_size) == (65537, 1024)
+        assert (pool.depth, pool.in_flight, pool.generated) == (3, 0, 3)
+        assert pool.mean_generation_time > 0
+
+        keys = [pool.generate_private_key()]
+        assert pool.depth == 2
+        # Falling to the low water mark tops the pool back up.
+        keys.append(pool.generate_private_key())
+        assert pool.depth == 3
+        assert (executor.submitted, pool.misses) == (5, 0)
+
+        for key in keys:
+            assert isinstance(key, rsa.RSAPrivateKey)
+            assert key.key_size == 1024
+            assert key.private_numbers().public_numbers.e == 65537
+            _check_rsa_private_numbers(key.private_numbers())
+        assert keys[0].private_numbers() != keys[1].private_numbers()
+
+    def test_empty_pool_generates_directly(self, backend):
+        pytest.importorskip("concurrent.futures")
+        executor = DummyExecutor()
+        executor.shutdown()
+        pool = rsa.RSAKeyPool(65537, 1024, backend, size=2, executor=executor)
+        assert (pool.depth, pool.mean_generation_time) == (0, None)
+
+        key = pool.generate_private_key()
+        assert key.key_size == 1024
+        assert (pool.depth, pool.misses, pool.generated) == (0, 1, 1)
+        assert pool.mean_generation_time > 0
+
+    def test_failed_job_is_raised(self, backend):
+        pytest.importorskip("concurrent.futures")
+
+        class FailingExecutor(DummyExecutor):
+            def submit(self, func, *args):
+                def fail(*args):
+                    raise MemoryError("no memory")
+
+                return super(FailingExecutor, self).submit(fail)
+
+        executor = FailingExecutor()
+        pool = rsa.RSAKeyPool(65537, 1024, backend, size=2, executor=executor)
+        assert (pool.depth, pool.in_flight, executor.submitted) == (0, 0, 2)
+        with pytest.raises(MemoryError):
+            pool.generate_private_key()
+        # Nothing more was asked of the executor until the error was raised.
+        assert executor.submitted == 2
+
+    def test_shutdown(self, backend):
+        pytest.importorskip("concurrent.futures")
+        executor = DummyExecutor()
+        with rsa.RSAKeyPool(
+            65537, 1024, backend, size=1, low_water=0, executor=executor
+        ) as pool:
+            pool.generate_private_key()
+            assert (executor.submitted, pool.depth) == (2, 1)
+
+        # An executor that was passed in is left running. The pool still
+        # hands out the keys it has but stops asking for more.
+        assert not executor.shut_down
+        pool.generate_private_key()
+        assert pool.generate_private_key().key_size == 1024
+        assert (executor.submitted, pool.misses) == (2, 1)
+
+    def test_default_executor(self, backend):
+        pytest.importorskip("concurrent.futures")
+        with rsa.RSAKeyPool(65537, 1024, backend, size=1) as pool:
+            assert pool.generate_private_key().key_size == 1024
+
+    def test_invalid_arguments(self, backend):
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            rsa.RSAKeyPool(65537, 1024, object())
+        with pytest.raises(ValueError):
+            rsa.RSAKeyPool(4, 1024, backend)
+        with pytest.raises(ValueError):
+            rsa.RSAKeyPool(65537, 256, backend)
+        with pytest.raises(TypeError):
+            rsa.RSAKeyPool(65537, 1024, backend, size=1.0)
+        with pytest.raises(ValueError):
+            rsa.RSAKeyPool(65537, 1024, backend, size=0)
+        with pytest.raises(TypeError):
+            rsa.RSAKeyPool(65537, 1024, backend, low_water=1.0)
+        with pytest.raises(ValueError):
+            rsa.RSAKeyPool(65537, 1024, backend, size=2, low_water=2)
+        with pytest.raises(ValueError):
+            rsa.RSAKeyPool(65537, 1024, backend, size=2, low_water=-1)
+
+
 class TestPSS(object):
     def test_calculate_max_pss_salt_length(self):
         with pytest.raises(TypeError):
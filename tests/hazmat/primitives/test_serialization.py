@@ -21,7 +21,7 @@ from cryptography_patched.hazmat.primitives.asymmetric import (
 )
 from cryptography_patched.hazmat.primitives.serialization import (
     BestAvailableEncryption, Encoding, NoEncryption,
-    PrivateFormat, PublicFormat,
+    PrivateFormat, PublicFormat, PublicKeyCache,
     load_der_parameters, load_der_private_key,
     load_der_public_key, load_pem_parameters, load_pem_private_key,
     load_pem_public_key, load_ssh_public_key
@@ -1594,3 +1594,60 @@ class TestEd448Serialization(object):
             key.public_bytes(
                 Encoding.OpenSSH, PublicFormat.OpenSSH
             )
+
+
+@pytest.mark.requires_backend_interface(interface=RSABackend)
+@pytest.mark.requires_backend_interface(interface=PEMSerializationBackend)
+@pytest.mark.requires_backend_interface(interface=DERSerializationBackend)
+class TestPublicKeyCache(object):
+    def _pem(self, name):
+        return load_vectors_from_file(
+            os.path.join("asymmetric", "PEM_Serialization", name),
+            lambda pemfile: pemfile.read(), mode="rb"
+        )
+
+    def test_load_pem_public_key(self, backend):
+        cache = PublicKeyCache(10)
+        data = self._pem("rsa_public_key.pem")
+        key = cache.load_pem_public_key(data, backend)
+        assert isinstance(key, rsa.RSAPublicKey)
+        assert key.public_numbers() == load_pem_public_key(
+            data, backend
+        ).public_numbers()
+        assert cache.load_pem_public_key(bytearray(data), backend) is key
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert len(cache) == 1
+
+    def test_load_der_public_key(self, backend):
+        cache = PublicKeyCache(10)
+        data = load_pem_public_key(
+            self._pem("rsa_public_key.pem"), backend
+        ).public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo)
+        key = cache.load_der_public_key(data, backend)
+        assert cache.load_der_public_key(data, backend) is key
+        # The same bytes given to the other loader are a separate entry.
+        with pytest.raises(ValueError):
+            cache.load_pem_public_key(data, backend)
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert len(cache) == 1
+
+    def test_eviction_and_clear(self, backend):
+        cache = PublicKeyCache(1)
+        rsa_data = self._pem("rsa_public_key.pem")
+        dsa_data = self._pem("dsa_public_key.pem")
+        rsa_key = cache.load_pem_public_key(rsa_data, backend)
+        cache.load_pem_public_key(dsa_data, backend)
+        assert len(cache) == 1
+        assert cache.load_pem_public_key(rsa_data, backend) is not rsa_key
+
+        cache.clear()
+        assert len(cache) == 0
+        assert (cache.hits, cache.misses) == (0, 3)
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            PublicKeyCache(1.0)
+        with pytest.raises(ValueError):
+            PublicKeyCache(0)
+        with pytest.raises(TypeError):
+            PublicKeyCache(1).load_pem_public_key(u"key", backend)
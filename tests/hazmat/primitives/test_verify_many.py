@@ -0,0 +1,190 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from cryptography_patched.exceptions import InvalidSignature, _Reasons
+from cryptography_patched.hazmat.backends.interfaces import (
+    EllipticCurveBackend, RSABackend
+)
+from cryptography_patched.hazmat.primitives import asymmetric, hashes
+from cryptography_patched.hazmat.primitives.asymmetric import (
+    ec, ed25519, padding, utils as asym_utils, verify_many
+)
+
+from .fixtures_rsa import RSA_KEY_2048
+from .test_ec import _skip_curve_unsupported
+from ...utils import raises_unsupported_algorithm
+
+
+def _rsa_items(backend):
+    private_key = RSA_KEY_2048.private_key(backend)
+    pss = padding.PSS(padding.MGF1(hashes.SHA256()), padding.PSS.MAX_LENGTH)
+    pkcs1 = padding.PKCS1v15()
+    items = []
+    for i in range(4):
+        data = b"message " + str(i).encode("ascii")
+        for pad in (pss, pkcs1):
+            signature = private_key.sign(data, pad, hashes.SHA256())
+            items.append(
+                (private_key.public_key(), signature, data, pad,
+                 hashes.SHA256())
+            )
+    return items
+
+
+def _corrupt(items):
+    return [
+        (item[0], item[1], item[2] + b"x") + tuple(item[3:])
+        for item in items
+    ]
+
+
+@pytest.mark.requires_backend_interface(interface=RSABackend)
+class TestVerifyManyRSA(object):
+    def test_verify_many(self, backend):
+        items = _rsa_items(backend)
+        bad = _corrupt(items)
+        assert verify_many(items) == [True] * len(items)
+        assert verify_many(bad) == [False] * len(bad)
+        assert verify_many(items + bad) == (
+            [True] * len(items) + [False] * len(bad)
+        )
+
+    def test_prehashed(self, backend):
+        private_key = RSA_KEY_2048.private_key(backend)
+        digest = hashes.digest(hashes.SHA256(), b"data", backend)
+        prehashed = asym_utils.Prehashed(hashes.SHA256())
+        signature = private_key.sign(
+            digest, padding.PKCS1v15(), prehashed
+        )
+        assert verify_many([
+            (private_key.public_key(), signature, digest, padding.PKCS1v15(),
+             prehashed),
+            (private_key.public_key(), signature, b"data", padding.PKCS1v15(),
+             hashes.SHA256()),
+        ]) == [True, True]
+
+    def test_executor(self, backend):
+        futures = pytest.importorskip("concurrent.futures")
+        items = _rsa_items(backend) * 40
+        bad = _corrupt(items)
+        with futures.ThreadPoolExecutor(4) as executor:
+            assert verify_many(items + bad, executor) == (
+                [True] * len(items) + [False] * len(bad)
+            )
+
+    def test_equal_arguments_share_a_verifier(self, backend, monkeypatch):
+        private_key = RSA_KEY_2048.private_key(backend)
+        public_key = private_key.public_key()
+        items = []
+        for i in range(4):
+            data = b"message " + str(i).encode("ascii")
+            signature = private_key.sign(
+                data, padding.PKCS1v15(), hashes.SHA256()
+            )
+            items.append((
+                public_key, signature, data, padding.PKCS1v15(),
+                hashes.SHA256()
+            ))
+
+        prepared = []
+
+        def batch_verifier(public_key, args):
+            prepared.append(args)
+            return original(public_key, args)
+
+        original = asymmetric._batch_verifier
+        monkeypatch.setattr(asymmetric, "_batch_verifier", batch_verifier)
+        assert verify_many(items) == [True] * 4
+        assert len(prepared) == 1
+
+        # Different parameters still get their own verifier.
+        pss = padding.PSS(padding.MGF1(hashes.SHA256()), 32)
+        signature = private_key.sign(b"data", pss, hashes.SHA256())
+        assert verify_many(items + [
+            (public_key, signature, b"data",
+             padding.PSS(padding.MGF1(hashes.SHA256()), 32), hashes.SHA256()),
+            (public_key, signature, b"data",
+             padding.PSS(padding.MGF1(hashes.SHA256()), 20), hashes.SHA256()),
+        ]) == [True] * 5 + [False]
+        assert len(prepared) == 4
+
+    def test_errors_are_raised(self, backend):
+        private_key = RSA_KEY_2048.private_key(backend)
+        with pytest.raises(TypeError):
+            verify_many([
+                (private_key.public_key(), b"sig", b"data", object(),
+                 hashes.SHA256())
+            ])
+
+
+@pytest.mark.requires_backend_interface(interface=EllipticCurveBackend)
+class TestVerifyManyECDSA(object):
+    def test_verify_many(self, backend):
+        _skip_curve_unsupported(backend, ec.SECP256R1())
+        private_key = ec.generate_private_key(ec.SECP256R1(), backend)
+        algorithm = ec.ECDSA(hashes.SHA256())
+        items = [
+            (private_key.public_key(), private_key.sign(data, algorithm),
+             data, algorithm)
+            for data in [b"", b"abc", b"def" * 100]
+        ]
+        assert verify_many(items + _corrupt(items)) == [True] * 3 + [False] * 3
+
+    def test_invalid_algorithm(self, backend):
+        _skip_curve_unsupported(backend, ec.SECP256R1())
+        private_key = ec.generate_private_key(ec.SECP256R1(), backend)
+        with raises_unsupported_algorithm(
+            _Reasons.UNSUPPORTED_PUBLIC_KEY_ALGORITHM
+        ):
+            verify_many([
+                (private_key.public_key(), b"sig", b"data", hashes.SHA256())
+            ])
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.ed25519_supported(),
+    skip_message="Requires OpenSSL with Ed25519 support"
+)
+class TestVerifyManyEd25519(object):
+    def test_verify_many(self, backend):
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        items = [
+            (private_key.public_key(), private_key.sign(data), data)
+            for data in [b"", b"abc", b"def" * 100]
+        ]
+        assert verify_many(items + _corrupt(items)) == [True] * 3 + [False] * 3
+        assert verify_many([
+            (private_key.public_key(), b"\x00" * 10, b"abc")
+        ]) == [False]
+
+
+def test_fallback_to_verify():
+    class PublicKey(object):
+        def verify(self, signature, data, expected):
+            if signature != expected:
+                raise InvalidSignature
+
+    key = PublicKey()
+    assert verify_many([
+        (key, b"a", b"data", b"a"),
+        (key, b"a", b"data", b"b"),
+    ]) == [True, False]
+    assert verify_many([]) == []
+
+
+def test_unhashable_arguments():
+    class PublicKey(object):
+        def verify(self, signature, data, expected):
+            if signature not in expected:
+                raise InvalidSignature
+
+    key = PublicKey()
+    assert verify_many([
+        (key, b"a", b"data", [b"a"]),
+        (key, b"a", b"data", [b"b"]),
+    ]) == [True, False]
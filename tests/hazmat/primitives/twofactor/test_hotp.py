@@ -90,6 +90,32 @@ class TestHOTP(object):
         with pytest.raises(InvalidToken):
             hotp.verify(b"123456", counter)
 
+    def test_verify_window(self, backend):
+        secret = b"12345678901234567890"
+        hotp = HOTP(secret, 6, SHA1(), backend)
+
+        assert hotp.verify_window(hotp.generate(5), 5, 0) == 5
+        assert hotp.verify_window(hotp.generate(7), 5, 3) == 7
+        assert hotp.verify_window(hotp.generate(8), 5, 3) == 8
+        with pytest.raises(InvalidToken):
+            hotp.verify_window(hotp.generate(9), 5, 3)
+        with pytest.raises(InvalidToken):
+            hotp.verify_window(hotp.generate(4), 5, 3)
+
+    @pytest.mark.parametrize("params", vectors)
+    def test_verify_window_vectors(self, backend, params):
+        hotp = HOTP(params["secret"], 6, SHA1(), backend)
+        assert hotp.verify_window(params["hotp"], 0, 9) == int(
+            params["counter"]
+        )
+
+    def test_verify_window_invalid_look_ahead(self, backend):
+        hotp = HOTP(b"12345678901234567890", 6, SHA1(), backend)
+        with pytest.raises(TypeError):
+            hotp.verify_window(b"755224", 0, 1.0)
+        with pytest.raises(ValueError):
+            hotp.verify_window(b"755224", 0, -1)
+
     def test_length_not_int(self, backend):
         secret = b"12345678901234567890"
 
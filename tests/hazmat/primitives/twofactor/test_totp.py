@@ -118,6 +118,32 @@ class TestTOTP(object):
         with pytest.raises(InvalidToken):
             totp.verify(b"12345678", time)
 
+    def test_verify_with_drift(self, backend):
+        secret = b"12345678901234567890"
+        totp = TOTP(secret, 8, hashes.SHA1(), 30, backend)
+
+        assert totp.verify_with_drift(totp.generate(100), 100, 0) == 3
+        assert totp.verify_with_drift(totp.generate(70), 130, 2) == 2
+        assert totp.verify_with_drift(totp.generate(190), 130, 2) == 6
+        with pytest.raises(InvalidToken):
+            totp.verify_with_drift(totp.generate(250), 130, 2)
+        with pytest.raises(InvalidToken):
+            totp.verify_with_drift(totp.generate(130), 100, 0)
+
+    def test_verify_with_drift_near_epoch(self, backend):
+        secret = b"12345678901234567890"
+        totp = TOTP(secret, 8, hashes.SHA1(), 30, backend)
+
+        assert totp.verify_with_drift(totp.generate(0), 10, 5) == 0
+        assert totp.verify_with_drift(totp.generate(40), 10, 5) == 1
+
+    def test_verify_with_drift_invalid_steps(self, backend):
+        totp = TOTP(b"12345678901234567890", 8, hashes.SHA1(), 30, backend)
+        with pytest.raises(TypeError):
+            totp.verify_with_drift(b"94287082", 59, 1.0)
+        with pytest.raises(ValueError):
+            totp.verify_with_drift(b"94287082", 59, -1)
+
     def test_floating_point_time_generate(self, backend):
         secret = b"12345678901234567890"
         time = 59.1
@@ -166,6 +166,9 @@ def hash_test(backend, algorithm, params):
     m.update(binascii.unhexlify(msg))
     expected_md = md.replace(" ", "").lower().encode("ascii")
     assert m.finalize() == binascii.unhexlify(expected_md)
+    assert hashes.digest(
+        algorithm, binascii.unhexlify(msg), backend
+    ) == binascii.unhexlify(expected_md)
 
 
 def generate_base_hash_test(algorithm, digest_size):
@@ -9,6 +9,7 @@ import calendar
 import datetime
 import json
 import os
+import threading
 import time
 
 import iso8601
@@ -118,6 +119,16 @@ class TestFernet(object):
         f = Fernet(Fernet.generate_key(), backend=backend)
         assert f.decrypt(f.encrypt(message)) == message
 
+    @pytest.mark.parametrize("length", [15, 16, 17, 31, 32, 33])
+    def test_roundtrips_padding_boundaries(self, length, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        message = os.urandom(length)
+        token = f.encrypt(message)
+        assert len(base64.urlsafe_b64decode(token)) == (
+            25 + (length // 16 + 1) * 16 + 32
+        )
+        assert f.decrypt(token) == message
+
     def test_bad_key(self, backend):
         with pytest.raises(ValueError):
             Fernet(base64.urlsafe_b64encode(b"abc"), backend=backend)
@@ -131,6 +142,162 @@ class TestFernet(object):
         with pytest.raises(InvalidToken):
             f.extract_timestamp(b"nonsensetoken")
 
+    def test_encrypt_decrypt_many(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        data = [b"", b"abc", b"\x00" * 100]
+        tokens = f.encrypt_many(data)
+        assert len(tokens) == len(data)
+        assert [f.decrypt(token) for token in tokens] == data
+        assert f.decrypt_many(tokens) == data
+        assert f.decrypt_many(iter(tokens)) == data
+        assert f.encrypt_many([]) == []
+        assert f.decrypt_many([]) == []
+
+    def test_decrypt_many_invalid_items(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        other = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        tokens = [
+            f.encrypt(b"abc"), b"nonsensetoken", other.encrypt(b"abc"),
+            f.encrypt(b"def"),
+        ]
+        results = f.decrypt_many(tokens)
+        assert results[0] == b"abc"
+        assert isinstance(results[1], InvalidToken)
+        assert isinstance(results[2], InvalidToken)
+        assert results[3] == b"def"
+
+    def test_decrypt_many_ttl(self, backend, monkeypatch):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        current_time = 1526138327
+        monkeypatch.setattr(time, "time", lambda: current_time)
+        tokens = f.encrypt_many([b"abc"])
+        monkeypatch.setattr(time, "time", lambda: current_time + 100)
+        assert f.decrypt_many(tokens, ttl=200) == [b"abc"]
+        assert isinstance(f.decrypt_many(tokens, ttl=10)[0], InvalidToken)
+
+    def test_many_non_bytes(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        with pytest.raises(TypeError):
+            f.encrypt_many([b"abc", u"abc"])
+        with pytest.raises(TypeError):
+            f.decrypt_many([f.encrypt(b"abc"), u"abc"])
+
+    def test_threads(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        errors = []
+
+        def roundtrip(i):
+            try:
+                for j in range(50):
+                    data = six.int2byte(i) * j
+                    assert f.decrypt(f.encrypt(data)) == data
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=roundtrip, args=(i,)) for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+    @pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 64])
+    def test_stream_roundtrip(self, backend, size):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        data = os.urandom(size)
+        encrypted = six.BytesIO()
+        f.encrypt_stream(six.BytesIO(data), encrypted, chunk_size=16)
+        lines = encrypted.getvalue().splitlines()
+        assert len(lines) == max(1, (size + 15) // 16)
+        for line in lines:
+            f.decrypt(line)
+
+        decrypted = six.BytesIO()
+        encrypted.seek(0)
+        f.decrypt_stream(encrypted, decrypted)
+        assert decrypted.getvalue() == data
+
+    @pytest.mark.parametrize("chunk_size", [0, 1024 * 1024 + 1])
+    def test_stream_invalid_chunk_size(self, backend, chunk_size):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        with pytest.raises(ValueError):
+            f.encrypt_stream(
+                six.BytesIO(b"abc"), six.BytesIO(), chunk_size=chunk_size
+            )
+
+    def test_stream_max_chunk_size(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        data = b"\x00" * (1024 * 1024)
+        encrypted = six.BytesIO()
+        f.encrypt_stream(six.BytesIO(data), encrypted, chunk_size=len(data))
+        encrypted.seek(0)
+        decrypted = six.BytesIO()
+        f.decrypt_stream(encrypted, decrypted)
+        assert decrypted.getvalue() == data
+
+    def test_stream_line_too_long(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        src = six.BytesIO(b"A" * (4 * 1024 * 1024))
+        with pytest.raises(InvalidToken):
+            f.decrypt_stream(src, six.BytesIO())
+        # Only one bounded line was read.
+        assert src.tell() < 2 * 1024 * 1024
+
+    def test_stream_non_bytes(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        with pytest.raises(TypeError):
+            f.encrypt_stream(six.StringIO(u"abc"), six.BytesIO())
+
+    @pytest.mark.parametrize(
+        "mangle",
+        [
+            lambda lines, other: lines[:-1],
+            lambda lines, other: lines[1:],
+            lambda lines, other: [lines[1], lines[0]] + lines[2:],
+            lambda lines, other: lines + lines[-1:],
+            lambda lines, other: [lines[0]] + other[1:],
+            lambda lines, other: [],
+            lambda lines, other: lines[:1] + [b"nonsensetoken"] + lines[2:],
+        ]
+    )
+    def test_stream_tampered(self, backend, mangle):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        lines = []
+        for _ in range(2):
+            encrypted = six.BytesIO()
+            f.encrypt_stream(
+                six.BytesIO(b"\x00" * 40), encrypted, chunk_size=16
+            )
+            lines.append(encrypted.getvalue().splitlines(True))
+
+        src = six.BytesIO(b"".join(mangle(lines[0], lines[1])))
+        with pytest.raises(InvalidToken):
+            f.decrypt_stream(src, six.BytesIO())
+
+    def test_stream_rejects_plain_tokens(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        src = six.BytesIO(f.encrypt(b"abc") + b"\n")
+        with pytest.raises(InvalidToken):
+            f.decrypt_stream(src, six.BytesIO())
+
+    def test_many_executor(self, backend, monkeypatch):
+        futures = pytest.importorskip("concurrent.futures")
+        monkeypatch.setattr("cryptography_patched.fernet._BATCH_CHUNK_SIZE", 3)
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        data = [six.int2byte(i) * i for i in range(10)]
+        with futures.ThreadPoolExecutor(4) as executor:
+            tokens = f.encrypt_many(data, executor=executor)
+            tokens[4] = b"nonsensetoken"
+            results = f.decrypt_many(tokens, executor=executor)
+
+        assert [f.decrypt(token) for token in tokens[:4]] == data[:4]
+        assert results[:4] == data[:4]
+        assert isinstance(results[4], InvalidToken)
+        assert results[5:] == data[5:]
+
 
 @pytest.mark.requires_backend_interface(interface=CipherBackend)
 @pytest.mark.requires_backend_interface(interface=HMACBackend)
@@ -218,3 +385,96 @@ class TestMultiFernet(object):
 
         with pytest.raises(InvalidToken):
             mf2.rotate(mf1.encrypt(b"abc"))
+
+    @pytest.mark.parametrize(
+        ("remember_last_key", "expected"), [(False, [0, 1, 2]), (True, [2])]
+    )
+    def test_remember_last_key(self, backend, remember_last_key, expected):
+        fernets = [
+            Fernet(base64.urlsafe_b64encode(six.int2byte(i) * 32), backend)
+            for i in range(3)
+        ]
+        f = MultiFernet(fernets, remember_last_key=remember_last_key)
+        assert f.decrypt(fernets[2].encrypt(b"abc")) == b"abc"
+
+        calls = []
+        for index, fernet in enumerate(fernets):
+            original = fernet._decrypt_data
+
+            def _decrypt_data(data, timestamp, ttl, index=index,
+                              original=original):
+                calls.append(index)
+                return original(data, timestamp, ttl)
+
+            fernet._decrypt_data = _decrypt_data
+
+        # A different token under the same key goes straight to that key.
+        assert f.decrypt(fernets[2].encrypt(b"def")) == b"def"
+        assert calls == expected
+
+    def test_remember_last_key_does_not_bypass_verification(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        f = MultiFernet([f1, f2], remember_last_key=True)
+        token = f2.encrypt(b"abc")
+        assert f.decrypt(token) == b"abc"
+
+        data = bytearray(base64.urlsafe_b64decode(token))
+        data[-1] ^= 1
+        with pytest.raises(InvalidToken):
+            f.decrypt(base64.urlsafe_b64encode(bytes(data)))
+
+    def test_remember_last_key_rotate(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        mf = MultiFernet([f2, f1], remember_last_key=True)
+        token = f1.encrypt(b"abc")
+        rotated = mf.rotate(token)
+        assert mf.rotate(token) != rotated
+        assert f2.decrypt(rotated) == b"abc"
+        assert mf.decrypt(rotated) == b"abc"
+
+    def test_many(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        f3 = Fernet(base64.urlsafe_b64encode(b"\x02" * 32), backend=backend)
+        f = MultiFernet([f1, f2])
+        tokens = f.encrypt_many([b"abc", b"def"])
+        assert [f1.decrypt(token) for token in tokens] == [b"abc", b"def"]
+
+        tokens = [f1.encrypt(b"abc"), f2.encrypt(b"def"), f3.encrypt(b"ghi")]
+        results = f.decrypt_many(tokens)
+        assert results[:2] == [b"abc", b"def"]
+        assert isinstance(results[2], InvalidToken)
+
+    def test_many_process_executor(self, backend):
+        futures = pytest.importorskip("concurrent.futures")
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        f = MultiFernet([f1, f2])
+        tokens = [f1.encrypt(b"abc"), f2.encrypt(b"def"), b"nonsensetoken"]
+        with futures.ProcessPoolExecutor(2) as executor:
+            results = f.decrypt_many(tokens, executor=executor)
+            new_tokens = f.encrypt_many([b"ghi"], executor=executor)
+
+        assert results[:2] == [b"abc", b"def"]
+        assert isinstance(results[2], InvalidToken)
+        assert f1.decrypt(new_tokens[0]) == b"ghi"
+
+    def test_stream(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        f = MultiFernet([f1, f2])
+        encrypted = six.BytesIO()
+        f.encrypt_stream(six.BytesIO(b"abc" * 10), encrypted, chunk_size=8)
+        encrypted.seek(0)
+        decrypted = six.BytesIO()
+        f1.decrypt_stream(encrypted, decrypted)
+        assert decrypted.getvalue() == b"abc" * 10
+
+        encrypted = six.BytesIO()
+        f2.encrypt_stream(six.BytesIO(b"def"), encrypted)
+        encrypted.seek(0)
+        decrypted = six.BytesIO()
+        f.decrypt_stream(encrypted, decrypted)
+        assert decrypted.getvalue() == b"def"